@@ -9,7 +9,8 @@ from app.schemas.auth import (
     UserResponse,
     MessageResponse
 )
-from app.core.dependencies import get_db, get_current_user
+from app.core.dependencies import get_db, get_current_user, get_current_principal
+from app.core.security import Principal
 from app.models.user import User
 from app.services.auth_service import login_user_service, register_user_service
 
@@ -48,7 +49,7 @@ async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 @router.post("/logout", response_model=MessageResponse)
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: Principal = Depends(get_current_principal)):
     """
     Logout current user.
     """
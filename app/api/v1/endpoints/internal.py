@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.dependencies import require_internal_access
+from app.core.metrics import render_http_metrics
+from app.core.response_cache import response_cache_stats
+from app.core.user_cache import user_cache
+from app.db import session as db_session
+from app.db.pool import pool_stats, render_pool_metrics
+from app.services.access_service import access_cache
+
+router = APIRouter(dependencies=[Depends(require_internal_access)])
+
+
+@router.get("/cache-stats")
+async def cache_stats():
+    """
+    Hit/miss counters of the in-process caches, used for sizing them.
+    """
+    return {
+        "user_cache": user_cache.stats(),
+        "access_cache": access_cache.stats(),
+        "response_cache": response_cache_stats(),
+    }
+
+
+@router.get("/pool")
+async def db_pool_stats():
+    """
+    Live state of each connection pool (primary, and replica when one is
+    configured): connections checked out, overflow in use, checkout
+    timeouts and a histogram of checkout wait times.
+    """
+    return {name: pool_stats(pool) for name, pool in db_session.engine_pools().items()}
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Per-route request counts and latency histograms plus pool gauges
+    (labelled pool="primary" or "replica"), in the Prometheus text
+    exposition format.
+    """
+    lines = render_http_metrics() + render_pool_metrics(db_session.engine_pools())
+    return PlainTextResponse(
+        "\n".join(lines) + "\n",
+        media_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -1,18 +1,28 @@
-from fastapi import APIRouter, status, Depends, HTTPException
-from typing import List
-
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from fastapi import APIRouter, status, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
+
+from app.core.config import settings
+from app.core.dependencies import get_current_principal
+from app.core.etag import conditional_response
+from app.core.response_cache import cached_json_response, project_cache_key, user_projects_cache_key
+from app.core.security import Principal
 from app.schemas.project import ProjectCreate, ProjectResponse, ProjectUpdate
 from app.schemas.project_member import (
     ProjectMemberAdd,
+    ProjectMemberBatch,
+    ProjectMemberBatchResponse,
     ProjectMemberResponse,
     ProjectMemberListResponse,
 )
+from app.schemas.pagination import Page
+from app.schemas.task import MemberStatusBatchUpdate, MemberStatusResponse
 
 from app.services.project_member_service import ProjectMemberService
 from app.services.project_service import ProjectService
-from app.core.dependencies import get_db
+from app.services.task_service import TaskService
+from app.core.dependencies import get_db, get_read_db
+from app.db.routing import is_replica_session
 from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter()
@@ -26,35 +36,61 @@ router = APIRouter()
 async def create_project(
     payload: ProjectCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     project = await ProjectService.create_project_service(db, payload, current_user)
     return project
 
 
-@router.get("", response_model=List[ProjectResponse])
+@router.get("", response_model=Page[ProjectResponse])
 async def list_projects(
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    response: Response,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    return await ProjectService.get_user_projects_service(db, current_user)
+    # The generation in the key is bumped on the primary, so a list read from a
+    # lagging replica may predate it and must not be stored under it
+    return await cached_json_response(
+        await user_projects_cache_key(current_user.id),
+        f"{limit}:{cursor}",
+        Page[ProjectResponse],
+        lambda: ProjectService.get_user_projects_service(db, current_user, limit, cursor),
+        response,
+        store=not is_replica_session(db),
+    )
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
 async def get_project(
     project_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    project = await ProjectService.get_project_by_id_service(db, project_id, current_user)
+    version = await ProjectService.get_project_version_service(db, project_id, current_user)
 
-    if not project:
+    if version is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
 
-    return project
+    not_modified = conditional_response(request, response, version, current_user.id)
+    if not_modified:
+        return not_modified
+
+    async def load():
+        project = await ProjectService.get_project_by_id_service(db, project_id, current_user)
+        if not project:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+        return project
+
+    return await cached_json_response(
+        project_cache_key("project", current_user.id, project_id, version), "", ProjectResponse, load, response
+    )
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
@@ -62,7 +98,7 @@ async def update_project(
     project_id: str,
     payload: ProjectUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     project = await ProjectService.update_project_service(
         db, project_id, payload, current_user
@@ -81,7 +117,7 @@ async def update_project(
 async def delete_project(
     project_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     result = await ProjectService.delete_project_service(
         db, project_id, current_user
@@ -96,13 +132,33 @@ async def delete_project(
     return None
 
 
-@router.get("/{project_id}/members", response_model=List[ProjectMemberListResponse])
+@router.get("/{project_id}/members", response_model=Page[ProjectMemberListResponse])
 async def get_project_members(
     project_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
 ):
-    return await ProjectMemberService.list_project_members_service(db, project_id, current_user)
+    version = await ProjectService.get_project_version_service(db, project_id, current_user)
+    if version is None:
+        return await ProjectMemberService.list_project_members_service(
+            db, project_id, current_user, limit, cursor
+        )
+
+    not_modified = conditional_response(request, response, version, current_user.id)
+    if not_modified:
+        return not_modified
+
+    return await cached_json_response(
+        project_cache_key("members", current_user.id, project_id, version),
+        f"{limit}:{cursor}",
+        Page[ProjectMemberListResponse],
+        lambda: ProjectMemberService.list_project_members_service(db, project_id, current_user, limit, cursor),
+        response,
+    )
 
 
 @router.post(
@@ -114,7 +170,7 @@ async def add_project_member(
     project_id: str,
     payload: ProjectMemberAdd,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     result = await ProjectMemberService.add_member_to_project_service(
         db,
@@ -135,12 +191,53 @@ async def add_project_member(
     return result
 
 
+# Declared before /members/{user_id} so "batch" is not taken for a user id
+@router.post("/{project_id}/members/batch", response_model=ProjectMemberBatchResponse)
+async def add_project_members_batch(
+    project_id: str,
+    payload: ProjectMemberBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Add many users to the project, reporting an outcome per user.
+    """
+    results = await ProjectMemberService.add_members_to_project_service(
+        db, project_id, payload.user_ids, current_user
+    )
+
+    if results is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    return {"results": results}
+
+
+@router.delete("/{project_id}/members/batch", response_model=ProjectMemberBatchResponse)
+async def remove_project_members_batch(
+    project_id: str,
+    payload: ProjectMemberBatch,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Remove many users from the project, reporting an outcome per user.
+    """
+    results = await ProjectMemberService.remove_members_from_project_service(
+        db, project_id, payload.user_ids, current_user
+    )
+
+    if results is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    return {"results": results}
+
+
 @router.delete("/{project_id}/members/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_project_member(
     project_id: str,
     user_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_principal),
 ):
     result = await ProjectMemberService.remove_member_from_project_service(
         db,
@@ -157,3 +254,46 @@ async def delete_project_member(
 
     return None
 
+
+@router.get(
+    "/{project_id}/export",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"application/x-ndjson": {}}}},
+)
+async def export_project(
+    project_id: str,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Stream the caller's view of every task of the project as
+    newline-delimited JSON.
+    """
+    lines = await TaskService.export_project_service(db, project_id, current_user)
+
+    if lines is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}.ndjson"'},
+    )
+
+
+@router.patch("/{project_id}/my-statuses", response_model=List[MemberStatusResponse])
+async def update_my_statuses(
+    project_id: str,
+    payload: MemberStatusBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal),
+):
+    """
+    Set the caller's personal status on many common tasks at once.
+    """
+    result = await TaskService.update_my_statuses_service(db, project_id, payload, current_user)
+
+    if result is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    return result
@@ -1,15 +1,27 @@
-from fastapi import APIRouter, status, Depends, HTTPException
-from typing import List, Union
-from app.core.dependencies import get_current_user, get_db
-from app.models.user import User
+from fastapi import APIRouter, status, Depends, HTTPException, Query, Request, Response
+from typing import List, Optional, Union
+from app.core.config import settings
+from app.core.dependencies import get_current_principal, get_db, get_read_db
+from app.core.etag import conditional_response
+from app.core.import_formats import import_format, iter_import_records
+from app.core.response_cache import cached_json_response, project_cache_key
+from app.core.serialization import json_response
+from app.core.security import Principal
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas.task import (
     TaskCreate,
+    TaskBatchCreate,
+    TaskBatchItem,
     TaskUpdate,
     TaskResponse,
-    TaskOwnerResponse
+    TaskOwnerResponse,
+    TaskImportResponse,
+    TaskSearchResult,
 )
+from app.schemas.pagination import Page
+from app.services.access_service import ROLE_OWNER
+from app.services.project_service import ProjectService
 from app.services.task_service import TaskService
 
 router = APIRouter()
@@ -19,7 +31,7 @@ router = APIRouter()
 async def create_task(
     payload: TaskCreate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     task = await TaskService.create_task_service(db, payload, current_user)
         
@@ -29,27 +41,128 @@ async def create_task(
     return task
 
 
-@router.get("", response_model=List[Union[TaskOwnerResponse, TaskResponse]])
-async def list_tasks(
+@router.post("/batch", status_code=status.HTTP_201_CREATED, response_model=List[TaskResponse])
+async def create_tasks_batch(
+    payload: TaskBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Create up to MAX_TASK_BATCH_SIZE tasks in one project atomically.
+    """
+    tasks = await TaskService.create_tasks_batch_service(db, payload, current_user)
+
+    if tasks is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    return tasks
+
+
+@router.post("/import", response_model=TaskImportResponse)
+async def import_tasks(
     project_id: str,
+    request: Request,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
-    return await TaskService.get_project_tasks_service(db, project_id, current_user)
+    """
+    Create tasks in one project from a CSV (header row with title,
+    description and status columns) or NDJSON request body, read as it
+    streams in. Invalid rows are skipped and reported by line.
+    """
+    file_format = import_format(request.headers.get("content-type"))
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send the file as text/csv or application/x-ndjson",
+        )
+
+    records = iter_import_records(file_format, request.stream(), list(TaskBatchItem.model_fields))
+    report = await TaskService.import_tasks_service(db, project_id, records, current_user)
+
+    if report is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
+
+    return report
+
+
+@router.get("", response_model=Page[Union[TaskOwnerResponse, TaskResponse]])
+async def list_tasks(
+    project_id: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    include_member_statuses: bool = True,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    # The version is read before the page so the tag never runs ahead of it
+    checked = await ProjectService.get_project_role_and_version_service(db, project_id, current_user)
+    if checked is None:
+        return await TaskService.get_project_tasks_service(
+            db, project_id, current_user, limit, cursor, include_member_statuses
+        )
+
+    role, version = checked
+
+    not_modified = conditional_response(request, response, version, current_user.id)
+    if not_modified:
+        return not_modified
+
+    return await cached_json_response(
+        project_cache_key("tasks", current_user.id, project_id, version),
+        f"{limit}:{cursor}:{include_member_statuses}",
+        Page[Union[TaskOwnerResponse, TaskResponse]],
+        lambda: TaskService.get_project_tasks_service(
+            db, project_id, current_user, limit, cursor, include_member_statuses
+        ),
+        response,
+        # Member views are built as response models by the service and skip
+        # revalidation; owner pages gain nothing from it and are validated
+        validated=role != ROLE_OWNER,
+    )
+
+
+@router.get("/search", response_model=Page[TaskSearchResult])
+async def search_tasks(
+    project_id: str,
+    q: str = Query(min_length=1, max_length=256),
+    limit: int = Query(settings.DEFAULT_PAGE_SIZE, ge=1, le=settings.MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
+):
+    """
+    Full-text search over the titles and descriptions of the project's
+    tasks visible to the caller, best match first.
+    """
+    return await TaskService.search_project_tasks_service(db, project_id, q, current_user, limit, cursor)
 
 
 @router.get("/{task_id}", response_model=Union[TaskOwnerResponse, TaskResponse])
 async def get_task(
     task_id: str,
-    db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: Principal = Depends(get_current_principal)
 ):
-    task = await TaskService.get_task_by_id_service(db, task_id, current_user)
+    result = await TaskService.get_task_and_project_service(db, task_id, current_user)
         
-    if not task:
+    if not result:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
-        
-    return task
+
+    # The access statement carries the version: a 304 needs nothing else
+    task, project = result
+    not_modified = conditional_response(request, response, project.version, current_user.id)
+    if not_modified:
+        return not_modified
+
+    task = await TaskService.build_task_view_service(db, task, project, current_user)
+    return json_response(
+        Union[TaskOwnerResponse, TaskResponse], task, response, validated=project.owner_id != current_user.id
+    )
 
 
 @router.patch("/{task_id}", response_model=TaskResponse)
@@ -57,7 +170,7 @@ async def update_task(
     task_id: str,
     payload: TaskUpdate,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     task = await TaskService.update_task_service(db, task_id, payload, current_user)
         
@@ -71,7 +184,7 @@ async def update_task(
 async def delete_task(
     task_id: str,
     db: AsyncSession = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_principal)
 ):
     result = await TaskService.delete_task_service(db, task_id, current_user)
         
@@ -1,9 +1,10 @@
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, projects, tasks
+from app.api.v1.endpoints import auth, internal, projects, tasks
 
 api_router = APIRouter()
 
 api_router.include_router(auth.router, prefix="/auth", tags=["Auth"])
 api_router.include_router(projects.router, prefix="/projects", tags=["Projects"])
 api_router.include_router(tasks.router, prefix="/tasks", tags=["Tasks"])
+api_router.include_router(internal.router, prefix="/internal", tags=["Internal"], include_in_schema=False)
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Union
+from typing import List, Optional, Union
 from pydantic import field_validator, AnyHttpUrl
 from urllib.parse import quote_plus
 
@@ -14,6 +14,9 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "localhost"
     POSTGRES_PORT: str = "5432"
     POSTGRES_DB: str = "task_manager"
+    # Optional streaming replica for read-only endpoints
+    POSTGRES_READ_HOST: str = ""
+    POSTGRES_READ_PORT: str = ""
     ENVIRONMENT: str = "production"
 
     @property
@@ -26,11 +29,96 @@ class Settings(BaseSettings):
         db = self.POSTGRES_DB.strip()
         return f"postgresql+asyncpg://{user}:{pwd}@{host}:{port}/{db}"
 
+    @property
+    def READ_DATABASE_URL(self) -> Optional[str]:
+        read_host = self.POSTGRES_READ_HOST.strip()
+        if not read_host:
+            return None
+        read_port = self.POSTGRES_READ_PORT.strip() or self.POSTGRES_PORT.strip()
+        user = self.POSTGRES_USER.strip()
+        pwd = quote_plus(self.POSTGRES_PASSWORD.strip())
+        db = self.POSTGRES_DB.strip()
+        return f"postgresql+asyncpg://{user}:{pwd}@{read_host}:{read_port}/{db}"
+
+    # After committing a write, a user's reads stay on the primary for this
+    # many seconds so they see their own changes despite replication lag.
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+    READ_YOUR_WRITES_MAX_USERS: int = 100000
+
+    # Connection pool (per process). Checkouts beyond size + overflow wait
+    # up to DB_POOL_TIMEOUT seconds; DB_POOL_RECYCLE of -1 never recycles.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Prepared statements cached per asyncpg connection; set to 0 behind
+    # PgBouncer in transaction mode.
+    DB_STATEMENT_CACHE_SIZE: int = 100
+
     # PLACEHOLDERS: These should be overridden by .env or environment variables
     SECRET_KEY: str = "NOT_A_SECRET_CHANGE_ME_IN_ENV"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
 
+    # Bcrypt runs in a dedicated thread pool. Requests beyond
+    # workers + queue limit are rejected with 503 instead of queueing.
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 64
+
+    # Per-request SQL accounting: log a possible N+1 when one statement runs
+    # this many times within a single request (0 disables the check).
+    SQL_N_PLUS_ONE_THRESHOLD: int = 10
+
+    # Upper bound on items accepted by POST /tasks/batch and
+    # PATCH /projects/{id}/my-statuses
+    MAX_TASK_BATCH_SIZE: int = 5000
+
+    # Upper bound on users in one /projects/{id}/members/batch request
+    MAX_MEMBER_BATCH_SIZE: int = 1000
+
+    # Keyset pagination for list endpoints
+    DEFAULT_PAGE_SIZE: int = 50
+    MAX_PAGE_SIZE: int = 200
+
+    # Rows fetched per round trip from the server-side cursor of
+    # GET /projects/{id}/export (and written per chunk)
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # POST /tasks/import: rows per COPY into tasks, and failed rows
+    # reported back in detail
+    IMPORT_CHUNK_SIZE: int = 5000
+    MAX_IMPORT_ERRORS: int = 100
+    # Longest line buffered while reading an import; a longer one fails
+    # its row
+    MAX_IMPORT_LINE_BYTES: int = 1048576
+
+    # In-process cache of authenticated users (get_current_user)
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_TTL_SECONDS: float = 60.0
+
+    # Per-process cache of (user, project) access decisions
+    ACCESS_CACHE_MAX_SIZE: int = 50000
+    ACCESS_CACHE_TTL_SECONDS: float = 30.0
+
+    # Cache of serialized GET responses for projects, members and tasks:
+    # "memory" (per process), "redis" (any Redis-protocol server, shared by
+    # all processes) or "none". Project-scoped entries are keyed by the
+    # project version; project lists by a per-user generation that the
+    # writing service bumps.
+    RESPONSE_CACHE_BACKEND: str = "memory"
+    RESPONSE_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    # Connections kept open to the redis backend by each process
+    RESPONSE_CACHE_REDIS_POOL_SIZE: int = 8
+    RESPONSE_CACHE_MAX_SIZE: int = 10000
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+    # Pages/filters kept per cached response (memory backend)
+    RESPONSE_CACHE_MAX_VARIANTS: int = 32
+
+    # Shared secret for /internal endpoints (X-Internal-Token). When unset
+    # they are disabled in every environment.
+    INTERNAL_API_TOKEN: str = ""
+
     # CORS Origins - can be a list of strings or a single comma-separated string
     BACKEND_CORS_ORIGINS: Union[List[str], str] = []
 
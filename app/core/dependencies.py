@@ -1,32 +1,31 @@
-from app.db.session import AsyncSessionLocal
-from typing import AsyncGenerator
+from app.db import session as db_session
+from app.db.routing import has_recent_write, request_user_id
+from typing import AsyncGenerator, Optional
+import hmac
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, Header, HTTPException, status
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
 from fastapi.security import HTTPAuthorizationCredentials
-from app.core.security import security
+from app.core.security import Principal, security
 from app.core.config import settings
+from app.core.user_cache import get_user_by_id
 from app.models.user import User
 
 
 async def get_db() -> AsyncGenerator:
-    async with AsyncSessionLocal() as db:
+    async with db_session.AsyncSessionLocal() as db:
         yield db
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+credentials_exception = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
+def _decode_token(credentials: HTTPAuthorizationCredentials) -> dict:
     try:
         token = credentials.credentials
 
@@ -37,15 +36,62 @@ async def get_current_user(
             options={"require_exp": True, "require_sub": True, "verify_aud": False}
         )
 
-        user_id: str = payload.get("sub")
-        if user_id is None:
+        if payload.get("sub") is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
 
-    result = await db.execute(select(User).filter(User.id == user_id))
-    user = result.scalar_one_or_none()
+    return payload
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+) -> Principal:
+    """
+    Authenticates the caller from the signed token claims without touching
+    the database. Use ``get_current_user`` when the full row is required.
+    """
+    payload = _decode_token(credentials)
+    request_user_id.set(payload["sub"])
+    return Principal(id=payload["sub"], role=payload.get("role"))
+
+
+async def get_read_db(
+    principal: Principal = Depends(get_current_principal),
+) -> AsyncGenerator:
+    """
+    Session for read-only endpoints. Uses the read replica when one is
+    configured, unless the caller committed a write within the last
+    READ_YOUR_WRITES_SECONDS.
+    """
+    if has_recent_write(principal.id):
+        session_factory = db_session.AsyncSessionLocal
+    else:
+        session_factory = db_session.AsyncReadSessionLocal
+
+    async with session_factory() as db:
+        yield db
+
+
+async def get_current_user(
+    principal: Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(get_read_db)
+) -> User:
+    user = await get_user_by_id(db, principal.id)
     if user is None:
         raise credentials_exception
 
-    return user
\ No newline at end of file
+    return user
+
+
+async def require_internal_access(
+    x_internal_token: Optional[str] = Header(default=None),
+) -> None:
+    if (
+        settings.INTERNAL_API_TOKEN
+        and x_internal_token
+        and hmac.compare_digest(x_internal_token, settings.INTERNAL_API_TOKEN)
+    ):
+        return
+
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
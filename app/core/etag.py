@@ -0,0 +1,43 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(version: int, *variant: str) -> str:
+    """
+    Weak ETag for a project-scoped read. ``variant`` tells apart payloads of
+    the same version, e.g. owners and members get different task views.
+    """
+    digest = hashlib.blake2b("\x1f".join(variant).encode(), digest_size=8).hexdigest()
+    return f'W/"{version}-{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of ``etag`` with the tags listed in an If-None-Match
+    header.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_response(request: Request, response: Response, version: int, user_id: str) -> Optional[Response]:
+    """
+    Tags ``response`` with the ETag of this read. Returns a 304 to send
+    instead when the client already holds that version.
+    """
+    etag = make_etag(version, user_id, request.url.path, request.url.query)
+    # Payloads depend on the caller: shared caches must not reuse them
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    response.headers.update(headers)
+    return None
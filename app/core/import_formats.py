@@ -0,0 +1,176 @@
+import csv
+import json
+from collections import deque
+from typing import AsyncIterator, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from app.core.config import settings
+
+# Content types accepted by the import endpoints, by format
+IMPORT_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+# (line number, field values) or (line number, error message)
+ImportRecord = Tuple[int, Union[Dict[str, str], str]]
+
+# (line number, text, error message or None)
+ImportLine = Tuple[int, str, Optional[str]]
+
+
+def import_format(content_type: Optional[str]) -> Optional[str]:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return IMPORT_CONTENT_TYPES.get(media_type)
+
+
+async def iter_lines(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = settings.MAX_IMPORT_LINE_BYTES
+) -> AsyncIterator[ImportLine]:
+    """
+    Numbered lines (ending in "\\n", except maybe the last) of a UTF-8
+    byte stream, split as they arrive and decoded one at a time, so a bad
+    line fails alone: one that is not valid UTF-8 comes with its text
+    decoded with replacement characters, one longer than
+    ``max_line_bytes`` is dropped unread. A leading BOM is dropped.
+    """
+    pending = bytearray()
+    too_long = False
+    line_no = 0
+    async for chunk in chunks:
+        start = 0
+        while start < len(chunk):
+            end = chunk.find(b"\n", start)
+            stop = len(chunk) if end < 0 else end + 1
+            if not too_long:
+                pending += chunk[start:stop]
+                if len(pending) > max_line_bytes + (end >= 0):
+                    too_long = True
+                    pending.clear()
+            start = stop
+            if end >= 0:
+                line_no += 1
+                yield _decode_line(line_no, pending, too_long, max_line_bytes)
+                pending.clear()
+                too_long = False
+
+    if pending or too_long:
+        yield _decode_line(line_no + 1, pending, too_long, max_line_bytes)
+
+
+def _decode_line(line_no: int, raw: bytearray, too_long: bool, max_line_bytes: int) -> ImportLine:
+    if too_long:
+        return line_no, "", f"Line is longer than {max_line_bytes} bytes"
+    encoding = "utf-8-sig" if line_no == 1 else "utf-8"
+    try:
+        return line_no, raw.decode(encoding), None
+    except UnicodeDecodeError:
+        return line_no, raw.decode(encoding, errors="replace"), "Line is not valid UTF-8"
+
+
+async def _iter_csv_record_lines(
+    lines: AsyncIterator[ImportLine], max_record_bytes: int
+) -> AsyncIterator[Tuple[int, List[str], Optional[str]]]:
+    """
+    Groups lines into CSV records as (first line number, lines, error): a
+    record ends on the line that balances its quotes. A record whose quote
+    is still open after ``max_record_bytes`` or at the end of the stream
+    (a stray quote) fails alone with its first line, and the lines
+    buffered after it are read again as records of their own.
+    """
+    pending: Deque[ImportLine] = deque()
+    replay: Deque[ImportLine] = deque()
+    quotes = size = 0
+    while True:
+        if replay:
+            line = replay.popleft()
+        else:
+            # None once the stream is over: the pending record is unterminated
+            line = await anext(lines, None)
+            if line is None and not pending:
+                return
+        if line is not None:
+            line_no, text, error = line
+            quotes += text.count('"')
+            if not pending and quotes % 2 == 0:
+                # The common case: a record on one line
+                yield line_no, [text], error
+                quotes = 0
+                continue
+            pending.append(line)
+            if quotes % 2 == 0:
+                errors = [error for _, _, error in pending if error is not None]
+                yield pending[0][0], [text for _, text, _ in pending], errors[0] if errors else None
+                pending.clear()
+                quotes = size = 0
+                continue
+            size += len(text.encode())
+            if size <= max_record_bytes:
+                continue
+
+        line_no, _, error = pending.popleft()
+        yield line_no, [], error or "Unterminated quoted field"
+        replay.extendleft(reversed(pending))
+        pending.clear()
+        quotes = size = 0
+
+
+async def iter_csv_records(
+    chunks: AsyncIterator[bytes], required: Sequence[str], max_line_bytes: int = settings.MAX_IMPORT_LINE_BYTES
+) -> AsyncIterator[ImportRecord]:
+    """
+    Records of a CSV stream with a header row, as dicts keyed by the
+    lower-cased column names. Quoted fields may span lines, up to
+    ``max_line_bytes`` per record; a record is parsed once its quotes are
+    balanced, so only one record is buffered. A record with a bad line
+    fails with that line's error.
+    """
+    header = None
+    lines = iter_lines(chunks, max_line_bytes)
+    async for start, record, record_error in _iter_csv_record_lines(lines, max_line_bytes):
+        if record_error is not None:
+            if header is None:
+                raise ValueError(f"CSV header: {record_error}")
+            yield start, record_error
+            continue
+
+        values = next(csv.reader(record), [])
+        if not values:
+            continue
+
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            missing = [name for name in required if name not in header]
+            if missing:
+                raise ValueError(f"CSV header is missing columns: {', '.join(missing)}")
+        elif len(values) != len(header):
+            yield start, f"Expected {len(header)} fields, got {len(values)}"
+        else:
+            yield start, dict(zip(header, values))
+
+
+async def iter_ndjson_records(
+    chunks: AsyncIterator[bytes], max_line_bytes: int = settings.MAX_IMPORT_LINE_BYTES
+) -> AsyncIterator[ImportRecord]:
+    """Objects of a newline-delimited JSON stream; blank lines are skipped."""
+    async for line_no, line, error in iter_lines(chunks, max_line_bytes):
+        if error is not None:
+            yield line_no, error
+            continue
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+        except ValueError as exc:
+            yield line_no, f"Invalid JSON: {exc}"
+            continue
+        if isinstance(value, dict):
+            yield line_no, value
+        else:
+            yield line_no, "Expected a JSON object"
+
+
+def iter_import_records(file_format: str, chunks: AsyncIterator[bytes], required: Sequence[str]) -> AsyncIterator[ImportRecord]:
+    if file_format == "csv":
+        return iter_csv_records(chunks, required)
+    return iter_ndjson_records(chunks)
@@ -0,0 +1,163 @@
+import bisect
+import threading
+from typing import Dict, List, Sequence, Tuple
+
+# Latency buckets in seconds, from sub-millisecond up to the 30s pool timeout.
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+
+
+class Counter:
+    """Monotonic, thread-safe counter."""
+
+    def __init__(self) -> None:
+        self._value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: int = 1) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram of observed values (Prometheus semantics: each
+    bucket counts observations less than or equal to its upper bound).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> Dict:
+        """
+        Cumulative bucket counts keyed by upper bound, plus count and sum.
+        """
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+
+        cumulative = {}
+        running = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            running += bucket_count
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = count
+        return {"buckets": cumulative, "count": count, "sum": total}
+
+
+class RouteMetrics:
+    """
+    Counters for one (route template, method) pair: requests per status
+    class (1xx-5xx) and a latency histogram.
+    """
+
+    __slots__ = ("status_classes", "latency")
+
+    def __init__(self) -> None:
+        self.status_classes = [0, 0, 0, 0, 0]
+        self.latency = Histogram()
+
+    def record(self, status_code: int, duration: float) -> None:
+        index = status_code // 100 - 1
+        if 0 <= index < 5:
+            self.status_classes[index] += 1
+        self.latency.observe(duration)
+
+
+class HttpMetrics:
+    """
+    Registry of :class:`RouteMetrics` keyed by route template and method.
+    Entries are created on the first request to a route; afterwards
+    recording a request only increments existing counters.
+    """
+
+    def __init__(self) -> None:
+        self._routes: Dict[str, Dict[str, RouteMetrics]] = {}
+        self._lock = threading.Lock()
+
+    def route(self, route: str, method: str) -> RouteMetrics:
+        by_method = self._routes.get(route)
+        if by_method is not None:
+            metrics = by_method.get(method)
+            if metrics is not None:
+                return metrics
+
+        with self._lock:
+            by_method = self._routes.setdefault(route, {})
+            return by_method.setdefault(method, RouteMetrics())
+
+    def items(self) -> List[Tuple[str, str, RouteMetrics]]:
+        with self._lock:
+            return [
+                (route, method, metrics)
+                for route, by_method in sorted(self._routes.items())
+                for method, metrics in sorted(by_method.items())
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+
+http_metrics = HttpMetrics()
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    return ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items())
+
+
+def render_histogram(name: str, labels: Dict[str, str], histogram: Histogram) -> List[str]:
+    snapshot = histogram.snapshot()
+    label_text = _format_labels(labels)
+    prefix = f"{label_text}," if label_text else ""
+    lines = [
+        f'{name}_bucket{{{prefix}le="{bound}"}} {count}'
+        for bound, count in snapshot["buckets"].items()
+    ]
+    lines.append(f"{name}_sum{{{label_text}}} {snapshot['sum']}")
+    lines.append(f"{name}_count{{{label_text}}} {snapshot['count']}")
+    return lines
+
+
+def render_http_metrics(registry: HttpMetrics = http_metrics) -> List[str]:
+    """
+    Prometheus text exposition lines for the per-route HTTP metrics.
+    """
+    requests = [
+        "# HELP http_requests_total HTTP requests by route template, method and status class.",
+        "# TYPE http_requests_total counter",
+    ]
+    durations = [
+        "# HELP http_request_duration_seconds HTTP request latency by route template and method.",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for route, method, metrics in registry.items():
+        labels = {"route": route, "method": method}
+        for index, count in enumerate(metrics.status_classes):
+            if count:
+                requests.append(
+                    f'http_requests_total{{{_format_labels(labels)},status="{index + 1}xx"}} {count}'
+                )
+        durations.extend(render_histogram("http_request_duration_seconds", labels, metrics.latency))
+    return requests + durations
@@ -1,6 +1,17 @@
+import logging
+import time
+
 from starlette.types import ASGIApp, Receive, Scope, Send
 from starlette.datastructures import MutableHeaders
 
+from app.core.metrics import HttpMetrics, http_metrics
+from app.db.query_stats import QueryStats, current_query_stats
+
+sql_logger = logging.getLogger("app.sql")
+
+# Route label for requests that did not match any route (404s, redirects).
+UNMATCHED_ROUTE = "<unmatched>"
+
 
 class SecurityHeadersMiddleware:
     """
@@ -53,3 +64,102 @@ class SecurityHeadersMiddleware:
             await send(message)
 
         await self.app(scope, receive, send_with_security_headers)
+
+
+def _route_template(scope: Scope) -> str:
+    # The router stores the matched route in the (shared) scope.
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request counts per status class and a
+    latency histogram for every route template (``/api/v1/tasks/{task_id}``
+    rather than the concrete path, to keep label cardinality bounded).
+    """
+
+    def __init__(self, app: ASGIApp, registry: HttpMetrics = http_metrics) -> None:
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            template = _route_template(scope)
+            self.registry.route(template, scope["method"]).record(
+                status_code, time.perf_counter() - started
+            )
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware accounting for the SQL run by each request.
+
+    Reports the statement count and total database time in a
+    ``Server-Timing: db;dur=<ms>;desc="<n> queries"`` header and a log line
+    on the ``app.sql`` logger. When one statement runs at least
+    ``n_plus_one_threshold`` times in a request (typically a query issued
+    per row of a result), a warning is logged; 0 disables the check.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 0) -> None:
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(track_statements=self.n_plus_one_threshold > 0)
+        token = current_query_stats.set(stats)
+        status_code = 500
+
+        async def send_with_server_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.duration_ms:.2f};desc="{stats.count} queries"',
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            current_query_stats.reset(token)
+            self._log(scope, status_code, stats)
+
+    def _log(self, scope: Scope, status_code: int, stats: QueryStats) -> None:
+        repeated = stats.repeated_statements(self.n_plus_one_threshold)
+        if not repeated and not sql_logger.isEnabledFor(logging.INFO):
+            return
+
+        template = _route_template(scope)
+        sql_logger.info(
+            "sql_stats method=%s route=%s status=%d queries=%d db_ms=%.2f n_plus_one=%s",
+            scope["method"], template, status_code, stats.count, stats.duration_ms,
+            "true" if repeated else "false",
+        )
+        for statement, executions in repeated:
+            sql_logger.warning(
+                "possible N+1 method=%s route=%s executions=%d statement=%r",
+                scope["method"], template, executions, " ".join(statement.split())[:200],
+            )
@@ -0,0 +1,70 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, Optional, Sequence, Tuple, Union
+
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from app.core.config import settings
+
+
+def encode_cursor(sort_value: Union[datetime, float], row_id: str) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_type: type = datetime) -> Tuple[Union[datetime, float], str]:
+    """
+    Reverses encode_cursor. ``sort_type`` is what the endpoint sorts on
+    (datetime, or float for search ranks); any other cursor is invalid.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if sort_type is datetime:
+            return datetime.fromisoformat(sort_value), str(row_id)
+        if isinstance(sort_value, (int, float)) and not isinstance(sort_value, bool):
+            return float(sort_value), str(row_id)
+        raise ValueError("Invalid cursor")
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def apply_keyset(
+    query: Select,
+    sort_column: InstrumentedAttribute,
+    id_column: InstrumentedAttribute,
+    cursor: Optional[str],
+    limit: int,
+) -> Select:
+    """
+    Orders the query by (sort_column, id_column) and restricts it to the rows
+    after the cursor. One extra row is fetched so callers can tell whether
+    another page exists.
+    """
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(sort_column, id_column) > tuple_(sort_value, row_id))
+    return query.order_by(sort_column, id_column).limit(limit + 1)
+
+
+def build_page(
+    rows: Sequence[Any],
+    limit: int,
+    sort_key: Callable[[Any], Union[datetime, float]] = lambda row: row.created_at,
+) -> dict:
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit:
+        last = items[-1]
+        next_cursor = encode_cursor(sort_key(last), last.id)
+    return {"items": items, "next_cursor": next_cursor}
+
+
+def resolve_limit(limit: Optional[int]) -> int:
+    if limit is None:
+        return settings.DEFAULT_PAGE_SIZE
+    return max(1, min(limit, settings.MAX_PAGE_SIZE))
@@ -0,0 +1,286 @@
+import asyncio
+import itertools
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+from fastapi import Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.serialization import dump_json
+
+logger = logging.getLogger("app.cache")
+
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+
+
+class MemoryResponseCache:
+    """
+    Per-process backend on top of the bounded LRU ``TTLCache``. Each key
+    holds the serialized variants (pages, filters) of one response.
+    Generations are drawn from one process-wide counter, so a generation
+    that was evicted comes back as a new value rather than a reused one.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_variants: int) -> None:
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.generations = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.max_variants = max_variants
+        self._next_generation = itertools.count(1)
+
+    async def get(self, key: str, variant: str) -> Optional[bytes]:
+        variants = self.entries.get(key)
+        return variants.get(variant) if variants is not None else None
+
+    async def set(self, key: str, variant: str, body: bytes) -> None:
+        variants = self.entries.get(key)
+        if variants is None:
+            variants = {}
+            self.entries.set(key, variants)
+        if variant in variants or len(variants) < self.max_variants:
+            variants[variant] = body
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.entries.pop(key)
+
+    async def generation(self, name: str) -> Optional[int]:
+        value = self.generations.get(name)
+        if value is None:
+            value = next(self._next_generation)
+            self.generations.set(name, value)
+        return value
+
+    async def bump_generation(self, *names: str) -> None:
+        for name in names:
+            self.generations.set(name, next(self._next_generation))
+
+    def stats(self) -> dict:
+        return {"backend": "memory", **self.entries.stats()}
+
+
+class RedisProtocolError(Exception):
+    pass
+
+
+class RedisResponseCache:
+    """
+    Shared backend for any server speaking the Redis protocol (Redis,
+    Valkey, KeyDB, ...). Each key is a hash of variants that expires as a
+    whole; generations are plain counters that do not expire. Commands run
+    on a small pool of connections, each call pipelining its commands on a
+    connection it has to itself. When the server is unreachable reads miss
+    and writes are dropped, so the cache never fails a request.
+    """
+
+    def __init__(
+        self, url: str, ttl: float, prefix: str = "rc:", timeout: float = 0.5, pool_size: int = 8
+    ) -> None:
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = unquote(parts.password) if parts.password else None
+        self.database = int(parts.path.lstrip("/") or 0)
+        self.ttl_ms = max(1, int(ttl * 1000))
+        self.prefix = prefix
+        self.timeout = timeout
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._idle: List[Connection] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def get(self, key: str, variant: str) -> Optional[bytes]:
+        replies = await self._execute([b"HGET", self._key(key), variant])
+        body = replies[0] if replies else None
+        if body is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return body
+
+    async def set(self, key: str, variant: str, body: bytes) -> None:
+        name = self._key(key)
+        await self._execute([b"HSET", name, variant, body], [b"PEXPIRE", name, str(self.ttl_ms)])
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._execute([b"DEL", *(self._key(key) for key in keys)])
+
+    async def generation(self, name: str) -> Optional[int]:
+        """The current generation of ``name``, or None when it can't be read."""
+        replies = await self._execute([b"GET", self._key("gen:" + name)])
+        if replies is None:
+            return None
+        return int(replies[0]) if replies[0] is not None else 0
+
+    async def bump_generation(self, *names: str) -> None:
+        if names:
+            await self._execute(*([b"INCR", self._key("gen:" + name)] for name in names))
+
+    def stats(self) -> dict:
+        return {
+            "backend": "redis",
+            "host": self.host,
+            "port": self.port,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+        }
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    async def _execute(self, *commands: List[Any]) -> Optional[list]:
+        async with self._slots:
+            try:
+                return await asyncio.wait_for(self._run(commands), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, RedisProtocolError) as exc:
+                self.errors += 1
+                logger.warning("response cache unavailable: %r", exc)
+                return None
+
+    async def _run(self, commands) -> list:
+        # A connection goes back to the pool only after all its replies were
+        # read; on any failure it may be mid-reply, so it is closed instead.
+        connection = self._idle.pop() if self._idle else await self._connect()
+        try:
+            replies = await _roundtrip(connection, commands)
+        except BaseException:
+            connection[1].close()
+            raise
+        self._idle.append(connection)
+        return replies
+
+    async def _connect(self) -> Connection:
+        connection = await asyncio.open_connection(self.host, self.port)
+        setup = []
+        if self.password:
+            setup.append([b"AUTH", self.password])
+        if self.database:
+            setup.append([b"SELECT", str(self.database)])
+        if setup:
+            try:
+                await _roundtrip(connection, setup)
+            except BaseException:
+                connection[1].close()
+                raise
+        return connection
+
+
+async def _roundtrip(connection: Connection, commands) -> list:
+    reader, writer = connection
+    writer.write(b"".join(_encode_command(command) for command in commands))
+    await writer.drain()
+    return [await _read_reply(reader) for _ in commands]
+
+
+def _encode_command(args: List[Any]) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def _read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        raise RedisProtocolError(payload.decode(errors="replace"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(payload)
+        return None if length < 0 else [await _read_reply(reader) for _ in range(length)]
+    raise RedisProtocolError(f"unexpected reply {line!r}")
+
+
+def create_response_cache():
+    backend = settings.RESPONSE_CACHE_BACKEND.strip().lower()
+    if backend == "redis":
+        return RedisResponseCache(
+            settings.RESPONSE_CACHE_REDIS_URL,
+            settings.RESPONSE_CACHE_TTL_SECONDS,
+            pool_size=settings.RESPONSE_CACHE_REDIS_POOL_SIZE,
+        )
+    if backend == "memory":
+        return MemoryResponseCache(
+            settings.RESPONSE_CACHE_MAX_SIZE,
+            settings.RESPONSE_CACHE_TTL_SECONDS,
+            settings.RESPONSE_CACHE_MAX_VARIANTS,
+        )
+    return None
+
+
+response_cache = create_response_cache()
+
+
+def project_cache_key(endpoint: str, user_id: str, project_id: str, version: int) -> str:
+    """
+    Key of a project-scoped read. A write to the project bumps its version,
+    which retires every entry of the previous one.
+    """
+    return f"{endpoint}:{user_id}:{project_id}:{version}"
+
+
+async def user_projects_cache_key(user_id: str) -> Optional[str]:
+    """
+    Key of a user's project list, or None when it can't be cached. Keyed by
+    the user's generation, which every change to their projects or
+    memberships bumps after commit: a list loaded before the bump is stored
+    under the retired generation, where no later read looks for it.
+    """
+    if response_cache is None:
+        return None
+    generation = await response_cache.generation(f"projects:{user_id}")
+    return f"projects:{user_id}:{generation}" if generation is not None else None
+
+
+async def invalidate_user_projects(*user_ids: str) -> None:
+    if response_cache is not None and user_ids:
+        await response_cache.bump_generation(*(f"projects:{user_id}" for user_id in user_ids))
+
+
+async def cached_json_response(
+    key: Optional[str],
+    variant: str,
+    response_model: Any,
+    load: Callable[[], Awaitable[Any]],
+    response: Response,
+    validated: bool = False,
+    store: bool = True,
+) -> Response:
+    """
+    Serves the JSON body of ``key``/``variant`` from the response cache, or
+    builds it with ``load`` and stores it. The body is serialized exactly as
+    FastAPI would for ``response_model`` (see ``dump_json`` for
+    ``validated``); headers set on ``response`` are kept. A ``key`` of None
+    bypasses the cache; with ``store`` False a miss is served but not kept.
+    """
+    cache = response_cache if key is not None else None
+    body = await cache.get(key, variant) if cache is not None else None
+    if body is None:
+        body = dump_json(response_model, await load(), validated)
+        if cache is not None and store:
+            await cache.set(key, variant, body)
+
+    return Response(content=body, media_type="application/json", headers=dict(response.headers))
+
+
+def response_cache_stats() -> Dict[str, Any]:
+    return response_cache.stats() if response_cache is not None else {"backend": None}
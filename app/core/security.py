@@ -1,7 +1,11 @@
 from passlib.context import CryptContext
 
 from jose import jwt
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from typing import Optional
 from app.core.config import settings
 from fastapi.security import HTTPBearer
 
@@ -26,9 +30,56 @@ def create_access_token(data: dict) -> str:
     )
 
 
+@dataclass(frozen=True)
+class Principal:
+    """
+    Authenticated caller built from the signed JWT claims alone.
+
+    Carries the same ``id`` and ``role`` attributes the services read from
+    ``User``, so it can be passed wherever only the caller's identity matters.
+    """
+    id: str
+    role: Optional[str] = None
+
+
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the password hashing pool and its queue are full."""
+
+
+# bcrypt releases the GIL, so a small thread pool keeps the event loop free
+# while hashes are computed.
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+_hash_in_flight = 0
+
+
+async def _run_in_hash_pool(func, *args):
+    global _hash_in_flight
+
+    if _hash_in_flight >= settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT:
+        raise PasswordHasherBusy("Password hashing capacity exceeded, retry shortly")
+
+    _hash_in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_hash_executor, func, *args)
+    finally:
+        _hash_in_flight -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run_in_hash_pool(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await _run_in_hash_pool(verify_password, plain_password, hashed_password)
@@ -0,0 +1,41 @@
+from functools import lru_cache
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_model: Any) -> TypeAdapter:
+    return TypeAdapter(response_model)
+
+
+def dump_json(response_model: Any, content: Any, validated: bool = False) -> bytes:
+    """
+    Serializes ``content`` to the JSON FastAPI would send for
+    ``response_model``.
+
+    Without ``validated`` it is validated first, as FastAPI does. With it,
+    ``content`` must already consist of response model instances (a page
+    may still be the plain dict from build_page) and goes straight to
+    bytes in pydantic-core, skipping that second validation pass.
+    """
+    adapter = type_adapter(response_model)
+    if not validated:
+        return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+    if isinstance(content, dict) and isinstance(response_model, type) and issubclass(response_model, BaseModel):
+        content = response_model.model_construct(**content)
+    return adapter.dump_json(content)
+
+
+def json_response(response_model: Any, content: Any, response: Response, validated: bool = False) -> Response:
+    """
+    JSON response for ``content`` that keeps the headers set on the
+    injected ``response``.
+    """
+    return Response(
+        content=dump_json(response_model, content, validated),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
@@ -0,0 +1,50 @@
+from typing import Optional
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE_MAX_SIZE,
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
+
+
+def _snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+async def get_user_by_id(db: AsyncSession, user_id: str) -> Optional[User]:
+    """
+    Returns the user with the given id, served from the in-process cache when
+    possible. Cached users are merged into ``db`` without emitting a query.
+    """
+    cached = user_cache.get(user_id)
+    if cached is not None:
+        user = User(**cached)
+        make_transient_to_detached(user)
+        return await db.merge(user, load=False)
+
+    result = await db.execute(select(User).filter(User.id == user_id))
+    user = result.scalar_one_or_none()
+    if user is not None:
+        user_cache.set(user_id, _snapshot(user))
+    return user
+
+
+def invalidate_user(user_id: str) -> None:
+    user_cache.pop(user_id)
+
+
+def clear_user_cache() -> None:
+    user_cache.clear()
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
@@ -0,0 +1,77 @@
+"""
+Applies database migrations.
+
+    python -m app.db.migrate            # upgrade to the latest revision
+    python -m app.db.migrate <revision> # upgrade to a specific revision
+
+Downgrades go through the regular ``alembic downgrade`` CLI.
+
+Databases created by the old ``create_all`` startup hook have the tables but
+no ``alembic_version`` table; they are stamped at the initial revision first.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from app.core.config import settings
+
+ROOT = Path(__file__).resolve().parents[2]
+INITIAL_REVISION = "0001"
+
+
+class SchemaOutOfDate(RuntimeError):
+    """Raised when the database is not migrated to the latest revision."""
+
+
+def get_config() -> Config:
+    return Config(str(ROOT / "alembic.ini"))
+
+
+async def ensure_at_head(engine: AsyncEngine) -> None:
+    """
+    Raises ``SchemaOutOfDate`` unless the database behind ``engine`` is at
+    the latest revision, for tools that need the migrated schema (triggers,
+    generated columns) rather than one built from the models.
+    """
+    async with engine.connect() as conn:
+        current = await conn.run_sync(
+            lambda sync_conn: MigrationContext.configure(sync_conn).get_current_revision()
+        )
+    head = ScriptDirectory.from_config(get_config()).get_current_head()
+    if current != head:
+        raise SchemaOutOfDate(
+            f"Database is at revision {current or '(none)'}, expected {head}; "
+            "run `python -m app.db.migrate` first"
+        )
+
+
+async def _is_unversioned_legacy_schema() -> bool:
+    engine = create_async_engine(settings.DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            tables = await conn.run_sync(lambda sync_conn: set(inspect(sync_conn).get_table_names()))
+    finally:
+        await engine.dispose()
+    return "users" in tables and "alembic_version" not in tables
+
+
+def main(argv=None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    target = argv[0] if argv else "head"
+    config = get_config()
+
+    if asyncio.run(_is_unversioned_legacy_schema()):
+        command.stamp(config, INITIAL_REVISION)
+
+    command.upgrade(config, target)
+
+
+if __name__ == "__main__":
+    main()
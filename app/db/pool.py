@@ -0,0 +1,92 @@
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.metrics import Counter, Histogram, render_histogram
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long each checkout waited for a
+    connection (including opening a new one) and how often it timed out.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_wait = Histogram()
+        self.checkout_timeouts = Counter()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_timeouts.inc()
+            raise
+        finally:
+            self.checkout_wait.observe(time.perf_counter() - started)
+
+    def recreate(self) -> "InstrumentedAsyncPool":
+        # Keep the metrics across engine.dispose() / pool recreation.
+        pool = super().recreate()
+        pool.checkout_wait = self.checkout_wait
+        pool.checkout_timeouts = self.checkout_timeouts
+        return pool
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """
+    Live state of ``pool``; wait metrics are only present for
+    :class:`InstrumentedAsyncPool`.
+    """
+    stats: Dict[str, Any] = {"class": type(pool).__name__, "status": pool.status()}
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+            timeout_seconds=pool.timeout(),
+        )
+    if isinstance(pool, InstrumentedAsyncPool):
+        stats["checkout_timeouts"] = pool.checkout_timeouts.value
+        stats["checkout_wait_seconds"] = pool.checkout_wait.snapshot()
+    return stats
+
+
+def render_pool_metrics(pools: Dict[str, Pool]) -> List[str]:
+    """
+    Prometheus text exposition lines for the connection pools, keyed by
+    the value of their ``pool`` label ("primary", "replica").
+    """
+    queue_pools = {name: p for name, p in pools.items() if isinstance(p, AsyncAdaptedQueuePool)}
+    instrumented = {name: p for name, p in pools.items() if isinstance(p, InstrumentedAsyncPool)}
+
+    lines: List[str] = []
+    if queue_pools:
+        for name, value, help_text in (
+            ("db_pool_size", AsyncAdaptedQueuePool.size, "Configured number of persistent connections."),
+            ("db_pool_checked_out", AsyncAdaptedQueuePool.checkedout, "Connections currently checked out."),
+            ("db_pool_overflow", AsyncAdaptedQueuePool.overflow, "Overflow connections in use (negative while the pool fills)."),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            lines += [f'{name}{{pool="{label}"}} {value(pool)}' for label, pool in queue_pools.items()]
+    if instrumented:
+        lines += [
+            "# HELP db_pool_checkout_timeouts_total Checkouts that gave up after DB_POOL_TIMEOUT.",
+            "# TYPE db_pool_checkout_timeouts_total counter",
+        ]
+        lines += [
+            f'db_pool_checkout_timeouts_total{{pool="{label}"}} {pool.checkout_timeouts.value}'
+            for label, pool in instrumented.items()
+        ]
+        lines += [
+            "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled connection.",
+            "# TYPE db_pool_checkout_wait_seconds histogram",
+        ]
+        for label, pool in instrumented.items():
+            lines += render_histogram("db_pool_checkout_wait_seconds", {"pool": label}, pool.checkout_wait)
+    return lines
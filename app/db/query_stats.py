@@ -0,0 +1,56 @@
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class QueryStats:
+    """
+    SQL statements executed on behalf of one request: how many, how long
+    they took and, when ``track_statements`` is set, how often each
+    distinct statement ran (used to spot N+1 loops).
+    """
+
+    __slots__ = ("count", "duration", "statements")
+
+    def __init__(self, track_statements: bool = True) -> None:
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Optional[Dict[str, int]] = {} if track_statements else None
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        if self.statements is not None:
+            self.statements[statement] = self.statements.get(statement, 0) + 1
+
+    def repeated_statements(self, threshold: int) -> List[Tuple[str, int]]:
+        """
+        Statements executed at least ``threshold`` times, most frequent first.
+        """
+        if not self.statements or threshold <= 0:
+            return []
+        repeated = [(sql, n) for sql, n in self.statements.items() if n >= threshold]
+        return sorted(repeated, key=lambda item: item[1], reverse=True)
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+
+# Stats of the request being served; None outside of requests.
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started_at"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_query(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - conn.info["query_started_at"])
@@ -0,0 +1,61 @@
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# Session.info key marking sessions bound to the read replica.
+REPLICA_SESSION_KEY = "replica"
+
+# Id of the authenticated caller of the current request, set by the auth
+# dependencies so that commits can be attributed to a user.
+request_user_id: ContextVar[Optional[str]] = ContextVar("request_user_id", default=None)
+
+# user_id -> True for users who committed a write within the last
+# READ_YOUR_WRITES_SECONDS. Their reads go to the primary so they never
+# observe replication lag on their own changes. Tracked per process.
+recent_writers = TTLCache(
+    maxsize=settings.READ_YOUR_WRITES_MAX_USERS,
+    ttl=settings.READ_YOUR_WRITES_SECONDS,
+)
+
+_WROTE_KEY = "wrote"
+
+
+def mark_recent_write(user_id: str) -> None:
+    recent_writers.set(user_id, True)
+
+
+def has_recent_write(user_id: str) -> bool:
+    return recent_writers.get(user_id, False)
+
+
+def is_replica_session(session) -> bool:
+    return bool(session.info.get(REPLICA_SESSION_KEY))
+
+
+@event.listens_for(Session, "after_flush")
+def _flag_flush(session, flush_context):
+    session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_dml(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info[_WROTE_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _record_writer(session):
+    if session.info.pop(_WROTE_KEY, False):
+        user_id = request_user_id.get()
+        if user_id is not None:
+            mark_recent_write(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session):
+    session.info.pop(_WROTE_KEY, None)
@@ -1,9 +1,23 @@
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from app.core.config import settings
+from app.db.pool import InstrumentedAsyncPool
+from app.db.routing import REPLICA_SESSION_KEY
 
-engine = create_async_engine(
-    settings.DATABASE_URL,
-)
+
+def _create_engine(url: str):
+    return create_async_engine(
+        url,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    )
+
+
+engine = _create_engine(settings.DATABASE_URL)
 
 AsyncSessionLocal = async_sessionmaker(
     autocommit=False,
@@ -12,6 +26,28 @@ AsyncSessionLocal = async_sessionmaker(
     class_=AsyncSession,
 )
 
+# Without a replica configured, reads share the primary engine and sessions.
+if settings.READ_DATABASE_URL:
+    read_engine = _create_engine(settings.READ_DATABASE_URL)
+    AsyncReadSessionLocal = async_sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        bind=read_engine,
+        class_=AsyncSession,
+        info={REPLICA_SESSION_KEY: True},
+    )
+else:
+    read_engine = engine
+    AsyncReadSessionLocal = AsyncSessionLocal
+
+
+def engine_pools():
+    """Connection pools by role: the primary, and the replica when configured."""
+    pools = {"primary": engine.pool}
+    if settings.READ_DATABASE_URL:
+        pools["replica"] = read_engine.pool
+    return pools
+
 
 async def get_db():
     async with AsyncSessionLocal() as session:
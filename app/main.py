@@ -5,10 +5,8 @@ from fastapi.responses import JSONResponse
 from app.api.v1.router import api_router
 from app.core.config import settings
 
-from app.db.base import Base
-from app.db.session import engine
-
-# Import all models to ensure they are registered with Base for migrations/creation
+# Import all models so their relationships resolve. The schema itself is
+# managed by Alembic migrations (python -m app.db.migrate).
 from app.models.user import User
 from app.models.project import Project
 from app.models.project_member import ProjectMember
@@ -16,7 +14,8 @@ from app.models.task import Task
 from app.models.user_task_status import UserTaskStatus
 
 
-from app.core.middleware import SecurityHeadersMiddleware
+from app.core.middleware import MetricsMiddleware, QueryStatsMiddleware, SecurityHeadersMiddleware
+from app.core.security import PasswordHasherBusy
 
 app = FastAPI(
     title="Team Tasks Manager API",
@@ -37,11 +36,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.on_event("startup")
-async def startup_event():
-    async with engine.begin() as conn:
-        # Create tables if they don't exist
-        await conn.run_sync(Base.metadata.create_all)
+# SQL statement count / DB time per request (Server-Timing header + app.sql log)
+app.add_middleware(
+    QueryStatsMiddleware,
+    n_plus_one_threshold=settings.SQL_N_PLUS_ONE_THRESHOLD,
+)
+
+# Per-route request metrics (outermost, so CORS preflights are counted too)
+app.add_middleware(MetricsMiddleware)
 
 @app.exception_handler(PermissionError)
 async def permission_error_handler(request: Request, exc: PermissionError):
@@ -50,6 +52,14 @@ async def permission_error_handler(request: Request, exc: PermissionError):
         content={"detail": str(exc)},
     )
 
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"},
+    )
+
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
     return JSONResponse(
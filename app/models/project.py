@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, Integer
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -21,4 +21,12 @@ class Project(Base):
 
     owner_id = Column(String, ForeignKey("users.id"), nullable=False)
 
+    # Bumped by every write to the project, its tasks, statuses or members;
+    # backs the ETags of project-scoped reads
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_projects_owner_id", "owner_id", "created_at", "id"),
+    )
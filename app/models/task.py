@@ -1,9 +1,20 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey
+from sqlalchemy import Column, Computed, String, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 import uuid
 
 from app.db.base import Base
 
+# Text search configuration of tasks.search_vector; queries must use the
+# same one for the GIN index to apply
+TASK_SEARCH_CONFIG = "english"
+
+TASK_SEARCH_DOCUMENT = (
+    f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{TASK_SEARCH_CONFIG}', description), 'B')"
+)
+
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -16,5 +27,24 @@ class Task(Base):
     description = Column(String, nullable=False)
     status = Column(String, nullable=False)
 
+    # Current members' personal statuses on this task, rolled up per status.
+    # Kept in sync by triggers on user_task_statuses and project_members,
+    # installed by migration 0003.
+    active_count = Column(Integer, nullable=False, server_default="0")
+    pending_count = Column(Integer, nullable=False, server_default="0")
+    complete_count = Column(Integer, nullable=False, server_default="0")
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now())
+
+    # Title (weight A) and description (weight B) lexemes, maintained by
+    # PostgreSQL. Deferred: only search reads it.
+    search_vector = deferred(Column(TSVECTOR, Computed(TASK_SEARCH_DOCUMENT, persisted=True)))
+
+    __table_args__ = (
+        # Keyset listing of a project's tasks, optionally narrowed to a creator
+        Index("ix_tasks_project_id_created_at", "project_id", "created_at", "id"),
+        Index("ix_tasks_project_id_created_by_id", "project_id", "created_by_id", "created_at", "id"),
+        Index("ix_tasks_created_by_id", "created_by_id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+    )
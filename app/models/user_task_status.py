@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -20,4 +20,6 @@ class UserTaskStatus(Base):
 
     __table_args__ = (
         UniqueConstraint("task_id", "user_id", name="uq_user_task_status"),
+        Index("ix_user_task_statuses_user_id", "user_id"),
     )
+
@@ -1,5 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import datetime
+from typing import List, Literal
+from app.core.config import settings
 
 class ProjectMemberUserInfo(BaseModel):
     id: str
@@ -24,6 +26,19 @@ class ProjectMemberAdd(BaseModel):
     user_id: str
 
 
+class ProjectMemberBatch(BaseModel):
+    user_ids: List[str] = Field(min_length=1, max_length=settings.MAX_MEMBER_BATCH_SIZE)
+
+
+class ProjectMemberBatchOutcome(BaseModel):
+    user_id: str
+    outcome: Literal["ADDED", "ALREADY_MEMBER", "USER_NOT_FOUND", "REMOVED", "NOT_MEMBER"]
+
+
+class ProjectMemberBatchResponse(BaseModel):
+    results: List[ProjectMemberBatchOutcome]
+
+
 class ProjectMemberResponse(BaseModel):
     id: str
     project_id: str
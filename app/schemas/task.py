@@ -1,6 +1,7 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Literal, List
 from datetime import datetime
+from app.core.config import settings
 
 
 class TaskCreate(BaseModel):
@@ -10,12 +11,40 @@ class TaskCreate(BaseModel):
     status: Literal["ACTIVE", "PENDING", "COMPLETE"]
 
 
+class TaskBatchItem(BaseModel):
+    title: str
+    description: str
+    status: Literal["ACTIVE", "PENDING", "COMPLETE"]
+
+
+class TaskBatchCreate(BaseModel):
+    project_id: str
+    tasks: List[TaskBatchItem] = Field(min_length=1, max_length=settings.MAX_TASK_BATCH_SIZE)
+
+
 class TaskUpdate(BaseModel):
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[Literal["ACTIVE", "PENDING", "COMPLETE"]] = None
 
 
+class MemberStatusUpdate(BaseModel):
+    task_id: str
+    status: Literal["ACTIVE", "PENDING", "COMPLETE"]
+
+
+class MemberStatusBatchUpdate(BaseModel):
+    updates: List[MemberStatusUpdate] = Field(min_length=1, max_length=settings.MAX_TASK_BATCH_SIZE)
+
+
+class MemberStatusResponse(BaseModel):
+    task_id: str
+    status: str
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class TaskResponse(BaseModel):
     id: str
     project_id: str
@@ -23,6 +52,10 @@ class TaskResponse(BaseModel):
     title: str
     description: str
     status: str
+    # Progress of common tasks: how many members report each status
+    active_count: int = 0
+    pending_count: int = 0
+    complete_count: int = 0
     created_at: datetime
     updated_at: datetime
 
@@ -40,3 +73,31 @@ class MemberTaskStatus(BaseModel):
 
 class TaskOwnerResponse(TaskResponse):
     member_statuses: List[MemberTaskStatus] = []
+
+
+class TaskSearchResult(TaskResponse):
+    # ts_rank of the match; results come best first
+    rank: float
+
+
+class TaskImportError(BaseModel):
+    line: int
+    message: str
+
+
+class TaskImportResponse(BaseModel):
+    imported: int
+    failed: int
+    # The first MAX_IMPORT_ERRORS failures; `failed` counts all of them
+    errors: List[TaskImportError]
+
+
+class TaskExportRecord(TaskResponse):
+    """A task line of GET /projects/{id}/export."""
+    type: Literal["task"] = "task"
+
+
+class MemberStatusExportRecord(MemberTaskStatus):
+    """A member status line of the export, following its task's line."""
+    type: Literal["member_status"] = "member_status"
+    task_id: str
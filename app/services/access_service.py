@@ -1,13 +1,131 @@
-from typing import Union
+from typing import NamedTuple, Optional, Sequence, Set, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, exists, and_
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.db.routing import is_replica_session
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.task import Task
 from app.models.user import User
 
 
+ROLE_OWNER = "owner"
+ROLE_MEMBER = "member"
+ROLE_NONE = "none"
+
+
+class ProjectAccess(NamedTuple):
+    role: str
+    owner_id: str
+
+
+# (user_id, project_id) -> ProjectAccess. Unknown projects are never cached.
+access_cache = TTLCache(
+    maxsize=settings.ACCESS_CACHE_MAX_SIZE,
+    ttl=settings.ACCESS_CACHE_TTL_SECONDS,
+)
+
+
 class AccessService:
+    @classmethod
+    def _is_member(cls, project_id_column, current_user: User):
+        return exists().where(
+            ProjectMember.project_id == project_id_column,
+            ProjectMember.user_id == current_user.id
+        ).label("is_member")
+
+    @classmethod
+    def _remember_access(cls, db: AsyncSession, current_user: User, project_id: str, owner_id: str, is_member: bool) -> ProjectAccess:
+        if owner_id == current_user.id:
+            role = ROLE_OWNER
+        elif is_member:
+            role = ROLE_MEMBER
+        else:
+            role = ROLE_NONE
+
+        access = ProjectAccess(role=role, owner_id=owner_id)
+        # A replica may not have seen a membership granted or revoked moments
+        # ago; do not pin a decision read from it in the cache.
+        if not is_replica_session(db):
+            access_cache.set((current_user.id, project_id), access)
+        return access
+
+    @classmethod
+    async def get_project_access(cls, db: AsyncSession, project_id: str, current_user: User) -> Optional[ProjectAccess]:
+        """
+        Returns the caller's role in the project, or None if the project does
+        not exist. Decisions are cached per process for ACCESS_CACHE_TTL_SECONDS.
+        """
+        access = access_cache.get((current_user.id, project_id))
+        if access is not None:
+            return access
+
+        result = await db.execute(
+            select(Project.owner_id, cls._is_member(Project.id, current_user)).filter(Project.id == project_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        return cls._remember_access(db, current_user, project_id, row.owner_id, row.is_member)
+
+    @classmethod
+    async def get_project_access_and_version(cls, db: AsyncSession, project_id: str, current_user: User) -> Optional[Tuple[ProjectAccess, int]]:
+        """
+        Returns the caller's role and the project's current version, or None
+        if the project does not exist. The version is always read from the
+        database; on an access cache miss both come from one statement.
+        """
+        access = access_cache.get((current_user.id, project_id))
+        if access is not None:
+            version = await db.scalar(select(Project.version).filter(Project.id == project_id))
+            return None if version is None else (access, version)
+
+        result = await db.execute(
+            select(Project.owner_id, Project.version, cls._is_member(Project.id, current_user))
+            .filter(Project.id == project_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        return cls._remember_access(db, current_user, project_id, row.owner_id, row.is_member), row.version
+
+    @classmethod
+    def invalidate_project_access(cls, project_id: str, user_id: Optional[str] = None) -> None:
+        """
+        Drops cached decisions for one member of the project, or for everyone
+        when no user is given.
+        """
+        if user_id is not None:
+            access_cache.pop((user_id, project_id))
+            return
+
+        for key in access_cache.keys():
+            if key[1] == project_id:
+                access_cache.pop(key)
+
+    @classmethod
+    async def _get_project_and_access(cls, db: AsyncSession, project_id: str, current_user: User) -> Tuple[Optional[Project], Optional[ProjectAccess]]:
+        """
+        Loads the project and the caller's access decision. On a cache miss both
+        come from a single statement.
+        """
+        access = access_cache.get((current_user.id, project_id))
+        if access is not None:
+            return await db.get(Project, project_id), access
+
+        result = await db.execute(
+            select(Project, cls._is_member(Project.id, current_user)).filter(Project.id == project_id)
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None, None
+
+        project, is_member = row
+        return project, cls._remember_access(db, current_user, project_id, project.owner_id, is_member)
+
     @classmethod
     async def get_project_with_access(cls, db: AsyncSession, project_id: str, current_user: User) -> Union[Project, bool, None]:
         """
@@ -16,27 +134,14 @@ class AccessService:
         - False: if project exists but access denied
         - None: if project not found
         """
-        result = await db.execute(select(Project).filter(Project.id == project_id))
-        project = result.scalar_one_or_none()
-        if not project:
+        project, access = await cls._get_project_and_access(db, project_id, current_user)
+        if project is None:
             return None
-            
-        # Check if the user is the owner
-        if project.owner_id == current_user.id:
-            return project
 
-        # Check if the user is a member
-        result = await db.execute(
-            select(ProjectMember).filter(
-                ProjectMember.project_id == project_id,
-                ProjectMember.user_id == current_user.id
-            )
-        )
-        membership = result.scalar_one_or_none()
-        if membership:
-            return project
+        if access.role == ROLE_NONE:
+            return False
 
-        return False
+        return project
 
     @classmethod
     async def get_project_owner_access(cls, db: AsyncSession, project_id: str, current_user: User) -> Union[Project, bool, None]:
@@ -46,51 +151,89 @@ class AccessService:
         - False: if project exists but user is not Owner
         - None: if project not found
         """
-        result = await db.execute(select(Project).filter(Project.id == project_id))
-        project = result.scalar_one_or_none()
-        if not project:
+        project, access = await cls._get_project_and_access(db, project_id, current_user)
+        if project is None:
             return None
-            
-        if project.owner_id == current_user.id:
-            return project
-            
-        return False
+
+        if access.role != ROLE_OWNER:
+            return False
+
+        return project
 
     @classmethod
-    async def get_task_with_access(cls, db: AsyncSession, task_id: str, current_user: User) -> Union[Task, bool, None]:
+    async def get_task_and_project_with_access(cls, db: AsyncSession, task_id: str, current_user: User) -> Union[Tuple[Task, Project], bool, None]:
         """
+        Loads the task, its project and the caller's membership flag in one
+        statement.
+
         Returns:
-        - Task: if access granted
+        - (Task, Project): if access granted
         - False: if task exists but access denied
         - None: if task not found
         """
-        result = await db.execute(select(Task).filter(Task.id == task_id))
-        task = result.scalar_one_or_none()
-        if not task:
-            return None
-            
-        result = await db.execute(select(Project).filter(Project.id == task.project_id))
-        project = result.scalar_one_or_none()
-        if not project:
+        result = await db.execute(
+            select(Task, Project, cls._is_member(Project.id, current_user))
+            .join(Project, Project.id == Task.project_id)
+            .filter(Task.id == task_id)
+        )
+        row = result.one_or_none()
+        if row is None:
             return None
 
+        task, project, is_member = row
+        access = cls._remember_access(db, current_user, project.id, project.owner_id, is_member)
+
         # Rule 1: Creator always has access
         if task.created_by_id == current_user.id:
-            return task
+            return task, project
 
         # Rule 2: If task was created by project owner (Common Task), all members have access
-        if task.created_by_id == project.owner_id:
-            result = await db.execute(
-                select(ProjectMember).filter(
-                    ProjectMember.project_id == project.id,
-                    ProjectMember.user_id == current_user.id
+        if task.created_by_id == project.owner_id and access.role == ROLE_MEMBER:
+            return task, project
+
+        return False
+
+    @classmethod
+    async def get_project_access_and_common_tasks(cls, db: AsyncSession, project_id: str, task_ids: Sequence[str], current_user: User) -> Optional[Tuple[ProjectAccess, Set[str]]]:
+        """
+        In one statement, resolves the caller's role in the project and which
+        of ``task_ids`` are common tasks (created by the owner) of it.
+
+        Returns None if the project does not exist.
+        """
+        result = await db.execute(
+            select(Project.owner_id, cls._is_member(Project.id, current_user), Task.id)
+            .outerjoin(
+                Task,
+                and_(
+                    Task.project_id == Project.id,
+                    Task.created_by_id == Project.owner_id,
+                    Task.id.in_(task_ids)
                 )
             )
-            membership = result.scalar_one_or_none()
-            if membership:
-                return task
+            .filter(Project.id == project_id)
+        )
+        rows = result.all()
+        if not rows:
+            return None
 
-        return False
+        owner_id, is_member = rows[0].owner_id, rows[0].is_member
+        access = cls._remember_access(db, current_user, project_id, owner_id, is_member)
+        return access, {row.id for row in rows if row.id is not None}
+
+    @classmethod
+    async def get_task_with_access(cls, db: AsyncSession, task_id: str, current_user: User) -> Union[Task, bool, None]:
+        """
+        Returns:
+        - Task: if access granted
+        - False: if task exists but access denied
+        - None: if task not found
+        """
+        access = await cls.get_task_and_project_with_access(db, task_id, current_user)
+        if not access:
+            return access
+
+        return access[0]
 
     # Aliases for backward compatibility
     check_project_access = get_project_with_access
@@ -2,7 +2,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.user import User
 from app.schemas.auth import SignupRequest
-from app.core.security import hash_password, verify_password, create_access_token
+from app.core.security import hash_password_async, verify_password_async, create_access_token
+from app.db.routing import mark_recent_write
 
 
 async def register_user_service(db: AsyncSession, payload: SignupRequest):
@@ -16,12 +17,15 @@ async def register_user_service(db: AsyncSession, payload: SignupRequest):
         email=payload.email,
         full_name=payload.full_name,
         role=payload.role,
-        hashed_password=hash_password(payload.password),
+        hashed_password=await hash_password_async(payload.password),
     )
 
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
+    # No principal exists yet during signup; pin the new user's first reads
+    # (login, /me) to the primary explicitly.
+    mark_recent_write(new_user.id)
 
     return new_user
 
@@ -33,7 +37,7 @@ async def login_user_service(db: AsyncSession, email: str, password: str):
     if not user:
         return None
 
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return None
 
     access_token = create_access_token(
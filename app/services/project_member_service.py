@@ -1,13 +1,18 @@
-from typing import List, Union
+from typing import List, Optional, Union
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
-from sqlalchemy import select
+from sqlalchemy import select, delete, and_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.user import User
 from datetime import datetime
 import uuid
-from app.services.access_service import AccessService
+from app.services.access_service import AccessService, ROLE_NONE, ROLE_OWNER
+from app.services.project_service import ProjectService
+from app.core.response_cache import invalidate_user_projects
+from app.core.pagination import apply_keyset, build_page, resolve_limit
+from app.schemas.project_member import ProjectMemberBatchOutcome
 
 
 class ProjectMemberService:
@@ -20,12 +25,12 @@ class ProjectMemberService:
         current_user: User,
     ) -> Union[ProjectMember, str, None]:
         # Only owner can add members
-        access = await AccessService.get_project_owner_access(db, project_id, current_user)
+        access = await AccessService.get_project_access(db, project_id, current_user)
         
         if access is None:
             return None
             
-        if access is False:
+        if access.role != ROLE_OWNER:
             raise PermissionError("Only owner can add members")
 
         # Check user exists
@@ -55,33 +60,111 @@ class ProjectMemberService:
         )
 
         db.add(membership)
+        await ProjectService.bump_version(db, project_id)
         await db.commit()
         await db.refresh(membership)
+        AccessService.invalidate_project_access(project_id, user_id)
+        await invalidate_user_projects(user_id)
 
         return membership
 
+    @classmethod
+    async def add_members_to_project_service(
+        cls,
+        db: AsyncSession,
+        project_id: str,
+        user_ids: List[str],
+        current_user: User,
+    ) -> Union[List[ProjectMemberBatchOutcome], None]:
+        """
+        Adds many users at once. Users and their existing memberships are
+        resolved in one query and the new memberships are inserted with one
+        statement. Returns one outcome per distinct user id, in request order.
+        """
+        access = await AccessService.get_project_access(db, project_id, current_user)
+
+        if access is None:
+            return None
+
+        if access.role != ROLE_OWNER:
+            raise PermissionError("Only owner can add members")
+
+        user_ids = list(dict.fromkeys(user_ids))
+        result = await db.execute(
+            select(User.id, ProjectMember.id.label("membership_id"))
+            .outerjoin(
+                ProjectMember,
+                and_(
+                    ProjectMember.user_id == User.id,
+                    ProjectMember.project_id == project_id,
+                )
+            )
+            .filter(User.id.in_(user_ids))
+        )
+        existing_users = {row.id: row.membership_id is not None for row in result.all()}
+
+        to_add = [user_id for user_id in user_ids if existing_users.get(user_id) is False]
+        added = set()
+        if to_add:
+            joined_at = datetime.utcnow()
+            # Rows inserted concurrently by another request are skipped and
+            # reported as already present.
+            result = await db.execute(
+                pg_insert(ProjectMember)
+                .values([
+                    {"id": str(uuid.uuid4()), "project_id": project_id, "user_id": user_id, "joined_at": joined_at}
+                    for user_id in to_add
+                ])
+                .on_conflict_do_nothing(constraint="uq_project_member")
+                .returning(ProjectMember.user_id)
+            )
+            added = set(result.scalars().all())
+            if added:
+                await ProjectService.bump_version(db, project_id)
+            await db.commit()
+            for user_id in added:
+                AccessService.invalidate_project_access(project_id, user_id)
+            await invalidate_user_projects(*added)
+
+        outcomes = []
+        for user_id in user_ids:
+            if user_id not in existing_users:
+                outcome = "USER_NOT_FOUND"
+            elif user_id in added:
+                outcome = "ADDED"
+            else:
+                outcome = "ALREADY_MEMBER"
+            outcomes.append(ProjectMemberBatchOutcome(user_id=user_id, outcome=outcome))
+        return outcomes
+
     @classmethod
     async def list_project_members_service(
         cls,
         db: AsyncSession,
         project_id: str,
         current_user: User,
-    ) -> List[ProjectMember]:
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        limit = resolve_limit(limit)
         # Check if user has access to view members
-        access = await AccessService.get_project_with_access(db, project_id, current_user)
+        access = await AccessService.get_project_access(db, project_id, current_user)
         
         if access is None:
-            return []
+            return build_page([], limit)
             
-        if access is False:
+        if access.role == ROLE_NONE:
             raise PermissionError("Not allowed to view members")
 
         result = await db.execute(
-            select(ProjectMember)
-            .options(joinedload(ProjectMember.user))
-            .filter(ProjectMember.project_id == project_id)
+            apply_keyset(
+                select(ProjectMember)
+                .options(joinedload(ProjectMember.user))
+                .filter(ProjectMember.project_id == project_id),
+                ProjectMember.joined_at, ProjectMember.id, cursor, limit
+            )
         )
-        return result.scalars().all()
+        return build_page(result.scalars().all(), limit, sort_key=lambda m: m.joined_at)
 
     @classmethod
     async def remove_member_from_project_service(
@@ -92,12 +175,12 @@ class ProjectMemberService:
         current_user: User,
     ) -> bool:
         # Only owner can remove members
-        access = await AccessService.get_project_owner_access(db, project_id, current_user)
+        access = await AccessService.get_project_access(db, project_id, current_user)
         
         if access is None:
             return None
             
-        if access is False:
+        if access.role != ROLE_OWNER:
             raise PermissionError("Only owner can remove members")
 
         result = await db.execute(
@@ -113,6 +196,51 @@ class ProjectMemberService:
             return False
 
         await db.delete(membership)
+        await ProjectService.bump_version(db, project_id)
         await db.commit()
+        AccessService.invalidate_project_access(project_id, user_id)
+        await invalidate_user_projects(user_id)
 
         return True
+
+    @classmethod
+    async def remove_members_from_project_service(
+        cls,
+        db: AsyncSession,
+        project_id: str,
+        user_ids: List[str],
+        current_user: User,
+    ) -> Union[List[ProjectMemberBatchOutcome], None]:
+        """
+        Removes many users at once with a single DELETE ... RETURNING.
+        Returns one outcome per distinct user id, in request order.
+        """
+        access = await AccessService.get_project_access(db, project_id, current_user)
+
+        if access is None:
+            return None
+
+        if access.role != ROLE_OWNER:
+            raise PermissionError("Only owner can remove members")
+
+        user_ids = list(dict.fromkeys(user_ids))
+        result = await db.execute(
+            delete(ProjectMember)
+            .where(
+                ProjectMember.project_id == project_id,
+                ProjectMember.user_id.in_(user_ids),
+            )
+            .returning(ProjectMember.user_id)
+        )
+        removed = set(result.scalars().all())
+        if removed:
+            await ProjectService.bump_version(db, project_id)
+        await db.commit()
+        for user_id in removed:
+            AccessService.invalidate_project_access(project_id, user_id)
+        await invalidate_user_projects(*removed)
+
+        return [
+            ProjectMemberBatchOutcome(user_id=user_id, outcome="REMOVED" if user_id in removed else "NOT_MEMBER")
+            for user_id in user_ids
+        ]
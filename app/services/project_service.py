@@ -1,11 +1,13 @@
-from typing import List, Union
+from typing import List, Optional, Tuple, Union
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, or_
+from sqlalchemy import select, update, or_
 from app.models.project import Project
 from app.models.project_member import ProjectMember
 from app.models.user import User
 from app.schemas.project import ProjectCreate, ProjectUpdate
-from app.services.access_service import AccessService
+from app.services.access_service import AccessService, ROLE_NONE
+from app.core.response_cache import invalidate_user_projects
+from app.core.pagination import apply_keyset, build_page, resolve_limit
 
 
 class ProjectService:
@@ -25,26 +27,34 @@ class ProjectService:
         db.add(project)
         await db.commit()
         await db.refresh(project)
+        await invalidate_user_projects(current_user.id)
 
         return project
 
     @classmethod
-    async def get_user_projects_service(cls, db: AsyncSession, current_user: User) -> List[Project]:
+    async def get_user_projects_service(
+        cls,
+        db: AsyncSession,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        limit = resolve_limit(limit)
+        member_project_ids = select(ProjectMember.project_id).filter(
+            ProjectMember.user_id == current_user.id
+        )
         result = await db.execute(
-            select(Project)
-            .outerjoin(
-                ProjectMember,
-                Project.id == ProjectMember.project_id,
+            apply_keyset(
+                select(Project).filter(
+                    or_(
+                        Project.owner_id == current_user.id,
+                        Project.id.in_(member_project_ids),
+                    )
+                ),
+                Project.created_at, Project.id, cursor, limit
             )
-            .filter(
-                or_(
-                    Project.owner_id == current_user.id,
-                    ProjectMember.user_id == current_user.id,
-                )
-            )
-            .distinct()
         )
-        return result.scalars().all()
+        return build_page(result.scalars().all(), limit)
 
     @classmethod
     async def get_project_by_id_service(
@@ -63,6 +73,65 @@ class ProjectService:
             
         return access
 
+    @classmethod
+    async def get_project_version_service(
+        cls,
+        db: AsyncSession,
+        project_id: str,
+        current_user: User,
+    ) -> Optional[int]:
+        """
+        Current version of a project the caller can see, for conditional
+        reads. Returns None if the project does not exist.
+        """
+        checked = await cls.get_project_role_and_version_service(db, project_id, current_user)
+        return checked[1] if checked else None
+
+    @classmethod
+    async def get_project_role_and_version_service(
+        cls,
+        db: AsyncSession,
+        project_id: str,
+        current_user: User,
+    ) -> Optional[Tuple[str, int]]:
+        """
+        The caller's role in a project they can see together with its
+        current version. Returns None if the project does not exist.
+        """
+        checked = await AccessService.get_project_access_and_version(db, project_id, current_user)
+
+        if checked is None:
+            return None
+
+        access, version = checked
+        if access.role == ROLE_NONE:
+            raise PermissionError("Not allowed to access this project")
+
+        return access.role, version
+
+    @classmethod
+    async def bump_version(cls, db: AsyncSession, project_id: str) -> None:
+        """
+        Records a change to the project's tasks, statuses or members, which
+        also retires the cached responses keyed by the previous version.
+        Call it in the writing transaction right before the commit so the
+        project row stays locked only briefly.
+
+        Lock order: project_members rows, then tasks rows, then the project
+        row. Member removal locks the membership before the counter
+        trigger locks its tasks (in id order). Status writes lock the
+        membership before their counter trigger updates the task. Task
+        deletes only lock the task, because statuses removed by the cascade
+        skip the membership. Pending ORM changes are flushed here so the
+        task rows are locked before the project row, since sessions do not
+        autoflush; bumping first would deadlock with a concurrent member
+        status update on the same task.
+        """
+        await db.flush()
+        await db.execute(
+            update(Project).where(Project.id == project_id).values(version=Project.version + 1)
+        )
+
     @classmethod
     async def update_project_service(
         cls,
@@ -85,8 +154,12 @@ class ProjectService:
         if project_in.description is not None:
             access.description = project_in.description
 
+        # Part of the same UPDATE as the changed fields
+        access.version = Project.version + 1
+        user_ids = await cls._get_project_user_ids(db, access)
         await db.commit()
         await db.refresh(access)
+        await invalidate_user_projects(*user_ids)
 
         return access
 
@@ -105,7 +178,21 @@ class ProjectService:
         if access is False:
             raise PermissionError("Not allowed to delete this project")
 
+        user_ids = await cls._get_project_user_ids(db, access)
         await db.delete(access)
         await db.commit()
+        AccessService.invalidate_project_access(project_id)
+        await invalidate_user_projects(*user_ids)
 
         return True
+
+    @classmethod
+    async def _get_project_user_ids(cls, db: AsyncSession, project: Project) -> List[str]:
+        """
+        The owner and members of a project: everyone whose project list
+        shows it.
+        """
+        result = await db.execute(
+            select(ProjectMember.user_id).filter(ProjectMember.project_id == project.id)
+        )
+        return [project.owner_id, *result.scalars().all()]
@@ -1,26 +1,58 @@
-from typing import List, Union
+from collections import defaultdict
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple, Union
+from asyncpg import PostgresError
+from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
-from sqlalchemy import select
-from app.models.task import Task
+from sqlalchemy import Integer, bindparam, literal_column, select, insert, func, and_, or_, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.task import Task, TASK_SEARCH_CONFIG
 from app.models.user import User
 from app.models.user_task_status import UserTaskStatus
-from app.models.project import Project
-from app.schemas.task import TaskCreate, TaskUpdate, TaskOwnerResponse, MemberTaskStatus
-from app.services.access_service import AccessService
+from app.schemas.task import (
+    TaskCreate,
+    TaskBatchCreate,
+    TaskBatchItem,
+    TaskUpdate,
+    TaskResponse,
+    TaskOwnerResponse,
+    TaskSearchResult,
+    MemberTaskStatus,
+    MemberStatusBatchUpdate,
+    MemberStatusResponse,
+    TaskExportRecord,
+    MemberStatusExportRecord,
+)
+from app.services.access_service import AccessService, ROLE_MEMBER, ROLE_NONE, ROLE_OWNER
+from app.services.project_service import ProjectService
+from app.core.config import settings
+from app.core.import_formats import ImportRecord
+from app.core.pagination import apply_keyset, build_page, decode_cursor, resolve_limit
+from app.core.serialization import dump_json
+from datetime import timedelta
 import uuid
 
 
+# Columns of a task response: everything but the search document
+TASK_COLUMNS = tuple(c for c in Task.__table__.c if c.key != "search_vector")
+
+TASK_IMPORT_COLUMNS = (
+    "id", "project_id", "created_by_id", "title", "description", "status", "created_at", "updated_at",
+)
+
+
 class TaskService:
     @classmethod
     async def create_task_service(cls, db: AsyncSession, task_in: TaskCreate, current_user: User) -> Union[Task, None]:
         # Check project exists
-        access = await AccessService.get_project_with_access(db, task_in.project_id, current_user)
+        access = await AccessService.get_project_access(db, task_in.project_id, current_user)
         
         if access is None:
             return None
             
-        if access is False:
+        if access.role == ROLE_NONE:
             raise PermissionError("Not allowed to create task in this project")
 
         task = Task(
@@ -33,124 +65,301 @@ class TaskService:
         )
         
         db.add(task)
+        await ProjectService.bump_version(db, task.project_id)
         await db.commit()
         await db.refresh(task)
         
         return task
 
     @classmethod
-    async def get_project_tasks_service(cls, db: AsyncSession, project_id: str, current_user: User) -> List[Union[TaskOwnerResponse, Task]]:
-        access = await AccessService.get_project_with_access(db, project_id, current_user)
+    async def create_tasks_batch_service(cls, db: AsyncSession, batch_in: TaskBatchCreate, current_user: User) -> Union[List[TaskResponse], None]:
+        """
+        Creates all tasks of the batch after a single access check, with one
+        bulk INSERT ... RETURNING in one transaction. Tasks are stamped by the
+        database clock like single creates, and keep the order of the
+        request: their created_at values are spaced one microsecond apart.
+        """
+        access = await AccessService.get_project_access(db, batch_in.project_id, current_user)
+
+        if access is None:
+            return None
+
+        if access.role == ROLE_NONE:
+            raise PermissionError("Not allowed to create task in this project")
+
+        rows = [
+            {
+                "id": str(uuid.uuid4()),
+                "project_id": batch_in.project_id,
+                "created_by_id": current_user.id,
+                "title": item.title,
+                "description": item.description,
+                "status": item.status,
+                # A parameter can't appear twice in a batched INSERT
+                "created_position": i,
+                "updated_position": i,
+            }
+            for i, item in enumerate(batch_in.tasks)
+        ]
+        microsecond = literal_column("interval '1 microsecond'")
+
+        # Core insert: no ORM instances to build, track and expire on commit
+        result = await db.execute(
+            insert(Task.__table__)
+            .values(
+                created_at=func.now() + microsecond * bindparam("created_position", type_=Integer),
+                updated_at=func.now() + microsecond * bindparam("updated_position", type_=Integer),
+            )
+            .returning(*TASK_COLUMNS, sort_by_parameter_order=True),
+            rows,
+        )
+        tasks = [TaskResponse.model_validate(row) for row in result.mappings()]
+        await ProjectService.bump_version(db, batch_in.project_id)
+        await db.commit()
+
+        return tasks
+
+    @classmethod
+    async def import_tasks_service(cls, db: AsyncSession, project_id: str, records: AsyncIterator[ImportRecord], current_user: User) -> Optional[dict]:
+        """
+        Creates a task for every valid record of an import file after a
+        single access check, or returns None if the project does not exist.
+        Records are validated as TaskBatchItem while they stream in and
+        loaded IMPORT_CHUNK_SIZE at a time with COPY, in one transaction.
+        Invalid rows are skipped and reported by line; they never abort
+        the load.
+        """
+        access = await AccessService.get_project_access(db, project_id, current_user)
+
+        if access is None:
+            return None
+
+        if access.role == ROLE_NONE:
+            raise PermissionError("Not allowed to create task in this project")
+
+        report = {"imported": 0, "failed": 0, "errors": []}
+        # COPY takes literal values: read the database clock once, so rows
+        # are stamped like single creates in this transaction
+        created_at = (await db.execute(select(func.now()))).scalar_one()
+        position = 0
+        chunk = []
+
+        async for line, fields in records:
+            if isinstance(fields, dict):
+                try:
+                    item = TaskBatchItem.model_validate(fields)
+                except ValidationError as exc:
+                    fields = "; ".join(
+                        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+                        for error in exc.errors()
+                    )
+            if isinstance(fields, str):
+                cls._add_import_error(report, line, fields)
+                continue
+
+            # Spaced one microsecond apart to keep the order of the file
+            timestamp = created_at + timedelta(microseconds=position)
+            position += 1
+            chunk.append((line, (
+                str(uuid.uuid4()), project_id, current_user.id,
+                item.title, item.description, item.status, timestamp, timestamp,
+            )))
+            if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+                await cls._copy_tasks(db, chunk, report)
+                chunk = []
+
+        if chunk:
+            await cls._copy_tasks(db, chunk, report)
+
+        if report["imported"]:
+            await ProjectService.bump_version(db, project_id)
+        await db.commit()
+
+        return report
+
+    @classmethod
+    async def get_project_tasks_service(
+        cls,
+        db: AsyncSession,
+        project_id: str,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        include_member_statuses: bool = True,
+    ) -> dict:
+        limit = resolve_limit(limit)
+        access = await AccessService.get_project_access(db, project_id, current_user)
         
         if access is None:
-            return []
+            return build_page([], limit)
             
-        if access is False:
+        if access.role == ROLE_NONE:
             raise PermissionError("Not allowed to access this project")
 
-        is_owner = access.owner_id == current_user.id
-        
-        result = await db.execute(select(Task).filter(Task.project_id == project_id))
-        tasks = result.scalars().all()
-        
-        if is_owner:
-            owner_tasks = [t for t in tasks if t.created_by_id == current_user.id]
-            
-            response_tasks = []
-            for t in owner_tasks:
-                result = await db.execute(
-                    select(UserTaskStatus)
-                    .options(joinedload(UserTaskStatus.user))
-                    .filter(UserTaskStatus.task_id == t.id)
+        if access.role == ROLE_OWNER:
+            result = await db.execute(
+                apply_keyset(
+                    select(Task).filter(
+                        Task.project_id == project_id,
+                        Task.created_by_id == current_user.id
+                    ),
+                    Task.created_at, Task.id, cursor, limit
                 )
-                member_statuses = result.scalars().all()
-                
-                owner_task = TaskOwnerResponse.model_validate(t)
-                owner_task.member_statuses = [
-                    MemberTaskStatus(
-                        user_id=s.user_id,
-                        full_name=s.user.full_name,
-                        status=s.status,
-                        updated_at=s.updated_at
-                    ) for s in member_statuses
-                ]
-                response_tasks.append(owner_task)
-            return response_tasks
+            )
+            page = build_page(result.scalars().all(), limit)
+            if not include_member_statuses:
+                # The per-status counters on each task are enough for summaries
+                page["items"] = [TaskResponse.model_validate(t) for t in page["items"]]
+                return page
+
+            member_statuses = await cls._get_member_statuses_by_task(db, [t.id for t in page["items"]])
+            page["items"] = [cls._build_owner_task(t, member_statuses[t.id]) for t in page["items"]]
+            return page
         else:
-            member_visible_tasks = [
-                t for t in tasks if (t.created_by_id == access.owner_id) or (t.created_by_id == current_user.id)
-            ]
-            
-            for t in member_visible_tasks:
-                if t.created_by_id == access.owner_id:
-                    result = await db.execute(
-                        select(UserTaskStatus).filter(
-                            UserTaskStatus.task_id == t.id,
-                            UserTaskStatus.user_id == current_user.id
+            result = await db.execute(
+                apply_keyset(
+                    cls._member_tasks_query(access.owner_id, current_user).filter(
+                        Task.project_id == project_id,
+                        or_(
+                            Task.created_by_id == access.owner_id,
+                            Task.created_by_id == current_user.id
                         )
-                    )
-                    user_status = result.scalar_one_or_none()
-                    if user_status:
-                        t.status = user_status.status
-            return member_visible_tasks
+                    ),
+                    Task.created_at, Task.id, cursor, limit
+                )
+            )
+            return build_page(cls._build_member_tasks(result.all()), limit)
 
     @classmethod
-    async def get_task_by_id_service(cls, db: AsyncSession, task_id: str, current_user: User) -> Union[TaskOwnerResponse, Task, None]:
-        task = await AccessService.get_task_with_access(db, task_id, current_user)
-        
-        if task is None:
+    async def search_project_tasks_service(
+        cls,
+        db: AsyncSession,
+        project_id: str,
+        text: str,
+        current_user: User,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        """
+        Full-text search over the titles and descriptions of the project's
+        tasks the caller can see (same rules as the task list), best match
+        first. ``text`` uses web search syntax: quoted phrases, OR, -word.
+
+        Matches come from the GIN index on tasks.search_vector; only those
+        are ranked, and pages continue from a (rank, id) cursor.
+        """
+        limit = resolve_limit(limit)
+        access = await AccessService.get_project_access(db, project_id, current_user)
+
+        if access is None:
+            return build_page([], limit)
+
+        if access.role == ROLE_NONE:
+            raise PermissionError("Not allowed to access this project")
+
+        query = func.websearch_to_tsquery(TASK_SEARCH_CONFIG, text)
+        rank = func.ts_rank(Task.search_vector, query)
+
+        if access.role == ROLE_OWNER:
+            stmt = select(*TASK_COLUMNS).filter(Task.project_id == project_id, Task.created_by_id == current_user.id)
+        else:
+            stmt = cls._visible_member_task_rows_query(project_id, access.owner_id, current_user)
+        stmt = stmt.add_columns(rank.label("rank")).filter(Task.search_vector.op("@@")(query))
+
+        if cursor:
+            cursor_rank, cursor_id = decode_cursor(cursor, float)
+            stmt = stmt.filter(tuple_(rank, Task.id) < tuple_(cursor_rank, cursor_id))
+        result = await db.execute(stmt.order_by(rank.desc(), Task.id.desc()).limit(limit + 1))
+
+        items = [TaskSearchResult.model_validate(row) for row in result.all()]
+        return build_page(items, limit, sort_key=lambda item: item.rank)
+
+    @classmethod
+    async def get_task_by_id_service(cls, db: AsyncSession, task_id: str, current_user: User) -> Union[TaskOwnerResponse, TaskResponse, None]:
+        result = await cls.get_task_and_version_service(db, task_id, current_user)
+        return result[0] if result else None
+
+    @classmethod
+    async def get_task_and_version_service(cls, db: AsyncSession, task_id: str, current_user: User) -> Optional[Tuple[Union[TaskOwnerResponse, TaskResponse], int]]:
+        """
+        The caller's view of a task together with the version of its
+        project, read in the same statement as the task.
+        """
+        access = await cls.get_task_and_project_service(db, task_id, current_user)
+        if access is None:
             return None
-            
-        if task is False:
+
+        task, project = access
+        return await cls.build_task_view_service(db, task, project, current_user), project.version
+
+    @classmethod
+    async def get_task_and_project_service(cls, db: AsyncSession, task_id: str, current_user: User) -> Optional[Tuple[Task, Project]]:
+        """
+        The task and its project (with the version) after the access check,
+        in one statement. Lets conditional reads answer 304 before the
+        caller's view is built.
+        """
+        access = await AccessService.get_task_and_project_with_access(db, task_id, current_user)
+
+        if access is None:
+            return None
+
+        if access is False:
             raise PermissionError("Not allowed to access this task")
 
-        result = await db.execute(select(Project).filter(Project.id == task.project_id))
-        project = result.scalar_one_or_none()
-        
-        if project and project.owner_id == current_user.id and task.created_by_id == project.owner_id:
-            result = await db.execute(
-                select(UserTaskStatus)
-                .options(joinedload(UserTaskStatus.user))
-                .filter(UserTaskStatus.task_id == task_id)
-            )
-            member_statuses = result.scalars().all()
-            
-            owner_task = TaskOwnerResponse.model_validate(task)
-            owner_task.member_statuses = [
-                MemberTaskStatus(
-                    user_id=s.user_id,
-                    full_name=s.user.full_name,
-                    status=s.status,
-                    updated_at=s.updated_at
-                ) for s in member_statuses
-            ]
-            return owner_task
-
-        if project and task.created_by_id == project.owner_id and project.owner_id != current_user.id:
+        return access
+
+    @classmethod
+    async def build_task_view_service(cls, db: AsyncSession, task: Task, project: Project, current_user: User) -> Union[TaskOwnerResponse, TaskResponse]:
+        if project.owner_id == current_user.id and task.created_by_id == project.owner_id:
+            member_statuses = await cls._get_member_statuses_by_task(db, [task.id])
+            return cls._build_owner_task(task, member_statuses[task.id])
+
+        if task.created_by_id == project.owner_id and project.owner_id != current_user.id:
             result = await db.execute(
-                select(UserTaskStatus).filter(
-                    UserTaskStatus.task_id == task.id,
-                    UserTaskStatus.user_id == current_user.id
-                )
+                cls._member_tasks_query(project.owner_id, current_user).filter(Task.id == task.id)
             )
-            user_status = result.scalar_one_or_none()
-            if user_status:
-                task.status = user_status.status
+            return cls._build_member_tasks(result.all())[0]
 
-        return task
+        return TaskResponse.model_validate(task)
 
     @classmethod
-    async def update_task_service(cls, db: AsyncSession, task_id: str, task_in: TaskUpdate, current_user: User) -> Union[Task, None]:
-        task = await AccessService.get_task_with_access(db, task_id, current_user)
+    async def export_project_service(cls, db: AsyncSession, project_id: str, current_user: User) -> Optional[AsyncIterator[bytes]]:
+        """
+        Checks access and returns the caller's view of every task of the
+        project as chunks of newline-delimited JSON, or None if the project
+        does not exist. Visibility follows the task list: the owner gets
+        their tasks, each followed by its member statuses; a member gets
+        common and own tasks with their personal status.
+
+        Rows come from a server-side cursor EXPORT_BATCH_SIZE at a time and
+        are written as they arrive, so memory stays flat whatever the
+        project size. The session must stay open until the chunks are
+        consumed.
+        """
+        access = await AccessService.get_project_access(db, project_id, current_user)
+
+        if access is None:
+            return None
+
+        if access.role == ROLE_NONE:
+            raise PermissionError("Not allowed to access this project")
+
+        if access.role == ROLE_OWNER:
+            return cls._export_owner_tasks(db, project_id, current_user)
+        return cls._export_member_tasks(db, project_id, access.owner_id, current_user)
+
+    @classmethod
+    async def update_task_service(cls, db: AsyncSession, task_id: str, task_in: TaskUpdate, current_user: User) -> Union[Task, TaskResponse, None]:
+        access = await AccessService.get_task_and_project_with_access(db, task_id, current_user)
         
-        if task is None:
+        if access is None:
             return None
             
-        if task is False:
+        if access is False:
             raise PermissionError("Not allowed to update this task")
 
-        result = await db.execute(select(Project).filter(Project.id == task.project_id))
-        project = result.scalar_one_or_none()
+        task, project = access
         
         if task.created_by_id == project.owner_id:
             if current_user.id == project.owner_id:
@@ -162,24 +371,16 @@ class TaskService:
                     task.status = task_in.status
             else:
                 if task_in.status is not None:
-                    result = await db.execute(
-                        select(UserTaskStatus).filter(
-                            UserTaskStatus.task_id == task_id,
-                            UserTaskStatus.user_id == current_user.id
-                        )
-                    )
-                    user_status = result.scalar_one_or_none()
-                    if not user_status:
-                        user_status = UserTaskStatus(
-                            id=str(uuid.uuid4()),
-                            task_id=task_id,
-                            user_id=current_user.id,
-                            status=task_in.status
-                        )
-                        db.add(user_status)
-                    else:
-                        user_status.status = task_in.status
-                    task.status = task_in.status
+                    upserted = await cls._upsert_member_statuses(db, current_user.id, {task.id: task_in.status})
+                    personal_status = upserted[0].status
+                    # Pick up the progress counters the trigger just moved
+                    await db.refresh(task, attribute_names=["active_count", "pending_count", "complete_count"])
+                    # The status is personal to the member: report it on the
+                    # response without writing it to the shared task row
+                    member_task = TaskResponse.model_validate(task).model_copy(update={"status": personal_status})
+                    await ProjectService.bump_version(db, project.id)
+                    await db.commit()
+                    return member_task
         else:
             if task_in.title is not None:
                 task.title = task_in.title
@@ -188,11 +389,41 @@ class TaskService:
             if task_in.status is not None:
                 task.status = task_in.status
 
+        await ProjectService.bump_version(db, project.id)
         await db.commit()
         await db.refresh(task)
         
         return task
 
+    @classmethod
+    async def update_my_statuses_service(cls, db: AsyncSession, project_id: str, batch_in: MemberStatusBatchUpdate, current_user: User) -> Union[List[MemberStatusResponse], None]:
+        """
+        Sets the caller's personal status on many common tasks of a project.
+        Access and the task ids are validated in one query; all statuses are
+        then written with one upsert. Either every update applies or none.
+        """
+        # A task listed twice keeps its last status
+        statuses = {u.task_id: u.status for u in batch_in.updates}
+
+        checked = await AccessService.get_project_access_and_common_tasks(db, project_id, list(statuses), current_user)
+        if checked is None:
+            return None
+
+        access, common_task_ids = checked
+        if access.role != ROLE_MEMBER:
+            raise PermissionError("Only project members track personal task statuses")
+
+        invalid = [task_id for task_id in statuses if task_id not in common_task_ids]
+        if invalid:
+            raise ValueError(f"Not common tasks of this project: {', '.join(invalid)}")
+
+        rows = await cls._upsert_member_statuses(db, current_user.id, statuses)
+        updated = [MemberStatusResponse.model_validate(row) for row in rows]
+        await ProjectService.bump_version(db, project_id)
+        await db.commit()
+
+        return updated
+
     @classmethod
     async def delete_task_service(cls, db: AsyncSession, task_id: str, current_user: User) -> bool:
         task = await AccessService.get_task_with_access(db, task_id, current_user)
@@ -207,6 +438,214 @@ class TaskService:
             raise PermissionError("Only the creator of a task can delete it")
 
         await db.delete(task)
+        await ProjectService.bump_version(db, task.project_id)
         await db.commit()
 
         return True
+
+    @classmethod
+    async def _upsert_member_statuses(cls, db: AsyncSession, user_id: str, statuses: Dict[str, str]):
+        """
+        Records a member's personal statuses (task_id -> status) for common
+        tasks with a single multi-row INSERT ... ON CONFLICT (task_id, user_id)
+        DO UPDATE, which is safe against concurrent first updates by the same
+        member. Returns (task_id, status, updated_at) rows.
+
+        Rows go in task id order so concurrent batches lock the task
+        counters (updated by trigger) in the same order.
+        """
+        stmt = pg_insert(UserTaskStatus).values([
+            {"id": str(uuid.uuid4()), "task_id": task_id, "user_id": user_id, "status": status}
+            for task_id, status in sorted(statuses.items())
+        ])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserTaskStatus.task_id, UserTaskStatus.user_id],
+            set_={"status": stmt.excluded.status, "updated_at": func.now()},
+        ).returning(UserTaskStatus.task_id, UserTaskStatus.status, UserTaskStatus.updated_at)
+
+        result = await db.execute(stmt)
+        return result.all()
+
+    @classmethod
+    def _member_tasks_query(cls, project_owner_id: str, current_user: User):
+        """
+        Selects tasks together with the caller's personal status. The status is
+        only joined for common tasks (created by the project owner).
+        """
+        return (
+            select(Task, UserTaskStatus.status)
+            .outerjoin(
+                UserTaskStatus,
+                and_(
+                    UserTaskStatus.task_id == Task.id,
+                    UserTaskStatus.user_id == current_user.id,
+                    Task.created_by_id == project_owner_id
+                )
+            )
+        )
+
+    @classmethod
+    def _build_member_tasks(cls, rows) -> List[TaskResponse]:
+        """
+        Member views of (task, personal status) rows. The personal status
+        replaces the shared one on the response only; the task row is
+        left untouched.
+        """
+        tasks = []
+        for task, personal_status in rows:
+            member_task = TaskResponse.model_validate(task)
+            if personal_status is not None:
+                member_task.status = personal_status
+            tasks.append(member_task)
+        return tasks
+
+    @classmethod
+    async def _copy_tasks(cls, db: AsyncSession, rows: List[tuple], report: dict) -> None:
+        """
+        COPYs (line, record) rows into tasks inside a savepoint. Should the
+        database reject the chunk, it is split in halves until the failing
+        rows are isolated and reported; the others are still loaded.
+        """
+        try:
+            async with db.begin_nested():
+                # Asking for the connection emits the SAVEPOINT; COPY then
+                # goes straight to asyncpg on that same connection
+                connection = await (await db.connection()).get_raw_connection()
+                await connection.driver_connection.copy_records_to_table(
+                    Task.__tablename__, records=[record for _, record in rows], columns=TASK_IMPORT_COLUMNS
+                )
+        except PostgresError as exc:
+            if len(rows) == 1:
+                cls._add_import_error(report, rows[0][0], str(exc))
+                return
+            middle = len(rows) // 2
+            await cls._copy_tasks(db, rows[:middle], report)
+            await cls._copy_tasks(db, rows[middle:], report)
+            return
+
+        report["imported"] += len(rows)
+
+    @classmethod
+    def _add_import_error(cls, report: dict, line: int, message: str) -> None:
+        report["failed"] += 1
+        if len(report["errors"]) < settings.MAX_IMPORT_ERRORS:
+            report["errors"].append({"line": line, "message": message})
+
+    @classmethod
+    async def _export_owner_tasks(cls, db: AsyncSession, project_id: str, current_user: User) -> AsyncIterator[bytes]:
+        # One ordered cursor over tasks LEFT JOIN current members' statuses:
+        # a task line is written when its first row arrives, then one line
+        # per status
+        members = select(ProjectMember.user_id).where(ProjectMember.project_id == project_id)
+        stmt = (
+            select(
+                *TASK_COLUMNS,
+                UserTaskStatus.user_id.label("member_user_id"),
+                User.full_name.label("member_full_name"),
+                UserTaskStatus.status.label("member_status"),
+                UserTaskStatus.updated_at.label("member_updated_at"),
+            )
+            .select_from(Task)
+            .outerjoin(
+                UserTaskStatus,
+                and_(UserTaskStatus.task_id == Task.id, UserTaskStatus.user_id.in_(members)),
+            )
+            .outerjoin(User, User.id == UserTaskStatus.user_id)
+            .filter(Task.project_id == project_id, Task.created_by_id == current_user.id)
+            .order_by(Task.created_at, Task.id, UserTaskStatus.user_id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+
+        result = await db.stream(stmt)
+        last_task_id = None
+        async for rows in result.partitions():
+            lines = []
+            for row in rows:
+                if row.id != last_task_id:
+                    last_task_id = row.id
+                    lines.append(dump_json(TaskExportRecord, row))
+                if row.member_user_id is not None:
+                    lines.append(dump_json(MemberStatusExportRecord, {
+                        "task_id": row.id,
+                        "user_id": row.member_user_id,
+                        "full_name": row.member_full_name,
+                        "status": row.member_status,
+                        "updated_at": row.member_updated_at,
+                    }))
+            yield b"\n".join(lines) + b"\n"
+
+    @classmethod
+    async def _export_member_tasks(cls, db: AsyncSession, project_id: str, project_owner_id: str, current_user: User) -> AsyncIterator[bytes]:
+        stmt = (
+            cls._visible_member_task_rows_query(project_id, project_owner_id, current_user)
+            .order_by(Task.created_at, Task.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            yield b"".join(dump_json(TaskExportRecord, row) + b"\n" for row in rows)
+
+    @classmethod
+    def _visible_member_task_rows_query(cls, project_id: str, project_owner_id: str, current_user: User):
+        """
+        Column rows of the tasks a member sees in a project (common and
+        own), with the personal status already resolved by the database.
+        """
+        task_columns = [c for c in TASK_COLUMNS if c.key != "status"]
+        return (
+            select(*task_columns, func.coalesce(UserTaskStatus.status, Task.status).label("status"))
+            .outerjoin(
+                UserTaskStatus,
+                and_(
+                    UserTaskStatus.task_id == Task.id,
+                    UserTaskStatus.user_id == current_user.id,
+                    Task.created_by_id == project_owner_id
+                )
+            )
+            .filter(
+                Task.project_id == project_id,
+                or_(
+                    Task.created_by_id == project_owner_id,
+                    Task.created_by_id == current_user.id
+                )
+            )
+        )
+
+    @classmethod
+    async def _get_member_statuses_by_task(cls, db: AsyncSession, task_ids: Sequence[str]) -> Dict[str, List[UserTaskStatus]]:
+        """
+        Loads the statuses current members keep on all given tasks in a
+        single query and groups them by task id. Former members' statuses
+        stay stored, and count again if they rejoin.
+        """
+        statuses_by_task = defaultdict(list)
+        if not task_ids:
+            return statuses_by_task
+
+        result = await db.execute(
+            select(UserTaskStatus)
+            .join(Task, Task.id == UserTaskStatus.task_id)
+            .join(
+                ProjectMember,
+                and_(ProjectMember.project_id == Task.project_id, ProjectMember.user_id == UserTaskStatus.user_id),
+            )
+            .options(joinedload(UserTaskStatus.user))
+            .filter(UserTaskStatus.task_id.in_(task_ids))
+        )
+        for s in result.scalars().all():
+            statuses_by_task[s.task_id].append(s)
+        return statuses_by_task
+
+    @classmethod
+    def _build_owner_task(cls, task: Task, member_statuses: List[UserTaskStatus]) -> TaskOwnerResponse:
+        owner_task = TaskOwnerResponse.model_validate(task)
+        owner_task.member_statuses = [
+            MemberTaskStatus(
+                user_id=s.user_id,
+                full_name=s.user.full_name,
+                status=s.status,
+                updated_at=s.updated_at
+            ) for s in member_statuses
+        ]
+        return owner_task
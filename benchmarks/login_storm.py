@@ -0,0 +1,109 @@
+"""
+Measures the latency of an unrelated endpoint (/health) while a storm of
+logins is running, with bcrypt either offloaded to the hashing pool or
+executed inline on the event loop.
+
+Requires a reachable PostgreSQL configured through the usual POSTGRES_*
+environment variables and migrated to the latest revision:
+
+    POSTGRES_DB=task_manager_test python -m app.db.migrate
+    POSTGRES_DB=task_manager_test python -m benchmarks.login_storm --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import delete
+
+from app.core import security
+from app.db.migrate import SchemaOutOfDate, ensure_at_head
+from app.db.session import AsyncSessionLocal, engine
+from app.main import app
+from app.models.user import User
+from app.services import auth_service
+from benchmarks.common import percentile
+
+PROBE_INTERVAL = 0.01
+
+
+async def _verify_inline(plain_password, hashed_password):
+    return security.verify_password(plain_password, hashed_password)
+
+
+async def run(logins: int, concurrency: int, inline: bool) -> dict:
+    await ensure_at_head(engine)
+
+    if inline:
+        auth_service.verify_password_async = _verify_inline
+
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    password = "benchmark-password"
+    transport = ASGITransport(app=app)
+
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/api/v1/auth/signup", json={
+            "email": email, "password": password, "full_name": "Bench", "role": "MEMBER",
+        })
+
+        semaphore = asyncio.Semaphore(concurrency)
+        statuses = []
+
+        async def login():
+            async with semaphore:
+                resp = await client.post("/api/v1/auth/login", json={"email": email, "password": password})
+                statuses.append(resp.status_code)
+
+        latencies = []
+        storm = asyncio.gather(*[login() for _ in range(logins)])
+
+        # Probes follow a fixed schedule and are timed from their intended
+        # start, so stalls of the event loop are not hidden from the numbers.
+        started = time.perf_counter()
+        probe = 0
+        while not storm.done():
+            intended = started + probe * PROBE_INTERVAL
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            await client.get("/health")
+            latencies.append((time.perf_counter() - intended) * 1000)
+            probe += 1
+
+        await storm
+
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(User).where(User.email == email))
+        await db.commit()
+    await engine.dispose()
+
+    return {
+        "mode": "inline" if inline else "pool",
+        "logins": logins,
+        "login_status_counts": {code: statuses.count(code) for code in sorted(set(statuses))},
+        "health_samples": len(latencies),
+        "health_p50_ms": round(statistics.median(latencies), 2),
+        "health_p99_ms": round(percentile(latencies, 99), 2),
+        "health_max_ms": round(max(latencies), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--inline", action="store_true", help="verify passwords on the event loop (old behaviour)")
+    args = parser.parse_args()
+
+    try:
+        result = asyncio.run(run(args.logins, args.concurrency, args.inline))
+    except SchemaOutOfDate as exc:
+        parser.exit(2, f"{exc}\n")
+    for key, value in result.items():
+        print(f"{key:>22}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compares the two ways a page of tasks can turn into response bytes:
+
+- revalidate: what FastAPI does with a returned value, validating it
+  against response_model=Page[Union[TaskOwnerResponse, TaskResponse]]
+  (trying each Union member) before serializing it;
+- prevalidated: the service already built the response models, which go
+  straight to JSON bytes (dump_json(..., validated=True)).
+
+For the member view the revalidate path starts from the ORM rows the
+service used to return, the prevalidated one includes building the
+models in the service. Owner pages are already model instances, which
+revalidation passes through, so only member views take the prevalidated
+path in the API. No database is needed:
+
+    python -m benchmarks.serialization --tasks 200 --members 20
+"""
+import argparse
+import statistics
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Union
+
+from app.core.serialization import dump_json
+from app.models.task import Task
+from app.schemas.pagination import Page
+from app.schemas.task import MemberTaskStatus, TaskOwnerResponse, TaskResponse
+from benchmarks.common import percentile
+
+TASK_PAGE = Page[Union[TaskOwnerResponse, TaskResponse]]
+
+
+def make_tasks(count: int) -> list:
+    now = datetime.now(timezone.utc)
+    return [
+        Task(
+            id=f"task-{i}", project_id="project", created_by_id="owner", title=f"Task {i}",
+            description="Benchmark task", status="PENDING", active_count=3, pending_count=5,
+            complete_count=7, created_at=now + timedelta(milliseconds=i), updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def owner_page(tasks: list, members: int) -> dict:
+    now = datetime.now(timezone.utc)
+    items = []
+    for task in tasks:
+        owner_task = TaskOwnerResponse.model_validate(task)
+        owner_task.member_statuses = [
+            MemberTaskStatus(user_id=f"member-{m}", full_name=f"Member {m}", status="ACTIVE", updated_at=now)
+            for m in range(members)
+        ]
+        items.append(owner_task)
+    return {"items": items, "next_cursor": None}
+
+
+def measure(operation, iterations: int) -> dict:
+    for _ in range(min(10, iterations)):
+        operation()
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        operation()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+    }
+
+
+def run(task_count: int, members: int, iterations: int) -> dict:
+    tasks = make_tasks(task_count)
+    owner = owner_page(tasks, members)
+
+    def member_prevalidated():
+        page = {"items": [TaskResponse.model_validate(t) for t in tasks], "next_cursor": None}
+        return dump_json(TASK_PAGE, page, validated=True)
+
+    assert dump_json(TASK_PAGE, owner) == dump_json(TASK_PAGE, owner, validated=True)
+
+    scenarios = {
+        "owner_page": {
+            "revalidate": lambda: dump_json(TASK_PAGE, owner),
+            "prevalidated": lambda: dump_json(TASK_PAGE, owner, validated=True),
+        },
+        "member_page": {
+            "revalidate": lambda: dump_json(TASK_PAGE, {"items": tasks, "next_cursor": None}),
+            "prevalidated": member_prevalidated,
+        },
+    }
+
+    results = {}
+    for name, paths in scenarios.items():
+        results[name] = {path: measure(operation, iterations) for path, operation in paths.items()}
+        results[name]["speedup"] = round(
+            results[name]["revalidate"]["p50_ms"] / results[name]["prevalidated"]["p50_ms"], 2
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=200, help="tasks per page")
+    parser.add_argument("--members", type=int, default=20, help="member statuses per task in the owner page")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    for name, result in run(args.tasks, args.members, args.iterations).items():
+        for path in ("revalidate", "prevalidated"):
+            print(f"{name:>12} {path:<13} p50 {result[path]['p50_ms']:>8.3f} ms  p95 {result[path]['p95_ms']:>8.3f} ms")
+        print(f"{name:>12} speedup       {result['speedup']}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Times the service layer against seeded datasets of several sizes and
+writes a JSON report. With --baseline, each operation's p50 is compared
+with the stored report and the run fails (exit code 1) when any of them
+regressed by more than --max-regression percent.
+
+Every dataset has one manager owning all projects and a pool of members
+belonging to every project. Most tasks are common (created by the
+manager); the rest are private tasks of the members. Members track a
+status on a share of the common tasks.
+
+Requires a reachable PostgreSQL configured through the usual POSTGRES_*
+environment variables and migrated to the latest revision; the run stops
+before seeding otherwise. Seeded rows are removed afterwards:
+
+    POSTGRES_DB=task_manager_test python -m app.db.migrate
+    POSTGRES_DB=task_manager_test python -m benchmarks.service_suite --scales small,medium
+    POSTGRES_DB=task_manager_test python -m benchmarks.service_suite \\
+        --baseline benchmarks/baseline.json --max-regression 20
+
+Caches stay warm between iterations, so the numbers describe steady state.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import delete, insert, text
+
+from app.core.security import Principal, hash_password
+from app.db.migrate import SchemaOutOfDate, ensure_at_head
+from app.db.session import AsyncSessionLocal, engine
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.task import Task
+from app.models.user import User
+from app.models.user_task_status import UserTaskStatus
+from app.schemas.task import TaskBatchCreate, TaskBatchItem, TaskCreate, TaskUpdate
+from app.services.auth_service import login_user_service
+from app.services.project_service import ProjectService
+from app.services.task_service import TaskService
+from benchmarks.common import percentile
+
+PASSWORD = "benchmark-password"
+INSERT_BATCH = 5000
+COMMON_TASK_SHARE = 0.8
+BATCH_SIZE = 100
+
+
+@dataclass(frozen=True)
+class Scale:
+    projects: int
+    members: int
+    tasks_per_project: int
+    status_share: float
+
+
+SCALES = {
+    "small": Scale(projects=2, members=5, tasks_per_project=100, status_share=0.5),
+    "medium": Scale(projects=5, members=20, tasks_per_project=1000, status_share=0.5),
+    "large": Scale(projects=10, members=50, tasks_per_project=2000, status_share=0.5),
+}
+
+
+@dataclass
+class Dataset:
+    manager: Principal
+    manager_email: str
+    member: Principal
+    project_ids: list
+    common_task_id: str
+    user_ids: list
+    counts: dict
+
+
+async def _insert(db, model, rows):
+    for start in range(0, len(rows), INSERT_BATCH):
+        await db.execute(insert(model), rows[start:start + INSERT_BATCH])
+
+
+async def seed(scale: Scale) -> Dataset:
+    run = uuid.uuid4().hex[:8]
+    hashed = hash_password(PASSWORD)
+    base_time = datetime.now(timezone.utc) - timedelta(days=1)
+
+    manager_id = str(uuid.uuid4())
+    member_ids = [str(uuid.uuid4()) for _ in range(scale.members)]
+    users = [{
+        "id": manager_id, "email": f"bench-{run}-manager@example.com", "full_name": "Bench Manager",
+        "role": "MANAGER", "hashed_password": hashed,
+    }] + [{
+        "id": user_id, "email": f"bench-{run}-member{i}@example.com", "full_name": f"Bench Member {i}",
+        "role": "MEMBER", "hashed_password": hashed,
+    } for i, user_id in enumerate(member_ids)]
+
+    projects, members, tasks, statuses = [], [], [], []
+    common_per_project = int(scale.tasks_per_project * COMMON_TASK_SHARE)
+    for p in range(scale.projects):
+        project_id = str(uuid.uuid4())
+        projects.append({
+            "id": project_id, "name": f"Bench {run} #{p}", "owner_id": manager_id,
+            "created_at": base_time + timedelta(seconds=p),
+        })
+        members += [{
+            "id": str(uuid.uuid4()), "project_id": project_id, "user_id": user_id,
+            "joined_at": base_time.replace(tzinfo=None),
+        } for user_id in member_ids]
+
+        for t in range(scale.tasks_per_project):
+            common = t < common_per_project
+            creator = manager_id if common else member_ids[t % scale.members]
+            task_id = str(uuid.uuid4())
+            tasks.append({
+                "id": task_id, "project_id": project_id, "created_by_id": creator,
+                "title": f"Task {t}", "description": "Benchmark task", "status": "PENDING",
+                "created_at": base_time + timedelta(milliseconds=t),
+            })
+            if common:
+                for m, user_id in enumerate(member_ids):
+                    # Deterministic spread of tracked statuses across members
+                    if (t + m) % 100 < scale.status_share * 100:
+                        statuses.append({
+                            "id": str(uuid.uuid4()), "task_id": task_id, "user_id": user_id, "status": "ACTIVE",
+                        })
+
+    async with AsyncSessionLocal() as db:
+        await _insert(db, User, users)
+        await _insert(db, Project, projects)
+        await _insert(db, ProjectMember, members)
+        await _insert(db, Task, tasks)
+        await _insert(db, UserTaskStatus, statuses)
+        await db.commit()
+        await db.execute(text("ANALYZE"))
+
+    return Dataset(
+        manager=Principal(id=manager_id, role="MANAGER"),
+        manager_email=users[0]["email"],
+        member=Principal(id=member_ids[0], role="MEMBER"),
+        project_ids=[p["id"] for p in projects],
+        common_task_id=tasks[0]["id"],
+        user_ids=[u["id"] for u in users],
+        counts={
+            "users": len(users), "projects": len(projects), "memberships": len(members),
+            "tasks": len(tasks), "statuses": len(statuses),
+        },
+    )
+
+
+async def cleanup(dataset: Dataset) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Task).where(Task.project_id.in_(dataset.project_ids)))
+        await db.execute(delete(Project).where(Project.id.in_(dataset.project_ids)))
+        await db.execute(delete(User).where(User.id.in_(dataset.user_ids)))
+        await db.commit()
+
+
+async def measure(operation, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        await operation()
+
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await operation()
+        samples.append((time.perf_counter() - started) * 1000)
+
+    return {
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "max_ms": round(max(samples), 3),
+    }
+
+
+def operations(dataset: Dataset) -> dict:
+    project_id = dataset.project_ids[0]
+    task_id = dataset.common_task_id
+    member_statuses = itertools.cycle(["COMPLETE", "ACTIVE"])
+    new_task = TaskCreate(project_id=project_id, title="New", description="Benchmark task", status="PENDING")
+    new_batch = TaskBatchCreate(project_id=project_id, tasks=[
+        TaskBatchItem(title=f"New {i}", description="Benchmark task", status="PENDING")
+        for i in range(BATCH_SIZE)
+    ])
+
+    async def in_session(call):
+        async with AsyncSessionLocal() as db:
+            return await call(db)
+
+    return {
+        "list_tasks_owner": lambda: in_session(
+            lambda db: TaskService.get_project_tasks_service(db, project_id, dataset.manager)),
+        "list_tasks_member": lambda: in_session(
+            lambda db: TaskService.get_project_tasks_service(db, project_id, dataset.member)),
+        "search_tasks_member": lambda: in_session(
+            lambda db: TaskService.search_project_tasks_service(db, project_id, "task 42", dataset.member)),
+        "get_task_owner": lambda: in_session(
+            lambda db: TaskService.get_task_by_id_service(db, task_id, dataset.manager)),
+        "get_task_member": lambda: in_session(
+            lambda db: TaskService.get_task_by_id_service(db, task_id, dataset.member)),
+        "update_task_member_status": lambda: in_session(
+            lambda db: TaskService.update_task_service(
+                db, task_id, TaskUpdate(status=next(member_statuses)), dataset.member)),
+        "create_task": lambda: in_session(
+            lambda db: TaskService.create_task_service(db, new_task, dataset.manager)),
+        f"create_tasks_batch_{BATCH_SIZE}": lambda: in_session(
+            lambda db: TaskService.create_tasks_batch_service(db, new_batch, dataset.manager)),
+        "list_projects_member": lambda: in_session(
+            lambda db: ProjectService.get_user_projects_service(db, dataset.member)),
+        "login": lambda: in_session(
+            lambda db: login_user_service(db, dataset.manager_email, PASSWORD)),
+    }
+
+
+# bcrypt dominates the login flow; fewer samples keep the run short.
+SLOW_OPERATIONS = {"login"}
+
+
+async def run(scale_names, iterations: int, warmup: int) -> dict:
+    await ensure_at_head(engine)
+
+    async with engine.connect() as conn:
+        server_version = (await conn.execute(text("SHOW server_version"))).scalar()
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "postgres": server_version,
+            "platform": platform.platform(),
+        },
+        "iterations": iterations,
+        "scales": {},
+    }
+
+    for name in scale_names:
+        scale = SCALES[name]
+        print(f"seeding {name}: {asdict(scale)}", file=sys.stderr)
+        dataset = await seed(scale)
+        try:
+            results = {}
+            for op_name, operation in operations(dataset).items():
+                op_iterations = max(5, iterations // 10) if op_name in SLOW_OPERATIONS else iterations
+                results[op_name] = await measure(operation, op_iterations, warmup)
+                print(f"  {op_name:<28} p50 {results[op_name]['p50_ms']:>9.2f} ms", file=sys.stderr)
+        finally:
+            await cleanup(dataset)
+        report["scales"][name] = {"dataset": dataset.counts, "operations": results}
+
+    await engine.dispose()
+    return report
+
+
+def find_regressions(report: dict, baseline: dict, max_regression_pct: float, metric: str = "p50_ms") -> list:
+    """
+    Operations whose ``metric`` grew by more than ``max_regression_pct``
+    percent compared to ``baseline``. Operations or scales missing from
+    either report are skipped.
+    """
+    regressions = []
+    for scale_name, scale in report["scales"].items():
+        base_ops = baseline.get("scales", {}).get(scale_name, {}).get("operations", {})
+        for op_name, result in scale["operations"].items():
+            base = base_ops.get(op_name)
+            if not base or not base.get(metric):
+                continue
+            change_pct = (result[metric] - base[metric]) / base[metric] * 100
+            if change_pct > max_regression_pct:
+                regressions.append({
+                    "scale": scale_name,
+                    "operation": op_name,
+                    "baseline_ms": base[metric],
+                    "current_ms": result[metric],
+                    "change_pct": round(change_pct, 1),
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="small,medium", help=f"comma-separated, from {', '.join(SCALES)}")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results/service_suite.json"))
+    parser.add_argument("--baseline", type=Path, help="report to compare against")
+    parser.add_argument("--max-regression", type=float, default=20.0, help="allowed p50 slowdown in percent")
+    parser.add_argument("--update-baseline", action="store_true", help="write this run's report to --baseline")
+    args = parser.parse_args()
+
+    scale_names = [name.strip() for name in args.scales.split(",") if name.strip()]
+    unknown = [name for name in scale_names if name not in SCALES]
+    if unknown:
+        parser.error(f"unknown scales: {', '.join(unknown)}")
+
+    try:
+        report = asyncio.run(run(scale_names, args.iterations, args.warmup))
+    except SchemaOutOfDate as exc:
+        parser.exit(2, f"{exc}\n")
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    args.output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"report written to {args.output}", file=sys.stderr)
+
+    if args.baseline is None:
+        return
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"baseline updated at {args.baseline}", file=sys.stderr)
+        return
+
+    regressions = find_regressions(report, json.loads(args.baseline.read_text()), args.max_regression)
+    for r in regressions:
+        print(
+            f"REGRESSION {r['scale']}/{r['operation']}: {r['baseline_ms']} ms -> {r['current_ms']} ms "
+            f"(+{r['change_pct']}%, limit {args.max_regression}%)",
+            file=sys.stderr,
+        )
+    if regressions:
+        sys.exit(1)
+    print(f"no operation regressed by more than {args.max_regression}%", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""access and listing indexes
+
+Indexes backing the access checks and keyset listings, plus a unique
+constraint on project membership.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Duplicate memberships could be created by concurrent requests before the
+    # unique constraint existed; keep the earliest one.
+    op.execute(
+        """
+        DELETE FROM project_members pm
+        USING project_members older
+        WHERE pm.project_id = older.project_id
+          AND pm.user_id = older.user_id
+          AND (pm.joined_at, pm.id) > (older.joined_at, older.id)
+        """
+    )
+    op.create_unique_constraint("uq_project_member", "project_members", ["project_id", "user_id"])
+    op.create_index("ix_project_members_project_id_joined_at", "project_members", ["project_id", "joined_at", "id"])
+    op.create_index("ix_project_members_user_id", "project_members", ["user_id"])
+
+    op.create_index("ix_projects_owner_id", "projects", ["owner_id", "created_at", "id"])
+
+    op.create_index("ix_tasks_project_id_created_at", "tasks", ["project_id", "created_at", "id"])
+    op.create_index("ix_tasks_project_id_created_by_id", "tasks", ["project_id", "created_by_id", "created_at", "id"])
+    op.create_index("ix_tasks_created_by_id", "tasks", ["created_by_id"])
+
+    op.create_index("ix_user_task_statuses_user_id", "user_task_statuses", ["user_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_task_statuses_user_id", table_name="user_task_statuses")
+
+    op.drop_index("ix_tasks_created_by_id", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_created_by_id", table_name="tasks")
+    op.drop_index("ix_tasks_project_id_created_at", table_name="tasks")
+
+    op.drop_index("ix_projects_owner_id", table_name="projects")
+
+    op.drop_index("ix_project_members_user_id", table_name="project_members")
+    op.drop_index("ix_project_members_project_id_joined_at", table_name="project_members")
+    op.drop_constraint("uq_project_member", "project_members", type_="unique")
@@ -0,0 +1,190 @@
+"""task status counters
+
+Per-task rollup of current members' personal statuses
+(tasks.active_count, pending_count, complete_count), maintained by
+triggers on user_task_statuses and project_members and backfilled from
+the existing rows. This is the only definition of the triggers: the test
+database is built by running the migrations.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    for column in ("active_count", "pending_count", "complete_count"):
+        op.add_column("tasks", sa.Column(column, sa.Integer(), server_default="0", nullable=False))
+
+    # Only statuses of current members of the task's project are counted.
+    # The membership row is locked FOR KEY SHARE, so a concurrent removal of
+    # that member waits for this transaction (and the other way round) and
+    # neither side misses the other's change.
+    #
+    # Lock order: membership rows before task rows. Statuses deleted by the
+    # cascade of a task delete return early without touching the
+    # membership: that transaction already holds the task row, and a
+    # removal may hold the membership while waiting for it.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION task_status_counts_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'DELETE' AND NOT EXISTS (SELECT 1 FROM tasks WHERE id = OLD.task_id) THEN
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP = 'UPDATE' AND OLD.task_id = NEW.task_id AND OLD.user_id = NEW.user_id THEN
+                PERFORM 1 FROM project_members pm JOIN tasks t ON t.project_id = pm.project_id
+                WHERE t.id = NEW.task_id AND pm.user_id = NEW.user_id
+                FOR KEY SHARE OF pm;
+                IF FOUND THEN
+                    UPDATE tasks SET
+                        active_count = active_count + (NEW.status = 'ACTIVE')::int - (OLD.status = 'ACTIVE')::int,
+                        pending_count = pending_count + (NEW.status = 'PENDING')::int - (OLD.status = 'PENDING')::int,
+                        complete_count = complete_count + (NEW.status = 'COMPLETE')::int - (OLD.status = 'COMPLETE')::int
+                    WHERE id = NEW.task_id;
+                END IF;
+                RETURN NULL;
+            END IF;
+
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM 1 FROM project_members pm JOIN tasks t ON t.project_id = pm.project_id
+                WHERE t.id = OLD.task_id AND pm.user_id = OLD.user_id
+                FOR KEY SHARE OF pm;
+                IF FOUND THEN
+                    UPDATE tasks SET
+                        active_count = active_count - (OLD.status = 'ACTIVE')::int,
+                        pending_count = pending_count - (OLD.status = 'PENDING')::int,
+                        complete_count = complete_count - (OLD.status = 'COMPLETE')::int
+                    WHERE id = OLD.task_id;
+                END IF;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM 1 FROM project_members pm JOIN tasks t ON t.project_id = pm.project_id
+                WHERE t.id = NEW.task_id AND pm.user_id = NEW.user_id
+                FOR KEY SHARE OF pm;
+                IF FOUND THEN
+                    UPDATE tasks SET
+                        active_count = active_count + (NEW.status = 'ACTIVE')::int,
+                        pending_count = pending_count + (NEW.status = 'PENDING')::int,
+                        complete_count = complete_count + (NEW.status = 'COMPLETE')::int
+                    WHERE id = NEW.task_id;
+                END IF;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER user_task_statuses_counts_insert_delete
+            AFTER INSERT OR DELETE ON user_task_statuses
+            FOR EACH ROW EXECUTE FUNCTION task_status_counts_apply()
+        """
+    )
+    # Re-saving an unchanged status (upserts do) leaves the counters alone
+    op.execute(
+        """
+        CREATE TRIGGER user_task_statuses_counts_update
+            AFTER UPDATE OF status, task_id, user_id ON user_task_statuses
+            FOR EACH ROW
+            WHEN (
+                OLD.status IS DISTINCT FROM NEW.status
+                OR OLD.task_id IS DISTINCT FROM NEW.task_id
+                OR OLD.user_id IS DISTINCT FROM NEW.user_id
+            )
+            EXECUTE FUNCTION task_status_counts_apply()
+        """
+    )
+
+    # Joining or leaving a project adds or takes out the statuses the member
+    # keeps on its tasks; the rows themselves are never deleted. Task rows
+    # are locked in id order first, like batch status upserts do.
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION project_member_status_counts_apply() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM 1 FROM tasks t JOIN user_task_statuses s ON s.task_id = t.id
+                WHERE t.project_id = OLD.project_id AND s.user_id = OLD.user_id
+                ORDER BY t.id
+                FOR NO KEY UPDATE OF t;
+                UPDATE tasks t SET
+                    active_count = t.active_count - (s.status = 'ACTIVE')::int,
+                    pending_count = t.pending_count - (s.status = 'PENDING')::int,
+                    complete_count = t.complete_count - (s.status = 'COMPLETE')::int
+                FROM user_task_statuses s
+                WHERE s.task_id = t.id AND t.project_id = OLD.project_id AND s.user_id = OLD.user_id;
+            END IF;
+
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM 1 FROM tasks t JOIN user_task_statuses s ON s.task_id = t.id
+                WHERE t.project_id = NEW.project_id AND s.user_id = NEW.user_id
+                ORDER BY t.id
+                FOR NO KEY UPDATE OF t;
+                UPDATE tasks t SET
+                    active_count = t.active_count + (s.status = 'ACTIVE')::int,
+                    pending_count = t.pending_count + (s.status = 'PENDING')::int,
+                    complete_count = t.complete_count + (s.status = 'COMPLETE')::int
+                FROM user_task_statuses s
+                WHERE s.task_id = t.id AND t.project_id = NEW.project_id AND s.user_id = NEW.user_id;
+            END IF;
+
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER project_members_status_counts
+            AFTER INSERT OR DELETE OR UPDATE OF project_id, user_id ON project_members
+            FOR EACH ROW EXECUTE FUNCTION project_member_status_counts_apply()
+        """
+    )
+
+    # Backfill; the triggers keep the counters exact from here on
+    op.execute(
+        """
+        UPDATE tasks t SET
+            active_count = c.active,
+            pending_count = c.pending,
+            complete_count = c.complete
+        FROM (
+            SELECT s.task_id,
+                   count(*) FILTER (WHERE s.status = 'ACTIVE') AS active,
+                   count(*) FILTER (WHERE s.status = 'PENDING') AS pending,
+                   count(*) FILTER (WHERE s.status = 'COMPLETE') AS complete
+            FROM user_task_statuses s
+            JOIN tasks st ON st.id = s.task_id
+            JOIN project_members pm ON pm.project_id = st.project_id AND pm.user_id = s.user_id
+            GROUP BY s.task_id
+        ) c
+        WHERE t.id = c.task_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS project_members_status_counts ON project_members")
+    op.execute("DROP FUNCTION IF EXISTS project_member_status_counts_apply()")
+    op.execute("DROP TRIGGER IF EXISTS user_task_statuses_counts_update ON user_task_statuses")
+    op.execute("DROP TRIGGER IF EXISTS user_task_statuses_counts_insert_delete ON user_task_statuses")
+    op.execute("DROP FUNCTION IF EXISTS task_status_counts_apply()")
+
+    for column in ("complete_count", "pending_count", "active_count"):
+        op.drop_column("tasks", column)
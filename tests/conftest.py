@@ -1,16 +1,20 @@
 import asyncio
 import os
+import re
 import pytest
 import pytest_asyncio
 from typing import AsyncGenerator
+from alembic import command
 from httpx import AsyncClient, ASGITransport
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from urllib.parse import quote_plus
 
 from app.main import app
-from app.db.base import Base
-from app.core.dependencies import get_db
+from app.core.dependencies import get_db, get_read_db
 from app.db import session as db_session
+from app.db.migrate import get_config
+from app.db.pool import InstrumentedAsyncPool
 
 # --- Windows Compatibility ---
 if os.name == 'nt':
@@ -31,18 +35,33 @@ def get_test_db_url():
 @pytest_asyncio.fixture
 async def engine():
     """Function-scoped engine to ensure loop consistency."""
-    engine = create_async_engine(get_test_db_url(), echo=False)
+    engine = create_async_engine(
+        get_test_db_url(), echo=False, poolclass=InstrumentedAsyncPool
+    )
     db_session.engine = engine
     yield engine
     await engine.dispose()
 
+def _upgrade_to_head(sync_conn):
+    config = get_config()
+    config.attributes["connection"] = sync_conn
+    command.upgrade(config, "head")
+
+_migrated = False
+
 @pytest_asyncio.fixture(autouse=True)
 async def setup_test_db(engine):
-    """Ensure tables exist for each test. Function-scoped for consistency."""
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    """
+    Migrate the test database to the latest revision, once per run. The
+    schema comes from the migrations rather than create_all, so triggers
+    and generated columns are those of a deployed database.
+    """
+    global _migrated
+    if not _migrated:
+        async with engine.begin() as conn:
+            await conn.run_sync(_upgrade_to_head)
+        _migrated = True
     yield
-    # No drop_all here for speed, just rely on create_all being safe or recreate DB if needed
 
 @pytest_asyncio.fixture
 async def db(engine) -> AsyncGenerator[AsyncSession, None]:
@@ -62,6 +81,43 @@ async def db(engine) -> AsyncGenerator[AsyncSession, None]:
         await session.close()
         await transaction.rollback()
 
+class QueryCounter:
+    """Counts the SQL statements sent to the database."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args, **kwargs):
+        self.count += 1
+
+@pytest_asyncio.fixture
+async def query_counter(engine) -> QueryCounter:
+    counter = QueryCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    yield counter
+    event.remove(engine.sync_engine, "before_cursor_execute", counter)
+
+def server_timing_query_count(response) -> int:
+    """Statement count reported by QueryStatsMiddleware for ``response``."""
+    match = re.search(r'db;dur=[0-9.]+;desc="(\d+) queries"', response.headers.get("server-timing", ""))
+    assert match, "response has no db Server-Timing entry"
+    return int(match.group(1))
+
+@pytest.fixture
+def query_budget():
+    """
+    Asserts that a response stayed within a SQL statement budget, e.g.
+    ``query_budget(response, 3)``.
+    """
+    def check(response, max_queries: int) -> int:
+        count = server_timing_query_count(response)
+        request = response.request
+        assert count <= max_queries, (
+            f"{request.method} {request.url.path} ran {count} queries (budget {max_queries})"
+        )
+        return count
+    return check
+
 @pytest_asyncio.fixture
 async def client(db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
     """AsyncClient with DB dependency override."""
@@ -70,6 +126,7 @@ async def client(db: AsyncSession) -> AsyncGenerator[AsyncClient, None]:
         yield db
 
     app.dependency_overrides[get_db] = _get_test_db
+    app.dependency_overrides[get_read_db] = _get_test_db
     
     async with AsyncClient(
         transport=ASGITransport(app=app), 
@@ -1,3 +1,4 @@
+import json
 import pytest
 from httpx import AsyncClient
 
@@ -25,7 +26,7 @@ async def test_private_task_isolation_functional(client: AsyncClient):
     
     # 4. Member2 lists tasks
     resp = await client.get(f"/tasks?project_id={p_id}", headers={"Authorization": f"Bearer {m2_token}"})
-    tasks = resp.json()
+    tasks = resp.json()["items"]
     # Member2 should see 0 tasks (assuming no common tasks yet)
     assert len(tasks) == 0
     
@@ -34,7 +35,7 @@ async def test_private_task_isolation_functional(client: AsyncClient):
     
     # 6. Member2 lists tasks again
     resp = await client.get(f"/tasks?project_id={p_id}", headers={"Authorization": f"Bearer {m2_token}"})
-    tasks = resp.json()
+    tasks = resp.json()["items"]
     assert len(tasks) == 1
     assert tasks[0]["title"] == "Team Goal"
     
@@ -67,3 +68,346 @@ async def test_common_task_status_updates_functional(client: AsyncClient):
     assert "member_statuses" in data
     assert len(data["member_statuses"]) == 1
     assert data["member_statuses"][0]["status"] == "COMPLETE"
+    assert (data["active_count"], data["pending_count"], data["complete_count"]) == (0, 0, 1)
+
+    # Summary listing: progress counters without the per-member breakdown
+    resp = await client.get(
+        "/tasks", params={"project_id": p_id, "include_member_statuses": "false"},
+        headers={"Authorization": f"Bearer {m_token}"}
+    )
+    item = resp.json()["items"][0]
+    assert item["complete_count"] == 1
+    assert not item.get("member_statuses")
+
+@pytest.mark.asyncio
+async def test_task_listing_cursor_pagination_functional(client: AsyncClient):
+    await client.post("/auth/signup", json={"email": "pager@test.com", "password": "password", "full_name": "Pager", "role": "MANAGER"})
+    l_resp = await client.post("/auth/login", json={"email": "pager@test.com", "password": "password"})
+    headers = {"Authorization": f"Bearer {l_resp.json()['access_token']}"}
+
+    p_resp = await client.post("/projects", json={"name": "Paged", "description": "desc"}, headers=headers)
+    p_id = p_resp.json()["id"]
+    for i in range(5):
+        await client.post("/tasks", json={"project_id": p_id, "title": f"T{i}", "description": "desc", "status": "PENDING"}, headers=headers)
+
+    ids = []
+    cursor = None
+    while True:
+        params = {"project_id": p_id, "limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        resp = await client.get("/tasks", params=params, headers=headers)
+        assert resp.status_code == 200
+        page = resp.json()
+        ids.extend(t["id"] for t in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(ids) == 5
+    assert len(set(ids)) == 5
+
+    resp = await client.get("/tasks", params={"project_id": p_id, "cursor": "not-a-cursor"}, headers=headers)
+    assert resp.status_code == 400
+
+@pytest.mark.asyncio
+async def test_task_endpoints_query_budgets_functional(client: AsyncClient, query_budget):
+    async def signup_login(email, role):
+        s_resp = await client.post("/auth/signup", json={"email": email, "password": "password", "full_name": email, "role": role})
+        l_resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+        return {"Authorization": f"Bearer {l_resp.json()['access_token']}"}, s_resp.json()["id"]
+
+    m_headers, _ = await signup_login("budget-m@test.com", "MANAGER")
+    m1_headers, m1_id = await signup_login("budget-m1@test.com", "MEMBER")
+
+    p_resp = await client.post("/projects", json={"name": "Budget", "description": "desc"}, headers=m_headers)
+    p_id = p_resp.json()["id"]
+    await client.post(f"/projects/{p_id}/members", json={"user_id": m1_id}, headers=m_headers)
+
+    task_ids = []
+    for i in range(6):
+        t_resp = await client.post("/tasks", json={"project_id": p_id, "title": f"T{i}", "description": "desc", "status": "PENDING"}, headers=m_headers)
+        task_ids.append(t_resp.json()["id"])
+        await client.patch(f"/tasks/{task_ids[-1]}", json={"status": "ACTIVE"}, headers=m1_headers)
+
+    # Budgets do not depend on how many tasks or member statuses exist
+    query_budget(await client.get("/tasks", params={"project_id": p_id}, headers=m_headers), 3)
+    query_budget(await client.get("/tasks", params={"project_id": p_id}, headers=m1_headers), 2)
+    query_budget(await client.get(f"/tasks/{task_ids[0]}", headers=m_headers), 2)
+    query_budget(await client.get(f"/tasks/{task_ids[0]}", headers=m1_headers), 2)
+    query_budget(await client.get(f"/projects/{p_id}/members", headers=m_headers), 2)
+
+@pytest.mark.asyncio
+async def test_batch_task_creation_functional(client: AsyncClient):
+    await client.post("/auth/signup", json={"email": "batch@test.com", "password": "password", "full_name": "Batch", "role": "MANAGER"})
+    l_resp = await client.post("/auth/login", json={"email": "batch@test.com", "password": "password"})
+    headers = {"Authorization": f"Bearer {l_resp.json()['access_token']}"}
+    p_resp = await client.post("/projects", json={"name": "Backlog", "description": "desc"}, headers=headers)
+    p_id = p_resp.json()["id"]
+
+    items = [{"title": f"B{i}", "description": "desc", "status": "PENDING"} for i in range(20)]
+    resp = await client.post("/tasks/batch", json={"project_id": p_id, "tasks": items}, headers=headers)
+    assert resp.status_code == 201
+    assert [t["title"] for t in resp.json()] == [f"B{i}" for i in range(20)]
+
+    listed = await client.get("/tasks", params={"project_id": p_id}, headers=headers)
+    assert len(listed.json()["items"]) == 20
+
+    resp = await client.post("/tasks/batch", json={"project_id": p_id, "tasks": []}, headers=headers)
+    assert resp.status_code == 422
+
+    resp = await client.post("/tasks/batch", json={"project_id": "missing", "tasks": items[:1]}, headers=headers)
+    assert resp.status_code == 404
+
+@pytest.mark.asyncio
+async def test_my_statuses_batch_update_functional(client: AsyncClient):
+    async def signup_login(email, role):
+        s_resp = await client.post("/auth/signup", json={"email": email, "password": "password", "full_name": email, "role": role})
+        l_resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+        return {"Authorization": f"Bearer {l_resp.json()['access_token']}"}, s_resp.json()["id"]
+
+    m_headers, _ = await signup_login("statuses-m@test.com", "MANAGER")
+    m1_headers, m1_id = await signup_login("statuses-m1@test.com", "MEMBER")
+    outsider_headers, _ = await signup_login("statuses-out@test.com", "MEMBER")
+
+    p_id = (await client.post("/projects", json={"name": "Ticks", "description": "desc"}, headers=m_headers)).json()["id"]
+    await client.post(f"/projects/{p_id}/members", json={"user_id": m1_id}, headers=m_headers)
+    items = [{"title": f"C{i}", "description": "desc", "status": "PENDING"} for i in range(3)]
+    task_ids = [t["id"] for t in (await client.post("/tasks/batch", json={"project_id": p_id, "tasks": items}, headers=m_headers)).json()]
+
+    updates = [{"task_id": t_id, "status": "COMPLETE"} for t_id in task_ids]
+    resp = await client.patch(f"/projects/{p_id}/my-statuses", json={"updates": updates}, headers=m1_headers)
+    assert resp.status_code == 200
+    assert {u["status"] for u in resp.json()} == {"COMPLETE"}
+
+    resp = await client.patch(f"/projects/{p_id}/my-statuses", json={"updates": [{"task_id": "nope", "status": "ACTIVE"}]}, headers=m1_headers)
+    assert resp.status_code == 400
+
+    resp = await client.patch(f"/projects/{p_id}/my-statuses", json={"updates": updates}, headers=outsider_headers)
+    assert resp.status_code == 403
+
+@pytest.mark.asyncio
+async def test_conditional_reads_functional(client: AsyncClient, query_budget):
+    async def signup_login(email, role):
+        s_resp = await client.post("/auth/signup", json={"email": email, "password": "password", "full_name": email, "role": role})
+        l_resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+        return {"Authorization": f"Bearer {l_resp.json()['access_token']}"}, s_resp.json()["id"]
+
+    m_headers, _ = await signup_login("etag-m@test.com", "MANAGER")
+    m1_headers, m1_id = await signup_login("etag-m1@test.com", "MEMBER")
+
+    p_id = (await client.post("/projects", json={"name": "Polled", "description": "desc"}, headers=m_headers)).json()["id"]
+    await client.post(f"/projects/{p_id}/members", json={"user_id": m1_id}, headers=m_headers)
+    t_id = (await client.post("/tasks", json={"project_id": p_id, "title": "T", "description": "desc", "status": "PENDING"}, headers=m_headers)).json()["id"]
+
+    reads = [
+        ("/tasks", {"project_id": p_id}),
+        (f"/tasks/{t_id}", {}),
+        (f"/projects/{p_id}", {}),
+        (f"/projects/{p_id}/members", {}),
+    ]
+    etags = {}
+    for path, params in reads:
+        resp = await client.get(path, params=params, headers=m_headers)
+        assert resp.status_code == 200
+        etags[path] = resp.headers["etag"]
+
+        resp = await client.get(path, params=params, headers={**m_headers, "If-None-Match": etags[path]})
+        assert resp.status_code == 304
+        assert resp.headers["etag"] == etags[path]
+        assert resp.content == b""
+
+    # Listings answer 304 after the version lookup, without the listing queries
+    query_budget(await client.get("/tasks", params={"project_id": p_id}, headers={**m_headers, "If-None-Match": etags["/tasks"]}), 1)
+    # Task detail: the access statement alone, not the owner's member statuses
+    query_budget(await client.get(f"/tasks/{t_id}", headers={**m_headers, "If-None-Match": etags[f"/tasks/{t_id}"]}), 1)
+    member_etag = (await client.get(f"/tasks/{t_id}", headers=m1_headers)).headers["etag"]
+    query_budget(await client.get(f"/tasks/{t_id}", headers={**m1_headers, "If-None-Match": member_etag}), 1)
+
+    # Another caller's tag never matches: members see a different payload
+    resp = await client.get("/tasks", params={"project_id": p_id}, headers={**m1_headers, "If-None-Match": etags["/tasks"]})
+    assert resp.status_code == 200
+
+    # A member status write changes every project-scoped tag
+    await client.patch(f"/tasks/{t_id}", json={"status": "COMPLETE"}, headers=m1_headers)
+    for path, params in reads:
+        resp = await client.get(path, params=params, headers={**m_headers, "If-None-Match": etags[path]})
+        assert resp.status_code == 200
+        assert resp.headers["etag"] != etags[path]
+
+    # Removed members are refused rather than told nothing changed
+    member_etag = (await client.get("/tasks", params={"project_id": p_id}, headers=m1_headers)).headers["etag"]
+    await client.delete(f"/projects/{p_id}/members/{m1_id}", headers=m_headers)
+    resp = await client.get("/tasks", params={"project_id": p_id}, headers={**m1_headers, "If-None-Match": member_etag})
+    assert resp.status_code == 403
+
+@pytest.mark.asyncio
+async def test_response_cache_functional(client: AsyncClient, query_budget):
+    async def signup_login(email, role):
+        s_resp = await client.post("/auth/signup", json={"email": email, "password": "password", "full_name": email, "role": role})
+        l_resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+        return {"Authorization": f"Bearer {l_resp.json()['access_token']}"}, s_resp.json()["id"]
+
+    m_headers, _ = await signup_login("cache-m@test.com", "MANAGER")
+    m1_headers, m1_id = await signup_login("cache-m1@test.com", "MEMBER")
+
+    p_id = (await client.post("/projects", json={"name": "Cached", "description": "desc"}, headers=m_headers)).json()["id"]
+    await client.post(f"/projects/{p_id}/members", json={"user_id": m1_id}, headers=m_headers)
+    t_id = (await client.post("/tasks", json={"project_id": p_id, "title": "T", "description": "desc", "status": "PENDING"}, headers=m_headers)).json()["id"]
+
+    reads = [("/tasks", {"project_id": p_id}), (f"/projects/{p_id}", {}), (f"/projects/{p_id}/members", {})]
+    first = [await client.get(path, params=params, headers=m_headers) for path, params in reads]
+    # Repeats only look up the project version, and return the same bytes
+    for (path, params), resp in zip(reads, first):
+        cached = await client.get(path, params=params, headers=m_headers)
+        query_budget(cached, 1)
+        assert cached.content == resp.content
+        assert cached.headers["etag"] == resp.headers["etag"]
+
+    # Members get their own entries
+    member_view = await client.get("/tasks", params={"project_id": p_id}, headers=m1_headers)
+    assert member_view.json()["items"][0]["complete_count"] == 0
+
+    # Writes are visible right away
+    await client.patch(f"/tasks/{t_id}", json={"status": "COMPLETE"}, headers=m1_headers)
+    resp = await client.get("/tasks", params={"project_id": p_id}, headers=m_headers)
+    assert resp.json()["items"][0]["member_statuses"][0]["status"] == "COMPLETE"
+    resp = await client.get("/tasks", params={"project_id": p_id}, headers=m1_headers)
+    assert resp.json()["items"][0]["status"] == "COMPLETE"
+
+    # Project lists are dropped by the services that change them
+    assert [p["name"] for p in (await client.get("/projects", headers=m1_headers)).json()["items"]] == ["Cached"]
+    query_budget(await client.get("/projects", headers=m1_headers), 0)
+
+    await client.put(f"/projects/{p_id}", json={"name": "Renamed"}, headers=m_headers)
+    assert (await client.get(f"/projects/{p_id}", headers=m_headers)).json()["name"] == "Renamed"
+    assert [p["name"] for p in (await client.get("/projects", headers=m1_headers)).json()["items"]] == ["Renamed"]
+
+    await client.delete(f"/projects/{p_id}/members/{m1_id}", headers=m_headers)
+    assert (await client.get("/projects", headers=m1_headers)).json()["items"] == []
+
+    await client.post("/projects", json={"name": "Second"}, headers=m_headers)
+    names = [p["name"] for p in (await client.get("/projects", headers=m_headers)).json()["items"]]
+    assert sorted(names) == ["Renamed", "Second"]
+
+@pytest.mark.asyncio
+async def test_project_export_functional(client: AsyncClient):
+    async def signup_login(email, role):
+        s_resp = await client.post("/auth/signup", json={"email": email, "password": "password", "full_name": email, "role": role})
+        l_resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+        return {"Authorization": f"Bearer {l_resp.json()['access_token']}"}, s_resp.json()["id"]
+
+    m_headers, _ = await signup_login("export-m@test.com", "MANAGER")
+    m1_headers, m1_id = await signup_login("export-m1@test.com", "MEMBER")
+    outsider_headers, _ = await signup_login("export-out@test.com", "MEMBER")
+
+    p_id = (await client.post("/projects", json={"name": "Report", "description": "desc"}, headers=m_headers)).json()["id"]
+    await client.post(f"/projects/{p_id}/members", json={"user_id": m1_id}, headers=m_headers)
+    t_id = (await client.post("/tasks", json={"project_id": p_id, "title": "Shared", "description": "desc", "status": "PENDING"}, headers=m_headers)).json()["id"]
+    await client.patch(f"/tasks/{t_id}", json={"status": "COMPLETE"}, headers=m1_headers)
+
+    resp = await client.get(f"/projects/{p_id}/export", headers=m_headers)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == "application/x-ndjson"
+    assert resp.headers["content-disposition"] == f'attachment; filename="project-{p_id}.ndjson"'
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [(l["type"], l["status"]) for l in lines] == [("task", "PENDING"), ("member_status", "COMPLETE")]
+
+    resp = await client.get(f"/projects/{p_id}/export", headers=m1_headers)
+    assert [json.loads(line)["status"] for line in resp.text.splitlines()] == ["COMPLETE"]
+
+    assert (await client.get(f"/projects/{p_id}/export", headers=outsider_headers)).status_code == 403
+    assert (await client.get("/projects/missing/export", headers=m_headers)).status_code == 404
+
+@pytest.mark.asyncio
+async def test_task_import_functional(client: AsyncClient):
+    async def signup_login(email, role):
+        s_resp = await client.post("/auth/signup", json={"email": email, "password": "password", "full_name": email, "role": role})
+        l_resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+        return {"Authorization": f"Bearer {l_resp.json()['access_token']}"}, s_resp.json()["id"]
+
+    m_headers, _ = await signup_login("import-m@test.com", "MANAGER")
+    p_id = (await client.post("/projects", json={"name": "Bulk", "description": "desc"}, headers=m_headers)).json()["id"]
+
+    async def csv_body():
+        yield b"title,description,status\n"
+        for i in range(250):
+            yield f"Task {i},\"Line one\nline two\",PENDING\n".encode()
+        yield b"Broken,desc,LATER\n"
+
+    resp = await client.post(
+        f"/tasks/import?project_id={p_id}", content=csv_body(), headers={**m_headers, "Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["imported"] == 250 and resp.json()["failed"] == 1
+    assert resp.json()["errors"][0]["line"] == 502
+
+    ndjson = b'{"title": "From JSON", "description": "desc", "status": "ACTIVE"}\n{"title": "No status"}\n'
+    resp = await client.post(
+        f"/tasks/import?project_id={p_id}", content=ndjson, headers={**m_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert (resp.json()["imported"], resp.json()["failed"]) == (1, 1)
+
+    page = (await client.get(f"/tasks?project_id={p_id}&limit=1", headers=m_headers)).json()
+    assert page["items"][0]["title"] == "Task 0"
+
+    # A stray quote fails its own row; the rows after it still load
+    async def stray_quote_body():
+        yield b"title,description,status\nStray \"quote,desc,PENDING\n"
+        for i in range(20):
+            yield f"After {i},desc,PENDING\n".encode()
+
+    resp = await client.post(
+        f"/tasks/import?project_id={p_id}", content=stray_quote_body(), headers={**m_headers, "Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 200
+    assert (resp.json()["imported"], resp.json()["failed"]) == (20, 1)
+    assert resp.json()["errors"] == [{"line": 2, "message": "Unterminated quoted field"}]
+
+    resp = await client.post(
+        f"/tasks/import?project_id={p_id}", content=b"title\nA\n", headers={**m_headers, "Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 400
+    resp = await client.post(
+        f"/tasks/import?project_id={p_id}", content=b"[]", headers={**m_headers, "Content-Type": "application/json"}
+    )
+    assert resp.status_code == 415
+    resp = await client.post(
+        "/tasks/import?project_id=missing", content=ndjson, headers={**m_headers, "Content-Type": "application/x-ndjson"}
+    )
+    assert resp.status_code == 404
+
+@pytest.mark.asyncio
+async def test_task_search_functional(client: AsyncClient):
+    async def signup_login(email, role):
+        s_resp = await client.post("/auth/signup", json={"email": email, "password": "password", "full_name": email, "role": role})
+        l_resp = await client.post("/auth/login", json={"email": email, "password": "password"})
+        return {"Authorization": f"Bearer {l_resp.json()['access_token']}"}, s_resp.json()["id"]
+
+    m_headers, _ = await signup_login("search-m@test.com", "MANAGER")
+    m1_headers, m1_id = await signup_login("search-m1@test.com", "MEMBER")
+    outsider_headers, _ = await signup_login("search-out@test.com", "MEMBER")
+
+    p_id = (await client.post("/projects", json={"name": "Find", "description": "desc"}, headers=m_headers)).json()["id"]
+    await client.post(f"/projects/{p_id}/members", json={"user_id": m1_id}, headers=m_headers)
+    items = [{"title": f"Quarterly report {i}", "description": "desc", "status": "PENDING"} for i in range(3)]
+    await client.post("/tasks/batch", json={"project_id": p_id, "tasks": items}, headers=m_headers)
+    await client.post("/tasks", json={"project_id": p_id, "title": "My report draft", "description": "desc", "status": "ACTIVE"}, headers=m1_headers)
+
+    resp = await client.get("/tasks/search", params={"project_id": p_id, "q": "reports", "limit": 2}, headers=m_headers)
+    assert resp.status_code == 200
+    page = resp.json()
+    assert len(page["items"]) == 2 and page["next_cursor"]
+    assert all(item["rank"] > 0 for item in page["items"])
+
+    resp = await client.get("/tasks/search", params={"project_id": p_id, "q": "reports", "cursor": page["next_cursor"]}, headers=m_headers)
+    assert len(resp.json()["items"]) == 1 and resp.json()["next_cursor"] is None
+
+    resp = await client.get("/tasks/search", params={"project_id": p_id, "q": "report"}, headers=m1_headers)
+    assert len(resp.json()["items"]) == 4
+
+    list_cursor = (await client.get("/tasks", params={"project_id": p_id, "limit": 1}, headers=m_headers)).json()["next_cursor"]
+    resp = await client.get("/tasks/search", params={"project_id": p_id, "q": "report", "cursor": list_cursor}, headers=m_headers)
+    assert resp.status_code == 400
+    assert (await client.get("/tasks/search", params={"project_id": p_id, "q": ""}, headers=m_headers)).status_code == 422
+    assert (await client.get("/tasks/search", params={"project_id": p_id, "q": "report"}, headers=outsider_headers)).status_code == 403
@@ -2,6 +2,7 @@ import pytest
 import pytest_asyncio
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.project_service import ProjectService
+from app.services.project_member_service import ProjectMemberService
 from app.services.auth_service import register_user_service
 from app.schemas.project import ProjectCreate, ProjectUpdate
 from app.schemas.auth import SignupRequest
@@ -48,7 +49,27 @@ async def test_get_user_projects_service(db: AsyncSession, test_user: User):
     )
     
     projects = await ProjectService.get_user_projects_service(db, test_user)
-    assert len(projects) == 2
+    assert len(projects["items"]) == 2
+    assert projects["next_cursor"] is None
+
+@pytest.mark.asyncio
+async def test_get_user_projects_service_keyset_pagination(db: AsyncSession, test_user: User, other_user: User):
+    for i in range(5):
+        await ProjectService.create_project_service(db, ProjectCreate(name=f"Owned {i}"), test_user)
+    # A project the user neither owns nor belongs to must never show up
+    await ProjectService.create_project_service(db, ProjectCreate(name="Foreign"), other_user)
+
+    seen = []
+    cursor = None
+    while True:
+        page = await ProjectService.get_user_projects_service(db, test_user, limit=2, cursor=cursor)
+        assert len(page["items"]) <= 2
+        seen.extend(p.name for p in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert sorted(seen) == [f"Owned {i}" for i in range(5)]
 
 @pytest.mark.asyncio
 async def test_project_access_permissions(db: AsyncSession, test_user: User, other_user: User):
@@ -90,3 +111,42 @@ async def test_delete_project_service(db: AsyncSession, test_user: User):
     # Verify it's gone
     retrieved = await ProjectService.get_project_by_id_service(db, project.id, test_user)
     assert retrieved is None
+
+@pytest.mark.asyncio
+async def test_batch_add_and_remove_members(db: AsyncSession, test_user: User, other_user: User, query_counter):
+    project = await ProjectService.create_project_service(db, ProjectCreate(name="Team"), test_user)
+    newcomers = [
+        await register_user_service(db, SignupRequest(
+            email=f"newcomer{i}@example.com", password="testpassword123", full_name=f"Newcomer {i}", role="MEMBER"
+        ))
+        for i in range(10)
+    ]
+    await ProjectMemberService.add_member_to_project_service(db, project.id, other_user.id, test_user)
+
+    user_ids = [other_user.id] + [u.id for u in newcomers] + ["ghost", newcomers[0].id]
+    query_counter.count = 0
+    results = await ProjectMemberService.add_members_to_project_service(db, project.id, user_ids, test_user)
+    # Cached owner check, one lookup, one insert, the version bump
+    assert query_counter.count == 3
+
+    outcomes = {r.user_id: r.outcome for r in results}
+    assert len(results) == 12  # duplicates collapse
+    assert outcomes[other_user.id] == "ALREADY_MEMBER"
+    assert outcomes["ghost"] == "USER_NOT_FOUND"
+    assert all(outcomes[u.id] == "ADDED" for u in newcomers)
+
+    # New members have access right away despite cached denials
+    assert await ProjectService.get_project_by_id_service(db, project.id, newcomers[0])
+
+    query_counter.count = 0
+    results = await ProjectMemberService.remove_members_from_project_service(
+        db, project.id, [newcomers[0].id, newcomers[1].id, "ghost"], test_user
+    )
+    # The DELETE ... RETURNING and the version bump
+    assert query_counter.count == 2
+    assert [r.outcome for r in results] == ["REMOVED", "REMOVED", "NOT_MEMBER"]
+    with pytest.raises(PermissionError):
+        await ProjectService.get_project_by_id_service(db, project.id, newcomers[0])
+
+    with pytest.raises(PermissionError):
+        await ProjectMemberService.add_members_to_project_service(db, project.id, [newcomers[0].id], other_user)
@@ -0,0 +1,54 @@
+import logging
+import pytest
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.middleware import QueryStatsMiddleware
+from app.db.query_stats import QueryStats, current_query_stats
+
+def make_app(db: AsyncSession, executions: int, threshold: int):
+    async def app(scope, receive, send):
+        for i in range(executions):
+            await db.execute(text("SELECT CAST(:i AS integer)"), {"i": i})
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"ok"})
+
+    return QueryStatsMiddleware(app, n_plus_one_threshold=threshold)
+
+@pytest.mark.asyncio
+async def test_query_stats_are_scoped_to_the_request(db: AsyncSession):
+    stats = QueryStats()
+    token = current_query_stats.set(stats)
+    try:
+        await db.execute(text("SELECT 1"))
+        await db.execute(text("SELECT 1"))
+    finally:
+        current_query_stats.reset(token)
+    await db.execute(text("SELECT 1"))
+
+    assert stats.count == 2
+    assert stats.duration > 0
+    assert stats.repeated_statements(2) == [("SELECT 1", 2)]
+
+@pytest.mark.asyncio
+async def test_server_timing_header_and_n_plus_one_warning(db: AsyncSession, caplog):
+    caplog.set_level(logging.INFO, logger="app.sql")
+    transport = ASGITransport(app=make_app(db, executions=4, threshold=3))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/loop")
+
+    assert 'desc="4 queries"' in response.headers["server-timing"]
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.sql"]
+    assert any("queries=4" in m and "n_plus_one=true" in m for m in messages)
+    assert any(m.startswith("possible N+1") and "executions=4" in m for m in messages)
+
+@pytest.mark.asyncio
+async def test_no_warning_below_threshold(db: AsyncSession, caplog):
+    caplog.set_level(logging.WARNING, logger="app.sql")
+    transport = ASGITransport(app=make_app(db, executions=2, threshold=3))
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/loop")
+
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+    assert not [r for r in caplog.records if r.name == "app.sql"]
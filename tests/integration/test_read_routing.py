@@ -0,0 +1,127 @@
+import pytest
+import pytest_asyncio
+from fastapi import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.endpoints.projects import list_projects
+from app.core import response_cache as response_cache_module
+from app.core.dependencies import get_read_db
+from app.core.response_cache import MemoryResponseCache
+from app.core.security import Principal
+from app.db import session as db_session
+from app.db.routing import (
+    REPLICA_SESSION_KEY,
+    has_recent_write,
+    recent_writers,
+    request_user_id,
+)
+from app.services.access_service import AccessService, access_cache, ROLE_NONE
+from app.services.auth_service import register_user_service
+from app.services.project_service import ProjectService
+from app.schemas.auth import SignupRequest
+from app.schemas.project import ProjectCreate
+from app.models.user import User
+
+@pytest_asyncio.fixture
+async def owner(db: AsyncSession) -> User:
+    payload = SignupRequest(
+        email="routing-owner@example.com",
+        password="testpassword123",
+        full_name="Routing Owner",
+        role="MANAGER"
+    )
+    return await register_user_service(db, payload)
+
+@pytest_asyncio.fixture
+async def outsider(db: AsyncSession) -> User:
+    payload = SignupRequest(
+        email="routing-outsider@example.com",
+        password="testpassword123",
+        full_name="Routing Outsider",
+        role="MEMBER"
+    )
+    return await register_user_service(db, payload)
+
+@pytest.mark.asyncio
+async def test_signup_pins_new_user_to_primary(db: AsyncSession, owner: User):
+    assert has_recent_write(owner.id)
+
+@pytest.mark.asyncio
+async def test_committed_write_pins_caller_to_primary(db: AsyncSession, owner: User):
+    recent_writers.clear()
+    token = request_user_id.set(owner.id)
+    try:
+        # A commit without changes is not a write
+        await db.commit()
+        assert not has_recent_write(owner.id)
+
+        await ProjectService.create_project_service(db, ProjectCreate(name="Routed"), owner)
+        assert has_recent_write(owner.id)
+    finally:
+        request_user_id.reset(token)
+
+@pytest.mark.asyncio
+async def test_get_read_db_uses_replica_unless_recent_write(monkeypatch):
+    opened = []
+
+    def factory(name):
+        class _Session:
+            async def __aenter__(self):
+                opened.append(name)
+                return name
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return _Session
+
+    monkeypatch.setattr(db_session, "AsyncSessionLocal", factory("primary"))
+    monkeypatch.setattr(db_session, "AsyncReadSessionLocal", factory("replica"))
+    recent_writers.clear()
+    principal = Principal(id="reader-id", role="MEMBER")
+
+    async for _ in get_read_db(principal):
+        pass
+    recent_writers.set(principal.id, True)
+    async for _ in get_read_db(principal):
+        pass
+
+    assert opened == ["replica", "primary"]
+
+@pytest.mark.asyncio
+async def test_replica_access_decisions_are_not_cached(db: AsyncSession, owner: User, outsider: User):
+    project = await ProjectService.create_project_service(db, ProjectCreate(name="Lagging"), owner)
+    access_cache.clear()
+
+    db.info[REPLICA_SESSION_KEY] = True
+    try:
+        access = await AccessService.get_project_access(db, project.id, outsider)
+        assert access.role == ROLE_NONE
+        assert access_cache.get((outsider.id, project.id)) is None
+
+        # Nor are grants: the membership may have been revoked on the primary
+        await AccessService.get_project_access(db, project.id, owner)
+        assert access_cache.get((owner.id, project.id)) is None
+    finally:
+        db.info.pop(REPLICA_SESSION_KEY)
+
+    await AccessService.get_project_access(db, project.id, owner)
+    assert access_cache.get((owner.id, project.id)) is not None
+
+@pytest.mark.asyncio
+async def test_replica_project_lists_are_not_cached(monkeypatch, db: AsyncSession, owner: User):
+    cache = MemoryResponseCache(maxsize=10, ttl=60, max_variants=2)
+    monkeypatch.setattr(response_cache_module, "response_cache", cache)
+    await ProjectService.create_project_service(db, ProjectCreate(name="Listed"), owner)
+    principal = Principal(id=owner.id, role=owner.role)
+    key = await response_cache_module.user_projects_cache_key(owner.id)
+
+    db.info[REPLICA_SESSION_KEY] = True
+    try:
+        response = await list_projects(Response(), limit=50, cursor=None, db=db, current_user=principal)
+        assert b"Listed" in response.body
+        assert await cache.get(key, "50:None") is None
+    finally:
+        db.info.pop(REPLICA_SESSION_KEY)
+
+    await list_projects(Response(), limit=50, cursor=None, db=db, current_user=principal)
+    assert await cache.get(key, "50:None") == response.body
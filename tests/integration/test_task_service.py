@@ -1,14 +1,24 @@
+import asyncio
+import json
+from datetime import timedelta
+import uuid
 import pytest
 import pytest_asyncio
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.task_service import TaskService
 from app.services.auth_service import register_user_service
 from app.services.project_service import ProjectService
 from app.services.project_member_service import ProjectMemberService
-from app.schemas.task import TaskCreate, TaskUpdate
+from app.schemas.task import TaskCreate, TaskBatchCreate, TaskBatchItem, TaskUpdate, MemberStatusBatchUpdate, MemberStatusUpdate
 from app.schemas.project import ProjectCreate
 from app.schemas.auth import SignupRequest
 from app.models.user import User
+from app.models.project import Project
+from app.models.project_member import ProjectMember
+from app.models.task import Task
+from app.models.user_task_status import UserTaskStatus
 
 @pytest_asyncio.fixture
 async def manager(db: AsyncSession) -> User:
@@ -69,7 +79,7 @@ async def test_task_visibility_rules(db: AsyncSession, manager: User, member1: U
     )
     
     # VERIFY VISIBILITY FOR MANAGER (Owner)
-    manager_tasks = await TaskService.get_project_tasks_service(db, project.id, manager)
+    manager_tasks = (await TaskService.get_project_tasks_service(db, project.id, manager))["items"]
     # Based on TaskService implementation, Owner sees tasks created by them.
     # Wait, let's check code: `owner_tasks = [t for t in tasks if t.created_by_id == current_user.id]`
     # It seems the Manager currently ONLY sees tasks created by themselves in the response?
@@ -80,7 +90,7 @@ async def test_task_visibility_rules(db: AsyncSession, manager: User, member1: U
     assert manager_tasks[0].title == "Common Task"
     
     # VERIFY VISIBILITY FOR MEMBER1
-    m1_tasks = await TaskService.get_project_tasks_service(db, project.id, member1)
+    m1_tasks = (await TaskService.get_project_tasks_service(db, project.id, member1))["items"]
     # Member sees: (t.created_by_id == access.owner_id) or (t.created_by_id == current_user.id)
     # So Member1 sees: Common Task (Owner) + Private Task1 (Self)
     assert len(m1_tasks) == 2
@@ -90,7 +100,7 @@ async def test_task_visibility_rules(db: AsyncSession, manager: User, member1: U
     assert "Member2 Private" not in titles
     
     # VERIFY VISIBILITY FOR MEMBER2
-    m2_tasks = await TaskService.get_project_tasks_service(db, project.id, member2)
+    m2_tasks = (await TaskService.get_project_tasks_service(db, project.id, member2))["items"]
     assert len(m2_tasks) == 2
     titles = [t.title for t in m2_tasks]
     assert "Common Task" in titles
@@ -144,3 +154,715 @@ async def test_member_status_tracking_in_common_task(db: AsyncSession, manager:
     assert len(manager_task.member_statuses) == 1
     assert manager_task.member_statuses[0].status == "COMPLETE"
     assert manager_task.member_statuses[0].full_name == member1.full_name
+
+@pytest.mark.asyncio
+async def test_owner_task_listing_query_count_is_constant(db: AsyncSession, manager: User, member1: User, member2: User, project, query_counter):
+    async def create_common_tasks(count):
+        for i in range(count):
+            task = await TaskService.create_task_service(
+                db, TaskCreate(project_id=project.id, title=f"Task {i}", description="desc", status="PENDING"), manager
+            )
+            await TaskService.update_task_service(db, task.id, TaskUpdate(status="COMPLETE"), member1)
+            await TaskService.update_task_service(db, task.id, TaskUpdate(status="ACTIVE"), member2)
+
+    await create_common_tasks(2)
+    query_counter.count = 0
+    tasks = (await TaskService.get_project_tasks_service(db, project.id, manager))["items"]
+    small_listing_queries = query_counter.count
+    assert len(tasks) == 2
+
+    await create_common_tasks(10)
+    query_counter.count = 0
+    tasks = (await TaskService.get_project_tasks_service(db, project.id, manager))["items"]
+    assert len(tasks) == 12
+    assert query_counter.count == small_listing_queries
+    assert all(len(t.member_statuses) == 2 for t in tasks)
+
+@pytest.mark.asyncio
+async def test_member_task_listing_overlays_personal_status(db: AsyncSession, manager: User, member1: User, project, query_counter):
+    for i in range(5):
+        task = await TaskService.create_task_service(
+            db, TaskCreate(project_id=project.id, title=f"Common {i}", description="desc", status="PENDING"), manager
+        )
+        if i % 2 == 0:
+            await TaskService.update_task_service(db, task.id, TaskUpdate(status="COMPLETE"), member1)
+    await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Private", description="desc", status="ACTIVE"), member1
+    )
+
+    query_counter.count = 0
+    tasks = (await TaskService.get_project_tasks_service(db, project.id, member1))["items"]
+    # One access check round trip plus a single joined listing query
+    assert query_counter.count <= 3
+
+    statuses = {t.title: t.status for t in tasks}
+    assert statuses == {
+        "Common 0": "COMPLETE",
+        "Common 1": "PENDING",
+        "Common 2": "COMPLETE",
+        "Common 3": "PENDING",
+        "Common 4": "COMPLETE",
+        "Private": "ACTIVE",
+    }
+
+@pytest.mark.asyncio
+async def test_cached_access_decision_and_invalidation(db: AsyncSession, manager: User, member1: User, project, query_counter):
+    await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Common", description="desc", status="PENDING"), manager
+    )
+    await TaskService.get_project_tasks_service(db, project.id, member1)
+
+    # Warm cache: only the listing query itself runs
+    query_counter.count = 0
+    await TaskService.get_project_tasks_service(db, project.id, member1)
+    assert query_counter.count == 1
+
+    # Removing the member must revoke the cached decision immediately
+    await ProjectMemberService.remove_member_from_project_service(db, project.id, member1.id, manager)
+    with pytest.raises(PermissionError):
+        await TaskService.get_project_tasks_service(db, project.id, member1)
+
+    # Re-adding restores access
+    await ProjectMemberService.add_member_to_project_service(db, project.id, member1.id, manager)
+    page = await TaskService.get_project_tasks_service(db, project.id, member1)
+    assert [t.title for t in page["items"]] == ["Common"]
+
+@pytest.mark.asyncio
+async def test_deleted_project_drops_cached_access(db: AsyncSession, manager: User, member1: User, project):
+    await TaskService.get_project_tasks_service(db, project.id, member1)
+    await ProjectService.delete_project_service(db, project.id, manager)
+
+    page = await TaskService.get_project_tasks_service(db, project.id, member1)
+    assert page["items"] == []
+
+@pytest.mark.asyncio
+async def test_task_access_check_is_single_statement(db: AsyncSession, manager: User, member1: User, member2: User, project, query_counter):
+    private_task = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Private", description="desc", status="ACTIVE"), member1
+    )
+    common_task = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Common", description="desc", status="PENDING"), manager
+    )
+
+    query_counter.count = 0
+    task = await TaskService.get_task_by_id_service(db, private_task.id, member1)
+    assert task.id == private_task.id
+    assert query_counter.count == 1
+
+    # Member view of a common task: access check plus the personal status join
+    query_counter.count = 0
+    task = await TaskService.get_task_by_id_service(db, common_task.id, member2)
+    assert task.id == common_task.id
+    assert query_counter.count == 2
+
+    with pytest.raises(PermissionError):
+        await TaskService.get_task_by_id_service(db, private_task.id, member2)
+    assert await TaskService.get_task_by_id_service(db, "missing-task", member1) is None
+
+@pytest.mark.asyncio
+async def test_batch_task_creation_is_one_insert(db: AsyncSession, manager: User, member1: User, project, query_counter):
+    batch = TaskBatchCreate(project_id=project.id, tasks=[
+        TaskBatchItem(title=f"Imported {i}", description="from backlog", status="PENDING") for i in range(150)
+    ])
+
+    query_counter.count = 0
+    created = await TaskService.create_tasks_batch_service(db, batch, manager)
+    # Access decision is cached from setting up the project; one INSERT ... RETURNING
+    # and the project version bump
+    assert query_counter.count == 2
+    assert [t.title for t in created] == [f"Imported {i}" for i in range(150)]
+    assert all(t.created_by_id == manager.id for t in created)
+
+    # Stamped by the database clock, one microsecond apart
+    db_now = (await db.execute(select(func.now()))).scalar_one()
+    assert [t.created_at for t in created[:3]] == [db_now + timedelta(microseconds=i) for i in range(3)]
+    assert all(t.updated_at == t.created_at for t in created)
+
+    # Listing keeps the order of the batch
+    page = await TaskService.get_project_tasks_service(db, project.id, manager, limit=150)
+    assert [t.title for t in page["items"]] == [f"Imported {i}" for i in range(150)]
+
+    # Members create private tasks in bulk too
+    member_batch = TaskBatchCreate(project_id=project.id, tasks=[
+        TaskBatchItem(title="Mine", description="private", status="ACTIVE")
+    ])
+    member_created = await TaskService.create_tasks_batch_service(db, member_batch, member1)
+    assert member_created[0].created_by_id == member1.id
+
+@pytest.mark.asyncio
+async def test_batch_task_creation_requires_membership(db: AsyncSession, manager: User, project):
+    outsider = await register_user_service(db, SignupRequest(
+        email="outsider@example.com", password="testpassword123", full_name="Outsider", role="MEMBER"
+    ))
+    batch = TaskBatchCreate(project_id=project.id, tasks=[
+        TaskBatchItem(title="Nope", description="denied", status="PENDING")
+    ])
+    with pytest.raises(PermissionError):
+        await TaskService.create_tasks_batch_service(db, batch, outsider)
+
+    missing = TaskBatchCreate(project_id="missing-project", tasks=batch.tasks)
+    assert await TaskService.create_tasks_batch_service(db, missing, manager) is None
+
+@pytest.mark.asyncio
+async def test_member_status_update_is_single_upsert(db: AsyncSession, manager: User, member1: User, project, query_counter):
+    task = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Common", description="desc", status="PENDING"), manager
+    )
+
+    query_counter.count = 0
+    updated = await TaskService.update_task_service(db, task.id, TaskUpdate(status="ACTIVE"), member1)
+    # Access check, the upsert, a reload of the progress counters, the version bump
+    assert query_counter.count == 4
+    assert updated.status == "ACTIVE"
+    assert updated.active_count == 1
+
+    await TaskService.update_task_service(db, task.id, TaskUpdate(status="COMPLETE"), member1)
+    statuses = (await db.execute(select(UserTaskStatus).filter(UserTaskStatus.task_id == task.id))).scalars().all()
+    assert [s.status for s in statuses] == ["COMPLETE"]
+
+    # The shared task row keeps the owner's status
+    owner_view = await TaskService.get_task_by_id_service(db, task.id, manager)
+    assert owner_view.status == "PENDING"
+
+@pytest.mark.asyncio
+async def test_concurrent_member_status_updates(engine):
+    """
+    Many members PATCH the same common task at once, each sending several
+    concurrent first updates. Runs on committed data in separate sessions.
+    """
+    Session = async_sessionmaker(engine, expire_on_commit=False)
+    run = uuid.uuid4().hex[:8]
+    member_count, updates_per_member = 8, 3
+
+    async with Session() as setup:
+        manager = await register_user_service(setup, SignupRequest(
+            email=f"race-{run}-manager@example.com", password="testpassword123", full_name="Race Manager", role="MANAGER"
+        ))
+        members = [
+            await register_user_service(setup, SignupRequest(
+                email=f"race-{run}-m{i}@example.com", password="testpassword123", full_name=f"Racer {i}", role="MEMBER"
+            ))
+            for i in range(member_count)
+        ]
+        project = await ProjectService.create_project_service(setup, ProjectCreate(name=f"Race {run}"), manager)
+        for member in members:
+            await ProjectMemberService.add_member_to_project_service(setup, project.id, member.id, manager)
+        task = await TaskService.create_task_service(
+            setup, TaskCreate(project_id=project.id, title="Contended", description="desc", status="PENDING"), manager
+        )
+
+    async def patch(member, status):
+        async with Session() as session:
+            return await TaskService.update_task_service(session, task.id, TaskUpdate(status=status), member)
+
+    try:
+        results = await asyncio.gather(*[
+            patch(member, status)
+            for member in members
+            for status in ["ACTIVE", "COMPLETE", "PENDING"][:updates_per_member]
+        ])
+        assert len(results) == member_count * updates_per_member
+
+        async with Session() as check:
+            rows = (await check.execute(
+                select(UserTaskStatus.user_id, func.count())
+                .filter(UserTaskStatus.task_id == task.id)
+                .group_by(UserTaskStatus.user_id)
+            )).all()
+            assert sorted(user_id for user_id, _ in rows) == sorted(m.id for m in members)
+            assert all(count == 1 for _, count in rows)
+            stored = await check.get(Task, task.id)
+            assert stored.status == "PENDING"
+            # The counters agree with the status rows despite the contention
+            final = dict((await check.execute(
+                select(UserTaskStatus.status, func.count())
+                .filter(UserTaskStatus.task_id == task.id)
+                .group_by(UserTaskStatus.status)
+            )).all())
+            assert (stored.active_count, stored.pending_count, stored.complete_count) == (
+                final.get("ACTIVE", 0), final.get("PENDING", 0), final.get("COMPLETE", 0)
+            )
+    finally:
+        async with Session() as cleanup:
+            await cleanup.execute(delete(Task).where(Task.id == task.id))
+            await cleanup.execute(delete(Project).where(Project.id == project.id))
+            await cleanup.execute(delete(User).where(User.id.in_([manager.id] + [m.id for m in members])))
+            await cleanup.commit()
+
+@pytest.mark.asyncio
+async def test_concurrent_owner_edits_and_member_statuses(engine):
+    """
+    The owner edits a common task while members PATCH their status on it.
+    Both paths lock the task row before the project row (version bump), so
+    none of them deadlocks. Sessions do not autoflush, as in the app.
+    """
+    Session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    run = uuid.uuid4().hex[:8]
+
+    async with Session() as setup:
+        manager = await register_user_service(setup, SignupRequest(
+            email=f"lock-{run}-manager@example.com", password="testpassword123", full_name="Lock Manager", role="MANAGER"
+        ))
+        members = [
+            await register_user_service(setup, SignupRequest(
+                email=f"lock-{run}-m{i}@example.com", password="testpassword123", full_name=f"Locker {i}", role="MEMBER"
+            ))
+            for i in range(6)
+        ]
+        project = await ProjectService.create_project_service(setup, ProjectCreate(name=f"Lock {run}"), manager)
+        await ProjectMemberService.add_members_to_project_service(setup, project.id, [m.id for m in members], manager)
+        task = await TaskService.create_task_service(
+            setup, TaskCreate(project_id=project.id, title="Contended", description="desc", status="PENDING"), manager
+        )
+
+    async def update(user, task_in):
+        async with Session() as session:
+            return await TaskService.update_task_service(session, task.id, task_in, user)
+
+    try:
+        for round_no in range(15):
+            status = ["ACTIVE", "COMPLETE"][round_no % 2]
+            await asyncio.gather(
+                *[update(manager, TaskUpdate(title=f"Edit {round_no}.{i}")) for i in range(5)],
+                *[update(member, TaskUpdate(status=status)) for member in members],
+            )
+
+        async with Session() as check:
+            stored = await check.get(Task, task.id)
+            assert (stored.active_count, stored.complete_count) == (len(members), 0)
+    finally:
+        async with Session() as cleanup:
+            await cleanup.execute(delete(Task).where(Task.id == task.id))
+            await cleanup.execute(delete(Project).where(Project.id == project.id))
+            await cleanup.execute(delete(User).where(User.id.in_([manager.id] + [m.id for m in members])))
+            await cleanup.commit()
+
+@pytest.mark.asyncio
+async def test_member_batch_status_update(db: AsyncSession, manager: User, member1: User, member2: User, project, query_counter):
+    common = await TaskService.create_tasks_batch_service(db, TaskBatchCreate(project_id=project.id, tasks=[
+        TaskBatchItem(title=f"Common {i}", description="desc", status="PENDING") for i in range(5)
+    ]), manager)
+    private = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Private", description="desc", status="PENDING"), member2
+    )
+    await TaskService.update_task_service(db, common[0].id, TaskUpdate(status="ACTIVE"), member1)
+
+    batch = MemberStatusBatchUpdate(updates=[
+        MemberStatusUpdate(task_id=t.id, status="COMPLETE") for t in common
+    ])
+    query_counter.count = 0
+    updated = await TaskService.update_my_statuses_service(db, project.id, batch, member1)
+    # One validation query, one upsert, the version bump
+    assert query_counter.count == 3
+    assert sorted(u.task_id for u in updated) == sorted(t.id for t in common)
+    assert all(u.status == "COMPLETE" for u in updated)
+
+    page = await TaskService.get_project_tasks_service(db, project.id, member1)
+    assert {t.status for t in page["items"]} == {"COMPLETE"}
+
+    # All-or-nothing: a private task of another member invalidates the batch
+    mixed = MemberStatusBatchUpdate(updates=[
+        MemberStatusUpdate(task_id=common[1].id, status="ACTIVE"),
+        MemberStatusUpdate(task_id=private.id, status="ACTIVE"),
+    ])
+    with pytest.raises(ValueError):
+        await TaskService.update_my_statuses_service(db, project.id, mixed, member1)
+    owner_view = await TaskService.get_task_by_id_service(db, common[1].id, manager)
+    assert [s.status for s in owner_view.member_statuses] == ["COMPLETE"]
+
+    # Owners have no personal statuses
+    with pytest.raises(PermissionError):
+        await TaskService.update_my_statuses_service(db, project.id, batch, manager)
+
+    assert await TaskService.update_my_statuses_service(db, "missing-project", batch, member1) is None
+
+async def _counts(db: AsyncSession, task_id: str):
+    task = await db.get(Task, task_id)
+    # The trigger writes behind the ORM's back
+    await db.refresh(task)
+    return task.active_count, task.pending_count, task.complete_count
+
+@pytest.mark.asyncio
+async def test_progress_counters_follow_member_statuses(db: AsyncSession, manager: User, member1: User, member2: User, project):
+    task = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Common", description="desc", status="PENDING"), manager
+    )
+    other = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Other", description="desc", status="PENDING"), manager
+    )
+    assert await _counts(db, task.id) == (0, 0, 0)
+
+    await TaskService.update_task_service(db, task.id, TaskUpdate(status="ACTIVE"), member1)
+    await TaskService.update_task_service(db, task.id, TaskUpdate(status="COMPLETE"), member2)
+    assert await _counts(db, task.id) == (1, 0, 1)
+
+    # Changing a status moves it between buckets; re-sending it is a no-op
+    await TaskService.update_task_service(db, task.id, TaskUpdate(status="COMPLETE"), member1)
+    await TaskService.update_task_service(db, task.id, TaskUpdate(status="COMPLETE"), member1)
+    assert await _counts(db, task.id) == (0, 0, 2)
+
+    await TaskService.update_my_statuses_service(db, project.id, MemberStatusBatchUpdate(updates=[
+        MemberStatusUpdate(task_id=task.id, status="PENDING"),
+        MemberStatusUpdate(task_id=other.id, status="ACTIVE"),
+    ]), member2)
+    assert await _counts(db, task.id) == (0, 1, 1)
+    assert await _counts(db, other.id) == (1, 0, 0)
+
+    # Removed members no longer count
+    await ProjectMemberService.remove_member_from_project_service(db, project.id, member1.id, manager)
+    assert await _counts(db, task.id) == (0, 1, 0)
+    await ProjectMemberService.remove_members_from_project_service(db, project.id, [member2.id], manager)
+    assert await _counts(db, task.id) == (0, 0, 0)
+    assert await _counts(db, other.id) == (0, 0, 0)
+
+    owner_view = await TaskService.get_task_by_id_service(db, task.id, manager)
+    assert owner_view.member_statuses == []
+
+    # The statuses are kept, and count again when the member rejoins
+    await ProjectMemberService.add_members_to_project_service(db, project.id, [member1.id], manager)
+    assert await _counts(db, task.id) == (0, 0, 1)
+    owner_view = await TaskService.get_task_by_id_service(db, task.id, manager)
+    assert [(s.user_id, s.status) for s in owner_view.member_statuses] == [(member1.id, "COMPLETE")]
+    stored = await db.execute(select(func.count()).select_from(UserTaskStatus).where(UserTaskStatus.user_id == member2.id))
+    assert stored.scalar() == 2
+
+@pytest.mark.asyncio
+async def test_counters_stay_exact_while_members_leave_and_rejoin(engine):
+    """
+    Members PATCH their status while the owner removes and re-adds half of
+    them. Whichever commits first, the counters match the statuses of the
+    members left in the project.
+    """
+    Session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    run = uuid.uuid4().hex[:8]
+
+    async with Session() as setup:
+        manager = await register_user_service(setup, SignupRequest(
+            email=f"churn-{run}-manager@example.com", password="testpassword123", full_name="Churn Manager", role="MANAGER"
+        ))
+        members = [
+            await register_user_service(setup, SignupRequest(
+                email=f"churn-{run}-m{i}@example.com", password="testpassword123", full_name=f"Churner {i}", role="MEMBER"
+            ))
+            for i in range(6)
+        ]
+        project = await ProjectService.create_project_service(setup, ProjectCreate(name=f"Churn {run}"), manager)
+        await ProjectMemberService.add_members_to_project_service(setup, project.id, [m.id for m in members], manager)
+        task = await TaskService.create_task_service(
+            setup, TaskCreate(project_id=project.id, title="Contended", description="desc", status="PENDING"), manager
+        )
+    leavers = [m.id for m in members[:3]]
+
+    async def in_session(call, *args):
+        async with Session() as session:
+            return await call(session, *args)
+
+    try:
+        for round_no in range(10):
+            status = ["ACTIVE", "COMPLETE"][round_no % 2]
+            membership_change = (
+                ProjectMemberService.remove_members_from_project_service if round_no % 2 == 0
+                else ProjectMemberService.add_members_to_project_service
+            )
+            results = await asyncio.gather(
+                in_session(membership_change, project.id, leavers, manager),
+                *[in_session(TaskService.update_task_service, task.id, TaskUpdate(status=status), m) for m in members],
+                return_exceptions=True,
+            )
+            # Members removed a moment ago may be refused; nothing else fails
+            errors = [r for r in results if isinstance(r, Exception) and not isinstance(r, PermissionError)]
+            assert errors == []
+
+            async with Session() as check:
+                stored = await check.get(Task, task.id)
+                current = await check.execute(
+                    select(UserTaskStatus.status, func.count())
+                    .join(ProjectMember, ProjectMember.user_id == UserTaskStatus.user_id)
+                    .where(UserTaskStatus.task_id == task.id, ProjectMember.project_id == project.id)
+                    .group_by(UserTaskStatus.status)
+                )
+                counts = dict(current.all())
+                assert (stored.active_count, stored.pending_count, stored.complete_count) == (
+                    counts.get("ACTIVE", 0), counts.get("PENDING", 0), counts.get("COMPLETE", 0)
+                )
+    finally:
+        async with Session() as cleanup:
+            await cleanup.execute(delete(Task).where(Task.id == task.id))
+            await cleanup.execute(delete(Project).where(Project.id == project.id))
+            await cleanup.execute(delete(User).where(User.id.in_([manager.id] + [m.id for m in members])))
+            await cleanup.commit()
+
+@pytest.mark.asyncio
+async def test_concurrent_task_delete_and_member_removal(engine):
+    """
+    The owner deletes a common task while removing a member who keeps a
+    status on it. The removal locks the membership and then waits for the
+    task row; the delete's cascade must not wait for that membership in
+    turn, or the two deadlock.
+    """
+    Session = async_sessionmaker(engine, expire_on_commit=False, autoflush=False)
+    run = uuid.uuid4().hex[:8]
+
+    async with Session() as setup:
+        manager = await register_user_service(setup, SignupRequest(
+            email=f"purge-{run}-manager@example.com", password="testpassword123", full_name="Purge Manager", role="MANAGER"
+        ))
+        member = await register_user_service(setup, SignupRequest(
+            email=f"purge-{run}-member@example.com", password="testpassword123", full_name="Purger", role="MEMBER"
+        ))
+        project = await ProjectService.create_project_service(setup, ProjectCreate(name=f"Purge {run}"), manager)
+        await ProjectMemberService.add_member_to_project_service(setup, project.id, member.id, manager)
+        doomed, kept = await TaskService.create_tasks_batch_service(setup, TaskBatchCreate(project_id=project.id, tasks=[
+            TaskBatchItem(title=title, description="desc", status="PENDING") for title in ("Doomed", "Kept")
+        ]), manager)
+        await TaskService.update_my_statuses_service(setup, project.id, MemberStatusBatchUpdate(updates=[
+            MemberStatusUpdate(task_id=t.id, status="ACTIVE") for t in (doomed, kept)
+        ]), member)
+
+    async def remove_member():
+        async with Session() as session:
+            return await ProjectMemberService.remove_member_from_project_service(session, project.id, member.id, manager)
+
+    try:
+        async with Session() as deleter:
+            # The delete holds the task row while the removal starts
+            await deleter.execute(select(Task.id).where(Task.id == doomed.id).with_for_update())
+            removal = asyncio.create_task(remove_member())
+            await asyncio.sleep(0.5)
+            assert not removal.done()
+            assert await TaskService.delete_task_service(deleter, doomed.id, manager)
+        assert await asyncio.wait_for(removal, 10)
+
+        async with Session() as check:
+            stored = await check.get(Task, kept.id)
+            assert (stored.active_count, stored.pending_count, stored.complete_count) == (0, 0, 0)
+    finally:
+        async with Session() as cleanup:
+            await cleanup.execute(delete(Task).where(Task.project_id == project.id))
+            await cleanup.execute(delete(Project).where(Project.id == project.id))
+            await cleanup.execute(delete(User).where(User.id.in_([manager.id, member.id])))
+            await cleanup.commit()
+
+@pytest.mark.asyncio
+async def test_owner_summary_listing_skips_member_statuses(db: AsyncSession, manager: User, member1: User, project, query_counter):
+    task = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Common", description="desc", status="PENDING"), manager
+    )
+    await TaskService.update_task_service(db, task.id, TaskUpdate(status="COMPLETE"), member1)
+
+    query_counter.count = 0
+    page = await TaskService.get_project_tasks_service(db, project.id, manager, include_member_statuses=False)
+    # Access is cached by now: only the task page, the status table is not read
+    assert query_counter.count == 1
+    assert [(t.id, t.complete_count) for t in page["items"]] == [(task.id, 1)]
+
+@pytest.mark.asyncio
+async def test_project_version_bumps_on_every_write(db: AsyncSession, manager: User, member1: User, member2: User, project):
+    async def version():
+        return await ProjectService.get_project_version_service(db, project.id, manager)
+
+    seen = [await version()]
+
+    async def assert_bumped():
+        current = await version()
+        assert current > seen[-1]
+        seen.append(current)
+
+    task = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Common", description="desc", status="PENDING"), manager
+    )
+    await assert_bumped()
+
+    await TaskService.create_tasks_batch_service(db, TaskBatchCreate(project_id=project.id, tasks=[
+        TaskBatchItem(title="Batch", description="desc", status="PENDING")
+    ]), manager)
+    await assert_bumped()
+
+    await TaskService.update_task_service(db, task.id, TaskUpdate(title="Renamed"), manager)
+    await assert_bumped()
+
+    await TaskService.update_task_service(db, task.id, TaskUpdate(status="ACTIVE"), member1)
+    await assert_bumped()
+
+    await TaskService.update_my_statuses_service(db, project.id, MemberStatusBatchUpdate(updates=[
+        MemberStatusUpdate(task_id=task.id, status="COMPLETE")
+    ]), member1)
+    await assert_bumped()
+
+    await ProjectMemberService.remove_member_from_project_service(db, project.id, member2.id, manager)
+    await assert_bumped()
+
+    await ProjectMemberService.add_members_to_project_service(db, project.id, [member2.id], manager)
+    await assert_bumped()
+
+    await TaskService.delete_task_service(db, task.id, manager)
+    await assert_bumped()
+
+    # Reads leave it alone
+    await TaskService.get_project_tasks_service(db, project.id, manager)
+    assert await version() == seen[-1]
+
+    outsider = await register_user_service(db, SignupRequest(
+        email="outsider@example.com", password="testpassword123", full_name="Outsider", role="MEMBER"
+    ))
+    with pytest.raises(PermissionError):
+        await ProjectService.get_project_version_service(db, project.id, outsider)
+    assert await ProjectService.get_project_version_service(db, "missing-project", manager) is None
+
+@pytest.mark.asyncio
+async def test_project_export_streams_visible_tasks_in_chunks(db: AsyncSession, manager: User, member1: User, member2: User, project, monkeypatch):
+    monkeypatch.setattr("app.services.task_service.settings.EXPORT_BATCH_SIZE", 2)
+    common = await TaskService.create_tasks_batch_service(db, TaskBatchCreate(project_id=project.id, tasks=[
+        TaskBatchItem(title=f"Common {i}", description="desc", status="PENDING") for i in range(3)
+    ]), manager)
+    private = await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Mine", description="desc", status="ACTIVE"), member1
+    )
+    await TaskService.create_task_service(
+        db, TaskCreate(project_id=project.id, title="Other", description="desc", status="ACTIVE"), member2
+    )
+    await TaskService.update_my_statuses_service(db, project.id, MemberStatusBatchUpdate(updates=[
+        MemberStatusUpdate(task_id=common[0].id, status="COMPLETE")
+    ]), member1)
+    await TaskService.update_task_service(db, common[0].id, TaskUpdate(status="ACTIVE"), member2)
+
+    async def export(user):
+        chunks = [chunk async for chunk in await TaskService.export_project_service(db, project.id, user)]
+        assert all(chunk.endswith(b"\n") for chunk in chunks)
+        return chunks, [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+    # Owner: 4 joined rows (3 tasks, one with 2 statuses), two per round trip
+    chunks, lines = await export(manager)
+    assert len(chunks) == 2
+    assert [(l["type"], l.get("title")) for l in lines] == [
+        ("task", "Common 0"), ("member_status", None), ("member_status", None),
+        ("task", "Common 1"), ("task", "Common 2"),
+    ]
+    assert lines[0]["active_count"] == 1 and lines[0]["complete_count"] == 1
+    assert {(l["user_id"], l["task_id"], l["status"]) for l in lines if l["type"] == "member_status"} == {
+        (member1.id, common[0].id, "COMPLETE"), (member2.id, common[0].id, "ACTIVE"),
+    }
+
+    # Member: common tasks with their personal status, plus their own task
+    _, lines = await export(member1)
+    assert {l["type"] for l in lines} == {"task"}
+    assert {l["id"]: l["status"] for l in lines} == {
+        common[0].id: "COMPLETE", common[1].id: "PENDING", common[2].id: "PENDING", private.id: "ACTIVE",
+    }
+
+@pytest.mark.asyncio
+async def test_project_export_checks_access_before_streaming(db: AsyncSession, manager: User, project):
+    outsider = await register_user_service(db, SignupRequest(
+        email="outsider@example.com", password="testpassword123", full_name="Outsider", role="MEMBER"
+    ))
+    with pytest.raises(PermissionError):
+        await TaskService.export_project_service(db, project.id, outsider)
+    assert await TaskService.export_project_service(db, "missing", manager) is None
+
+async def _records(*records):
+    for record in records:
+        yield record
+
+@pytest.mark.asyncio
+async def test_task_import_loads_valid_rows_and_reports_the_rest(db: AsyncSession, manager: User, project, monkeypatch):
+    monkeypatch.setattr("app.services.task_service.settings.IMPORT_CHUNK_SIZE", 4)
+    monkeypatch.setattr("app.services.task_service.settings.MAX_IMPORT_ERRORS", 2)
+    valid = {"description": "desc", "status": "PENDING"}
+    records = [(line, {"title": f"Row {line}", **valid}) for line in range(2, 8)]
+    records += [
+        (8, {"title": "Bad status", "description": "desc", "status": "DONE"}),
+        (9, "Expected 3 fields, got 2"),
+        # Passes validation, rejected by the database inside its COPY chunk
+        (10, {"title": "Nul \x00 byte", **valid}),
+        (11, {"title": "Last", **valid}),
+    ]
+    version = await ProjectService.get_project_version_service(db, project.id, manager)
+
+    report = await TaskService.import_tasks_service(db, project.id, _records(*records), manager)
+
+    assert report["imported"] == 7 and report["failed"] == 3
+    assert report["errors"][0]["line"] == 8 and report["errors"][0]["message"].startswith("status:")
+    assert report["errors"][1] == {"line": 9, "message": "Expected 3 fields, got 2"}
+
+    imported = (await db.execute(
+        select(Task.title, Task.created_at).filter(Task.project_id == project.id).order_by(Task.created_at)
+    )).all()
+    assert [title for title, _ in imported] == [f"Row {line}" for line in range(2, 8)] + ["Last"]
+    # Stamped from the database clock, like single creates
+    db_now = (await db.execute(select(func.now()))).scalar_one()
+    assert imported[0].created_at == db_now
+    assert await ProjectService.get_project_version_service(db, project.id, manager) == version + 1
+
+@pytest.mark.asyncio
+async def test_task_import_checks_access_once(db: AsyncSession, manager: User, project):
+    outsider = await register_user_service(db, SignupRequest(
+        email="importer@example.com", password="testpassword123", full_name="Outsider", role="MEMBER"
+    ))
+    with pytest.raises(PermissionError):
+        await TaskService.import_tasks_service(db, project.id, _records(), outsider)
+    assert await TaskService.import_tasks_service(db, "missing", _records(), manager) is None
+
+@pytest.mark.asyncio
+async def test_task_search_ranks_and_follows_visibility(db: AsyncSession, manager: User, member1: User, member2: User, project):
+    async def create(user, title, description):
+        return await TaskService.create_task_service(
+            db, TaskCreate(project_id=project.id, title=title, description=description, status="PENDING"), user
+        )
+
+    in_title = await create(manager, "Deploy the billing service", "Roll out on Friday")
+    in_description = await create(manager, "Friday checklist", "Check the deployment logs")
+    unrelated = await create(manager, "Write docs", "Nothing to see")
+    own = await create(member1, "Deploying my laptop", "Private chore")
+    await create(member2, "Deploy secrets", "Private to member two")
+    await TaskService.update_task_service(db, in_title.id, TaskUpdate(status="ACTIVE"), member1)
+
+    async def search(user, terms):
+        page = await TaskService.search_project_tasks_service(db, project.id, terms, user)
+        return [(t.id, t.status) for t in page["items"]], page["items"]
+
+    # Stemmed match; a title hit outranks a description hit
+    found, items = await search(manager, "deploy")
+    assert found == [(in_title.id, "PENDING"), (in_description.id, "PENDING")]
+    assert items[0].rank > items[1].rank
+
+    # Members see common tasks with their personal status, and their own
+    found, _ = await search(member1, "deploy")
+    assert sorted(found) == sorted([(in_title.id, "ACTIVE"), (in_description.id, "PENDING"), (own.id, "PENDING")])
+
+    found, _ = await search(member1, "deploy -billing")
+    assert in_title.id not in {task_id for task_id, _ in found}
+
+    # The search document follows edits
+    await TaskService.update_task_service(db, unrelated.id, TaskUpdate(title="Deploy docs"), manager)
+    found, _ = await search(manager, "deploy docs")
+    assert found == [(unrelated.id, "PENDING")]
+
+    outsider = await register_user_service(db, SignupRequest(
+        email="searcher@example.com", password="testpassword123", full_name="Outsider", role="MEMBER"
+    ))
+    with pytest.raises(PermissionError):
+        await TaskService.search_project_tasks_service(db, project.id, "deploy", outsider)
+
+@pytest.mark.asyncio
+async def test_task_search_pages_through_equal_ranks(db: AsyncSession, manager: User, project):
+    await TaskService.create_tasks_batch_service(db, TaskBatchCreate(project_id=project.id, tasks=[
+        TaskBatchItem(title=f"Invoice {i}", description="desc", status="PENDING") for i in range(7)
+    ]), manager)
+
+    ids, cursor = [], None
+    while True:
+        page = await TaskService.search_project_tasks_service(db, project.id, "invoice", manager, limit=3, cursor=cursor)
+        ids += [t.id for t in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(ids) == len(set(ids)) == 7
+
+@pytest.mark.asyncio
+async def test_task_search_can_use_the_gin_index(db: AsyncSession, manager: User, project):
+    await db.execute(text("SET LOCAL enable_seqscan = off"))
+    plan = (await db.execute(text(
+        "EXPLAIN SELECT id FROM tasks WHERE search_vector @@ websearch_to_tsquery('english', 'deploy')"
+    ))).scalars().all()
+    assert any("ix_tasks_search_vector" in line for line in plan)
@@ -0,0 +1,26 @@
+from benchmarks.service_suite import find_regressions
+
+
+def _report(**operations):
+    return {"scales": {"small": {"operations": {
+        name: {"p50_ms": value} for name, value in operations.items()
+    }}}}
+
+
+def test_find_regressions_flags_only_slowdowns_beyond_limit():
+    baseline = _report(list_tasks_owner=10.0, get_task_owner=4.0, login=250.0)
+    current = _report(list_tasks_owner=12.5, get_task_owner=4.4, login=200.0, new_operation=1.0)
+
+    regressions = find_regressions(current, baseline, max_regression_pct=20)
+
+    assert regressions == [{
+        "scale": "small",
+        "operation": "list_tasks_owner",
+        "baseline_ms": 10.0,
+        "current_ms": 12.5,
+        "change_pct": 25.0,
+    }]
+
+
+def test_find_regressions_skips_scales_missing_from_baseline():
+    assert find_regressions(_report(login=500.0), {"scales": {}}, max_regression_pct=0) == []
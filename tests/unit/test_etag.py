@@ -0,0 +1,24 @@
+from app.core.etag import etag_matches, make_etag
+
+
+def test_etag_depends_on_version_and_variant():
+    etag = make_etag(3, "user-1", "/tasks", "project_id=p")
+    assert etag.startswith('W/"3-')
+    assert etag == make_etag(3, "user-1", "/tasks", "project_id=p")
+    assert etag != make_etag(4, "user-1", "/tasks", "project_id=p")
+    assert etag != make_etag(3, "user-2", "/tasks", "project_id=p")
+    assert etag != make_etag(3, "user-1", "/tasks", "project_id=p&limit=5")
+
+
+def test_if_none_match_uses_weak_comparison():
+    etag = make_etag(1, "user-1")
+    strong = etag.removeprefix("W/")
+
+    assert etag_matches(etag, etag)
+    assert etag_matches(strong, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches("*", etag)
+
+    assert not etag_matches(None, etag)
+    assert not etag_matches("", etag)
+    assert not etag_matches(make_etag(2, "user-1"), etag)
@@ -0,0 +1,103 @@
+import pytest
+
+from app.core.import_formats import import_format, iter_csv_records, iter_lines, iter_ndjson_records
+
+
+async def stream(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(records):
+    return [record async for record in records]
+
+
+def test_import_format_from_content_type():
+    assert import_format("text/csv; charset=utf-8") == "csv"
+    assert import_format("application/x-ndjson") == "ndjson"
+    assert import_format("application/json") is None
+    assert import_format(None) is None
+
+
+@pytest.mark.asyncio
+async def test_lines_are_split_across_chunks():
+    lines = await collect(iter_lines(stream(b"\xef\xbb\xbfone\ntw", b"o\nth\xc3", b"\xa9")))
+    assert lines == [(1, "one\n", None), (2, "two\n", None), (3, "thé", None)]
+
+
+@pytest.mark.asyncio
+async def test_bad_lines_fail_alone():
+    lines = await collect(iter_lines(stream(b"ok\n\xff\nfine\n", b"0123456", b"789\nlast"), max_line_bytes=8))
+    assert lines == [
+        (1, "ok\n", None),
+        (2, "\ufffd\n", "Line is not valid UTF-8"),
+        (3, "fine\n", None),
+        (4, "", "Line is longer than 8 bytes"),
+        (5, "last", None),
+    ]
+
+    lines = await collect(iter_lines(stream(b"12345678\n", b"123456789"), max_line_bytes=8))
+    assert lines == [(1, "12345678\n", None), (2, "", "Line is longer than 8 bytes")]
+
+
+@pytest.mark.asyncio
+async def test_csv_records():
+    body = (
+        b'Title,Description,status\r\n'
+        b'Plain,desc,PENDING\r\n'
+        b'\r\n'
+        b'"Quoted, ""two""","first line\r\nsecond',
+        b' line",ACTIVE\r\n'
+        b'Short,row\r\n'
+        b'Open,"never closed,PENDING\n'
+    )
+    records = await collect(iter_csv_records(stream(*body), ["title", "description", "status"]))
+    assert records == [
+        (2, {"title": "Plain", "description": "desc", "status": "PENDING"}),
+        (4, {"title": 'Quoted, "two"', "description": "first line\r\nsecond line", "status": "ACTIVE"}),
+        (6, "Expected 3 fields, got 2"),
+        (7, "Unterminated quoted field"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_records_with_bad_lines():
+    body = b'title,description,status\nBad,\xff,PENDING\nSplit,"one\n\xff",PENDING\nGood,desc,DONE\n'
+    records = await collect(iter_csv_records(stream(body), ["title", "description", "status"]))
+    assert records == [
+        (2, "Line is not valid UTF-8"),
+        (3, "Line is not valid UTF-8"),
+        (5, {"title": "Good", "description": "desc", "status": "DONE"}),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_stray_quote_fails_only_its_row():
+    rows = b"".join(b"Row %d,desc,PENDING\n" % i for i in range(3, 9))
+    body = b'title,description,status\nStray "quote,desc,PENDING\n' + rows
+    expected = [(2, "Unterminated quoted field")] + [
+        (i, {"title": f"Row {i}", "description": "desc", "status": "PENDING"}) for i in range(3, 9)
+    ]
+
+    # Cut off once the open record outgrows the limit, or at the end of the stream
+    for max_line_bytes in (64, 1024):
+        records = await collect(iter_csv_records(stream(body), ["title"], max_line_bytes=max_line_bytes))
+        assert records == expected
+
+
+@pytest.mark.asyncio
+async def test_csv_header_must_name_required_columns():
+    with pytest.raises(ValueError, match="missing columns: status"):
+        await collect(iter_csv_records(stream(b"title,description\nA,b\n"), ["title", "description", "status"]))
+
+    with pytest.raises(ValueError, match="CSV header: Line is not valid UTF-8"):
+        await collect(iter_csv_records(stream(b"title,\xff\nA,b\n"), ["title"]))
+
+
+@pytest.mark.asyncio
+async def test_ndjson_records():
+    body = b'{"title": "A"}\n\n{"title": \n[1]\n{"title": "\xff"}\n{"title": "B"}'
+    records = await collect(iter_ndjson_records(stream(body)))
+    assert records[0] == (1, {"title": "A"})
+    assert records[1][0] == 3 and records[1][1].startswith("Invalid JSON")
+    assert records[2:] == [(4, "Expected a JSON object"), (5, "Line is not valid UTF-8"), (6, {"title": "B"})]
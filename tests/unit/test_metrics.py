@@ -0,0 +1,33 @@
+from app.core.metrics import Counter, Histogram, HttpMetrics, render_http_metrics
+
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for value in (0.005, 0.01, 0.05, 0.5, 3.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {"0.01": 2, "0.1": 3, "1.0": 4, "+Inf": 5}
+    assert snapshot["count"] == 5
+    assert abs(snapshot["sum"] - 3.565) < 1e-9
+
+
+def test_counter_increments():
+    counter = Counter()
+    counter.inc()
+    counter.inc(2)
+    assert counter.value == 3
+
+
+def test_http_metrics_render_prometheus_text():
+    registry = HttpMetrics()
+    registry.route("/api/v1/tasks/{task_id}", "GET").record(200, 0.004)
+    registry.route("/api/v1/tasks/{task_id}", "GET").record(404, 0.002)
+    assert registry.route("/api/v1/tasks/{task_id}", "GET") is registry.route("/api/v1/tasks/{task_id}", "GET")
+
+    lines = render_http_metrics(registry)
+    labels = 'route="/api/v1/tasks/{task_id}",method="GET"'
+    assert f'http_requests_total{{{labels},status="2xx"}} 1' in lines
+    assert f'http_requests_total{{{labels},status="4xx"}} 1' in lines
+    assert f'http_request_duration_seconds_bucket{{{labels},le="0.005"}} 2' in lines
+    assert f'http_request_duration_seconds_count{{{labels}}} 2' in lines
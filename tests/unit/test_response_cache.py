@@ -0,0 +1,196 @@
+import asyncio
+import pytest
+from fastapi import Response
+
+from app.core import response_cache as response_cache_module
+from app.core.response_cache import MemoryResponseCache, RedisResponseCache
+
+
+class FakeRedis:
+    """
+    Minimal Redis-protocol stand-in: HGET, HSET, PEXPIRE, DEL, GET, INCR,
+    AUTH and SELECT over RESP2, enough for the response cache backend.
+    """
+
+    def __init__(self, password=None, delay=0.0):
+        self.password = password
+        self.delay = delay
+        self.hashes = {}
+        self.counters = {}
+        self.expiries = {}
+        self.commands = []
+        self.connections = 0
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                header = await reader.readuntil(b"\r\n")
+                args = []
+                for _ in range(int(header[1:-2])):
+                    length = int((await reader.readuntil(b"\r\n"))[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                await asyncio.sleep(self.delay)
+                writer.write(self._handle(args))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    def _handle(self, args) -> bytes:
+        name, *rest = args
+        self.commands.append(name.decode())
+        if name == b"AUTH":
+            return b"+OK\r\n" if rest[0].decode() == self.password else b"-WRONGPASS invalid password\r\n"
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"HGET":
+            value = self.hashes.get(rest[0], {}).get(rest[1])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"HSET":
+            self.hashes.setdefault(rest[0], {})[rest[1]] = rest[2]
+            return b":1\r\n"
+        if name == b"PEXPIRE":
+            self.expiries[rest[0]] = int(rest[1])
+            return b":1\r\n"
+        if name == b"DEL":
+            removed = sum(self.hashes.pop(key, None) is not None for key in rest)
+            return b":%d\r\n" % removed
+        if name == b"GET":
+            value = self.counters.get(rest[0])
+            return b"$-1\r\n" if value is None else b"$%d\r\n%d\r\n" % (len(str(value)), value)
+        if name == b"INCR":
+            self.counters[rest[0]] = self.counters.get(rest[0], 0) + 1
+            return b":%d\r\n" % self.counters[rest[0]]
+        return b"-ERR unknown command\r\n"
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_stores_variants_per_key():
+    cache = MemoryResponseCache(maxsize=10, ttl=60, max_variants=2)
+    await cache.set("tasks:u:p:1", "50:None", b"page-1")
+    await cache.set("tasks:u:p:1", "50:abc", b"page-2")
+    # Past the variant limit new variants are not stored
+    await cache.set("tasks:u:p:1", "50:def", b"page-3")
+
+    assert await cache.get("tasks:u:p:1", "50:None") == b"page-1"
+    assert await cache.get("tasks:u:p:1", "50:abc") == b"page-2"
+    assert await cache.get("tasks:u:p:1", "50:def") is None
+    assert await cache.get("tasks:u:p:2", "50:None") is None
+
+    await cache.delete("tasks:u:p:1", "missing")
+    assert await cache.get("tasks:u:p:1", "50:None") is None
+
+@pytest.mark.asyncio
+async def test_memory_backend_never_reuses_a_generation():
+    cache = MemoryResponseCache(maxsize=1, ttl=60, max_variants=2)
+    first = await cache.generation("projects:a")
+    assert await cache.generation("projects:a") == first
+    await cache.bump_generation("projects:a")
+    bumped = await cache.generation("projects:a")
+    assert bumped > first
+    # Evicted by another name, the generation comes back as a fresh value
+    await cache.generation("projects:b")
+    assert await cache.generation("projects:a") not in (first, bumped)
+
+@pytest.mark.asyncio
+async def test_project_list_loaded_before_invalidation_is_not_served(monkeypatch):
+    monkeypatch.setattr(response_cache_module, "response_cache", MemoryResponseCache(maxsize=10, ttl=60, max_variants=2))
+
+    async def load_stale():
+        # The membership changes and is invalidated while this list is loading
+        await response_cache_module.invalidate_user_projects("u")
+        return ["stale"]
+
+    async def load_fresh():
+        return ["fresh"]
+
+    key = await response_cache_module.user_projects_cache_key("u")
+    await response_cache_module.cached_json_response(key, "50:None", list, load_stale, Response())
+
+    key = await response_cache_module.user_projects_cache_key("u")
+    response = await response_cache_module.cached_json_response(key, "50:None", list, load_fresh, Response())
+    assert response.body == b'["fresh"]'
+
+@pytest.mark.asyncio
+async def test_redis_backend_round_trip():
+    server = FakeRedis(password="s3cret")
+    port = await server.start()
+    cache = RedisResponseCache(f"redis://:s3cret@127.0.0.1:{port}/2", ttl=30)
+    try:
+        assert await cache.get("projects:u", "50:None") is None
+        await cache.set("projects:u", "50:None", b'{"items":[]}')
+        assert await cache.get("projects:u", "50:None") == b'{"items":[]}'
+        assert server.expiries[b"rc:projects:u"] == 30000
+
+        await cache.delete("projects:u")
+        assert await cache.get("projects:u", "50:None") is None
+
+        assert await cache.generation("projects:u") == 0
+        await cache.bump_generation("projects:u", "projects:v")
+        assert await cache.generation("projects:u") == 1
+        assert server.counters[b"rc:gen:projects:v"] == 1
+
+        # Authenticated and selected the database once, on connect
+        assert server.commands.count("AUTH") == 1
+        assert server.commands.count("SELECT") == 1
+        assert cache.stats()["hits"] == 1
+    finally:
+        await cache.close()
+        await server.stop()
+
+@pytest.mark.asyncio
+async def test_redis_backend_runs_concurrent_calls_on_pooled_connections():
+    server = FakeRedis(password="s3cret", delay=0.05)
+    port = await server.start()
+    cache = RedisResponseCache(f"redis://:s3cret@127.0.0.1:{port}/0", ttl=30, timeout=2, pool_size=3)
+    try:
+        await cache.set("projects:u", "", b"body")
+        assert server.connections == 1
+
+        # Calls overlap on up to pool_size connections instead of queueing on one
+        bodies = await asyncio.gather(*(cache.get("projects:u", "") for _ in range(6)))
+        assert bodies == [b"body"] * 6
+        assert server.connections == 3
+        assert server.commands.count("AUTH") == 3
+
+        # Idle connections are reused
+        await cache.get("projects:u", "")
+        assert server.connections == 3
+    finally:
+        await cache.close()
+        await server.stop()
+
+@pytest.mark.asyncio
+async def test_redis_backend_degrades_to_misses_when_unreachable():
+    server = FakeRedis()
+    port = await server.start()
+    await server.stop()
+
+    cache = RedisResponseCache(f"redis://127.0.0.1:{port}/0", ttl=30)
+    await cache.set("projects:u", "", b"body")
+    assert await cache.get("projects:u", "") is None
+    await cache.delete("projects:u")
+    # An unknown generation bypasses the cache rather than guessing one
+    assert await cache.generation("projects:u") is None
+    assert cache.stats()["errors"] == 4
+
+@pytest.mark.asyncio
+async def test_redis_backend_reports_server_errors_as_misses():
+    server = FakeRedis(password="right")
+    port = await server.start()
+    cache = RedisResponseCache(f"redis://:wrong@127.0.0.1:{port}/0", ttl=30)
+    try:
+        assert await cache.get("projects:u", "") is None
+        assert cache.stats()["errors"] == 1
+    finally:
+        await cache.close()
+        await server.stop()
@@ -19,3 +19,28 @@ def test_access_token_creation():
     assert payload["sub"] == data["sub"]
     assert payload["role"] == data["role"]
     assert "exp" in payload
+
+@pytest.mark.asyncio
+async def test_password_hashing_runs_in_pool():
+    from app.core.security import hash_password_async, verify_password_async
+
+    hashed = await hash_password_async("secret_password")
+    assert await verify_password_async("secret_password", hashed) is True
+    assert await verify_password_async("wrong_password", hashed) is False
+
+@pytest.mark.asyncio
+async def test_password_hashing_rejects_when_saturated(monkeypatch):
+    import asyncio
+    from app.core import security
+
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(security.settings, "PASSWORD_HASH_QUEUE_LIMIT", 1)
+
+    hashed = security.hash_password("secret_password")
+    results = await asyncio.gather(
+        *[security.verify_password_async("secret_password", hashed) for _ in range(4)],
+        return_exceptions=True,
+    )
+    busy = [r for r in results if isinstance(r, security.PasswordHasherBusy)]
+    assert len(busy) == 2
+    assert results.count(True) == 2
@@ -0,0 +1,39 @@
+from datetime import datetime, timezone
+from typing import Union
+from app.core.serialization import dump_json
+from app.models.task import Task
+from app.schemas.pagination import Page
+from app.schemas.task import MemberTaskStatus, TaskOwnerResponse, TaskResponse
+
+NOW = datetime(2026, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+TASK_PAGE = Page[Union[TaskOwnerResponse, TaskResponse]]
+
+
+def make_task(i: int) -> Task:
+    return Task(
+        id=f"t{i}", project_id="p", created_by_id="owner", title=f"Task {i}", description="d",
+        status="PENDING", active_count=1, pending_count=0, complete_count=2, created_at=NOW, updated_at=NOW,
+    )
+
+
+def test_prevalidated_page_serializes_like_the_validating_path():
+    items = []
+    for i in range(3):
+        owner_task = TaskOwnerResponse.model_validate(make_task(i))
+        owner_task.member_statuses = [
+            MemberTaskStatus(user_id="m1", full_name="Member One", status="COMPLETE", updated_at=NOW)
+        ]
+        items.append(owner_task)
+    page = {"items": items, "next_cursor": "abc"}
+
+    assert dump_json(TASK_PAGE, page, validated=True) == dump_json(TASK_PAGE, page)
+
+
+def test_member_views_keep_the_task_response_shape():
+    member_task = TaskResponse.model_validate(make_task(1))
+    member_task.status = "COMPLETE"
+
+    body = dump_json(Union[TaskOwnerResponse, TaskResponse], member_task, validated=True)
+    assert body == dump_json(Union[TaskOwnerResponse, TaskResponse], member_task)
+    assert b'"status":"COMPLETE"' in body
+    assert b"member_statuses" not in body